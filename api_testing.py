@@ -0,0 +1,154 @@
+"""
+Shared setup for the test_api_*.py scripts.
+
+Import it before anything from src: it points DATABASE_URL at a throwaway
+SQLite database, so tests never touch todo_app.db, and sets a dummy
+OPENAI_API_KEY (the OpenAI client is created at import time; tests that
+talk to it use fake_openai.py). Works both under pytest and when a test
+script is run directly. Also holds the helpers the tests share.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import asynccontextmanager, contextmanager
+from typing import Iterable, List, Tuple
+from uuid import uuid4
+
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+
+def create_user(tasks: Iterable = ()) -> Tuple[int, dict]:
+    """
+    Create a user, optionally owning the given (unsaved) Task objects; they
+    stay readable afterwards.
+
+    Returns:
+        (user_id, auth headers)
+    """
+    from sqlmodel import Session
+    from src.backend.auth import create_access_token
+    from src.backend.database import engine
+    from src.backend.models import User
+
+    email = f"{uuid4().hex}@example.com"
+    with Session(engine, expire_on_commit=False) as session:
+        user = User(email=email, username=email, hashed_password="x")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        user_id = user.id
+
+        tasks = list(tasks)
+        for task in tasks:
+            task.user_id = user_id
+            session.add(task)
+        if tasks:
+            session.commit()
+
+    return user_id, {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def add_tasks(user_id: int, titles: Iterable[str]) -> List[int]:
+    """Create tasks through the assistant's add_task tool and return their IDs."""
+    from sqlmodel import Session
+    from src.backend import openai_client
+    from src.backend.database import engine
+
+    with Session(engine) as session:
+        return [
+            openai_client.execute_function("add_task", {"title": title}, str(user_id), db=session)["task_id"]
+            for title in titles
+        ]
+
+
+@asynccontextmanager
+async def using_openai_server(server):
+    """Point the OpenAI client at a FakeOpenAIServer (see fake_openai.py) inside the block."""
+    from openai import AsyncOpenAI
+    from src.backend import openai_client
+
+    original = openai_client.client
+    openai_client.client = AsyncOpenAI(api_key="test-key", base_url=server.base_url, max_retries=0)
+    try:
+        yield
+    finally:
+        await openai_client.client.close()
+        openai_client.client = original
+
+
+def run_with_server(server, scenario):
+    """Run scenario() on an event loop with the OpenAI client pointed at the fake server."""
+    async def run():
+        async with using_openai_server(server):
+            return await scenario()
+
+    return asyncio.run(run())
+
+
+def post_chat(server, headers: dict, body: dict, path: str = "/api/chat"):
+    """Send one chat request through the app with the OpenAI client pointed at the fake server."""
+    import httpx
+    from src.backend.main import app
+
+    async def send():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post(path, json=body, headers=headers)
+
+    return run_with_server(server, send)
+
+
+def run_turn(server, headers: dict, path: str = "/api/chat"):
+    """Send one new chat message (never a completion cache hit), then stop the server."""
+    try:
+        return post_chat(server, headers, {"message": f"do it {uuid4().hex}"}, path)
+    finally:
+        server.stop()
+
+
+@contextmanager
+def counted_commits():
+    """Record every commit on the engine serving requests."""
+    from sqlalchemy import event
+    from src.backend.database import active_engine
+
+    commits = []
+    listener = lambda conn: commits.append(conn)
+    event.listen(active_engine(), "commit", listener)
+    try:
+        yield commits
+    finally:
+        event.remove(active_engine(), "commit", listener)
+
+
+@contextmanager
+def captured_statements():
+    """Record every (sql, parameters) pair sent to the database."""
+    from sqlalchemy import event
+    from src.backend.database import engine
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+@contextmanager
+def using_cache(module, cache):
+    """Swap module.cache (task_cache or completion_cache) for the given cache inside the block."""
+    original = module.cache
+    module.cache = cache
+    try:
+        yield cache
+    finally:
+        module.cache = original
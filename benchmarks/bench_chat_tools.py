@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for executing a chat turn's tool calls: one at a time vs. the tool executor.
+
+Runs multi-call turns the way the assistant requests them ("complete tasks
+3, 5 and 9", four lists at once, a mix of writes and reads) through the
+old serial loop (one execute_function and one commit per call) and through
+execute_tool_calls (concurrent reads, one transaction per run of writes).
+Reports SQL statements, commits and wall time per turn.
+
+Every SQL statement sleeps for the given latency (default 2 ms) to stand in
+for the round trip to a hosted Postgres such as Neon; pass 0 to measure
+local SQLite alone. Uses the sync (threadpool) database mode.
+
+Usage:
+    python benchmarks/bench_chat_tools.py [latency_ms] [turns]
+"""
+
+import sys
+import os
+import tempfile
+import asyncio
+import time
+import statistics
+from uuid import uuid4
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from src.backend.database import create_tables, engine, run_db
+from src.backend.models import User
+from src.backend.openai_client import execute_function
+from src.backend.tool_executor import execute_tool_calls
+
+LATENCY = (float(sys.argv[1]) if len(sys.argv) > 1 else 2.0) / 1000
+TURNS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+TASKS = 200
+
+
+class Counters:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def statement(self, *args):
+        self.statements += 1
+        if LATENCY:
+            time.sleep(LATENCY)
+
+    def commit(self, *args):
+        self.commits += 1
+
+
+def create_user() -> str:
+    email = f"{uuid4().hex}@example.com"
+    with Session(engine) as session:
+        user = User(email=email, username=email, hashed_password="x")
+        session.add(user)
+        session.commit()
+        user_id = str(user.id)
+        for i in range(TASKS):
+            execute_function("add_task", {"title": f"task {i}"}, user_id, db=session)
+    return user_id
+
+
+def call(function: str, **arguments) -> dict:
+    return {"id": f"call_{uuid4().hex[:8]}", "function": function, "arguments": arguments}
+
+
+def turns(task_ids: list) -> list:
+    """(name, tool calls) for each kind of multi-call turn."""
+    return [
+        ("complete 3", [call("complete_task", task_id=task_id) for task_id in task_ids[:3]]),
+        ("complete 10", [call("complete_task", task_id=task_id) for task_id in task_ids[:10]]),
+        ("list x4", [call("list_tasks", status=status) for status in ["all", "pending", "completed", "all"]]),
+        ("add 3, list 2", [call("add_task", title=f"new {i}") for i in range(3)]
+                          + [call("list_tasks", status="pending"), call("list_tasks", status="completed")]),
+    ]
+
+
+async def serial(db: Session, tool_calls: list, user_id: str) -> list:
+    """The chat route's loop before the executor."""
+    return [
+        await run_db(db, lambda session, tc=tc: execute_function(tc["function"], tc["arguments"], user_id, session))
+        for tc in tool_calls
+    ]
+
+
+async def measure(executor, tool_calls: list, user_id: str) -> tuple:
+    counters = Counters()
+    timings = []
+    event.listen(engine, "before_cursor_execute", counters.statement)
+    event.listen(engine, "commit", counters.commit)
+    try:
+        for _ in range(TURNS):
+            with Session(engine, expire_on_commit=False) as db:
+                start = time.perf_counter()
+                await executor(db, tool_calls, user_id)
+                timings.append(time.perf_counter() - start)
+    finally:
+        event.remove(engine, "before_cursor_execute", counters.statement)
+        event.remove(engine, "commit", counters.commit)
+    return counters.statements / TURNS, counters.commits / TURNS, statistics.median(timings)
+
+
+def main():
+    create_tables()
+    user_id = create_user()
+    task_ids = list(range(1, TASKS + 1))
+
+    print(f"{TURNS} turns each, {TASKS} tasks, {LATENCY * 1000:g} ms per SQL statement\n")
+    print(f"{'turn':>13} | {'mode':>8} | {'SQL':>5} | {'commits':>7} | {'median ms':>9}")
+    print("-" * 56)
+    for name, tool_calls in turns(task_ids):
+        for mode, executor in [("serial", serial), ("executor", execute_tool_calls)]:
+            statements, commits, median = asyncio.run(measure(executor, tool_calls, user_id))
+            print(f"{name:>13} | {mode:>8} | {statements:>5.0f} | {commits:>7.0f} | {median * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for response compression: bytes saved vs. CPU spent per encoding and level.
+
+Builds realistic response bodies (a single task, a 200-task page, a
+10k-task list and a list_tasks chat result for 1k tasks), compresses each
+with gzip and brotli at several levels, and reports compressed size, CPU time and the estimated
+time to send the body over slow and typical mobile links, so the defaults
+(GZIP_LEVEL, BROTLI_QUALITY, COMPRESSION_MIN_SIZE) can be chosen from data.
+
+Brotli rows are skipped when the Brotli package is not installed.
+
+Usage:
+    python benchmarks/bench_compression.py
+"""
+
+import sys
+import os
+import time
+import statistics
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+import orjson
+
+from src.backend import compression
+from src.backend.compression import compress_body
+
+REPEATS = 5
+LINKS = [("3G", 750_000), ("4G", 10_000_000)]  # bits per second
+LEVELS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 1), ("br", 4), ("br", 11)]
+VERBS = ["Buy", "Call", "Email", "Fix", "Review", "Plan", "Book", "Clean", "Pay", "Write"]
+NOUNS = ["groceries", "dentist", "report", "invoice", "garden", "flights", "car", "taxes", "slides", "kitchen"]
+
+
+def task_payload(i: int) -> dict:
+    base = datetime(2025, 1, 1)
+    return {
+        "title": f"{VERBS[i % 10]} {NOUNS[(i * 7) % 10]} #{i}",
+        "completed": i % 3 == 0,
+        "priority": ["high", "medium", "low"][i % 3],
+        "tags": ["work", "q1"][: i % 3],
+        "due_date": (base + timedelta(days=i % 90)).date().isoformat() if i % 2 else None,
+        "id": 100_000 + i,
+        "created_at": base + timedelta(seconds=i * 37, microseconds=i),
+        "updated_at": base + timedelta(seconds=i * 41, microseconds=i),
+    }
+
+
+def task_list_body(count: int) -> bytes:
+    tasks = [task_payload(i) for i in range(count)]
+    return orjson.dumps({"success": True, "data": {"tasks": tasks, "count": count, "limit": count, "next_cursor": None}})
+
+
+def chat_list_body(count: int) -> bytes:
+    tasks = [
+        {"id": t["id"], "title": t["title"], "description": t["due_date"], "completed": t["completed"],
+         "created_at": t["created_at"].isoformat()}
+        for t in map(task_payload, range(count))
+    ]
+    return orjson.dumps({"success": True, "tasks": tasks, "count": count})
+
+
+def cpu_ms(body: bytes, encoding: str, level: int) -> tuple:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.process_time()
+        compressed = compress_body(body, encoding, gzip_level=level, brotli_quality=level)
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings), len(compressed)
+
+
+def send_ms(size: int, bits_per_second: int) -> float:
+    return size * 8 * 1000 / bits_per_second
+
+
+def main():
+    payloads = [
+        ("single task", orjson.dumps({"success": True, "data": task_payload(1), "message": "Task updated successfully"})),
+        ("200-task page", task_list_body(200)),
+        ("10k-task list", task_list_body(10_000)),
+        ("chat list_tasks 1k", chat_list_body(1_000)),
+    ]
+    levels = [(encoding, level) for encoding, level in LEVELS if encoding == "gzip" or compression.brotli]
+    if not compression.brotli:
+        print("Brotli package not installed: gzip only\n")
+
+    link_header = " | ".join(f"{name} ms" for name, _ in LINKS)
+    for name, body in payloads:
+        raw_links = " | ".join(f"{send_ms(len(body), bps):>5.0f}" for _, bps in LINKS)
+        print(f"{name}: {len(body):,} bytes raw ({raw_links} ms to send on {', '.join(n for n, _ in LINKS)})")
+        print(f"  {'encoding':>8} | {'bytes':>9} | {'ratio':>5} | {'cpu ms':>7} | {link_header} | saved 3G ms")
+        for encoding, level in levels:
+            cpu, size = cpu_ms(body, encoding, level)
+            links = " | ".join(f"{send_ms(size, bps):>5.0f}" for _, bps in LINKS)
+            saved = send_ms(len(body) - size, LINKS[0][1]) - cpu
+            print(f"  {encoding + ' ' + str(level):>8} | {size:>9,} | {len(body) / size:>4.1f}x | {cpu:>7.2f} | {links} | {saved:>10.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Load test: task API throughput in each database mode.
+
+Runs the app in-process on a single event loop (one uvicorn worker) with
+concurrent clients that each list, create and toggle tasks, and measures
+requests/second plus GET / latency from a probe running alongside:
+
+    inline        queries run directly on the event loop, which is how
+                  every route behaved before get_db()/run_db()
+    sync          DB_ASYNC=false, sync Session with queries in the threadpool
+    async         DB_ASYNC=true, AsyncSession on aiosqlite/asyncpg
+
+Point DATABASE_URL at Postgres to compare psycopg2 against asyncpg.
+
+Usage:
+    python benchmarks/bench_db_modes.py [concurrent_clients] [requests_per_client]
+"""
+
+import sys
+import os
+import tempfile
+import asyncio
+import time
+import statistics
+from uuid import uuid4
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+import httpx
+from sqlmodel import Session
+
+from src.backend import auth, database, main as api
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.models import User
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+PROBE_INTERVAL = 0.01  # seconds between probe requests
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run_inline(db, fn, *args, **kwargs):
+    """run_db() replacement that blocks the loop like the old routes did."""
+    return fn(db, *args, **kwargs)
+
+
+def create_user() -> dict:
+    email = f"{uuid4().hex}@example.com"
+    with Session(engine) as session:
+        session.add(User(email=email, username=email, hashed_password="x"))
+        session.commit()
+    return {"Authorization": f"Bearer {auth.create_access_token({'sub': email})}"}
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    """Hit GET / on a fixed schedule until stopped, recording latency from the scheduled time in ms."""
+    latencies = []
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        await client.get("/")
+        now = time.perf_counter()
+        latencies.append((now - scheduled) * 1000)
+        scheduled += PROBE_INTERVAL
+        await asyncio.sleep(max(0.0, scheduled - now))
+    return latencies
+
+
+async def worker(client: httpx.AsyncClient, headers: dict) -> None:
+    task_id = None
+    for i in range(REQUESTS):
+        if i % 3 == 0:
+            response = await client.post("/api/tasks", json={"title": f"task {i}"}, headers=headers)
+            task_id = response.json()["data"]["id"]
+        elif i % 3 == 1:
+            await client.patch(f"/api/tasks/{task_id}/toggle-complete", headers=headers)
+        else:
+            await client.get("/api/tasks", params={"limit": 20}, headers=headers)
+
+
+async def run_mode() -> tuple:
+    users = [create_user() for _ in range(CLIENTS)]
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*[worker(client, headers) for headers in users])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        latencies = await probe_task
+    return CLIENTS * REQUESTS / elapsed, latencies
+
+
+def main():
+    create_tables()
+    modules = [api, auth]
+    original = api.run_db
+
+    print(f"{CLIENTS} concurrent clients x {REQUESTS} requests, {database.DATABASE_URL.split(':')[0]}\n")
+    print(f"{'mode':>8} | {'req/s':>8} | {'probes':>6} | {'probe p50 ms':>12} | {'probe p99 ms':>12}")
+    print("-" * 59)
+    for mode in ["inline", "sync", "async"]:
+        database.DB_ASYNC = mode == "async"
+        for module in modules:
+            module.run_db = run_inline if mode == "inline" else original
+        try:
+            throughput, latencies = asyncio.run(run_mode())
+        finally:
+            if database.DB_ASYNC:
+                asyncio.run(database.get_async_engine().dispose())
+        print(f"{mode:>8} | {throughput:>8.1f} | {len(latencies):>6} | {statistics.median(latencies):>12.2f} | "
+              f"{percentile(latencies, 99):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Load test: latency of a cheap endpoint while a burst of logins is in flight.
+
+Runs the app in-process on a single event loop (one uvicorn worker) and
+measures GET / latency percentiles in three scenarios:
+
+    idle          no logins running
+    executor      concurrent POST /api/login, bcrypt in the password executor
+    inline        the same number of bcrypt checks run directly on the loop,
+                  which is how login behaved before the executor
+
+Usage:
+    python benchmarks/bench_login_storm.py [concurrent_logins]
+"""
+
+import sys
+import os
+import tempfile
+import asyncio
+import time
+import statistics
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+import httpx
+
+from src.backend import auth
+from src.backend.main import app
+from src.backend.database import create_tables
+
+LOGINS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+PROBE_INTERVAL = 0.01  # seconds between probe requests
+EMAIL = "storm@example.com"
+PASSWORD = "storm-password"
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    """
+    Hit GET / on a fixed schedule until stopped, recording latency in ms.
+
+    Latency is measured from when each probe was scheduled, not when it was
+    actually sent, so time spent waiting on a blocked event loop is counted.
+    """
+    latencies = []
+    scheduled = time.perf_counter()
+    # Keep going after stop until every missed slot has been probed
+    while not (stop.is_set() and time.perf_counter() - scheduled < PROBE_INTERVAL):
+        await client.get("/")
+        now = time.perf_counter()
+        latencies.append((now - scheduled) * 1000)
+        scheduled += PROBE_INTERVAL
+        await asyncio.sleep(max(0.0, scheduled - now))
+    return latencies
+
+
+async def run_scenario(client: httpx.AsyncClient, storm) -> tuple:
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, stop))
+    start = time.perf_counter()
+    await storm()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return await probe_task, elapsed
+
+
+async def main():
+    create_tables()
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        await client.post("/api/register", json={"email": EMAIL, "username": EMAIL, "password": PASSWORD})
+        hashed = auth.get_password_hash(PASSWORD)
+
+        async def idle():
+            await asyncio.sleep(1.0)
+
+        async def executor_storm():
+            await asyncio.gather(*[
+                client.post("/api/login", json={"email": EMAIL, "password": PASSWORD})
+                for _ in range(LOGINS)
+            ])
+
+        async def inline_storm():
+            async def inline_login():
+                await asyncio.sleep(0)
+                auth.verify_password(PASSWORD, hashed)
+            await asyncio.gather(*[inline_login() for _ in range(LOGINS)])
+
+        print(f"{LOGINS} concurrent logins, {auth.PASSWORD_HASH_WORKERS} password worker(s)\n")
+        print(f"{'scenario':>10} | {'probes':>6} | {'p50 ms':>8} | {'p99 ms':>8} | {'max ms':>8} | {'storm s':>7}")
+        print("-" * 62)
+        for name, storm in [("idle", idle), ("executor", executor_storm), ("inline", inline_storm)]:
+            latencies, elapsed = await run_scenario(client, storm)
+            print(f"{name:>10} | {len(latencies):>6} | {statistics.median(latencies):>8.2f} | "
+                  f"{percentile(latencies, 99):>8.2f} | {max(latencies):>8.2f} | {elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
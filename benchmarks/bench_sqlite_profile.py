@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the SQLite performance profile: concurrent create/toggle throughput.
+
+Each run uses a fresh SQLite file and a pool of writer threads, each
+creating tasks and toggling them through the same query functions the
+API uses. Runs once with SQLite's defaults (rollback journal, full fsync)
+and once with the performance profile PRAGMAs from database.py, and
+reports operations/second and failed operations such as "database is
+locked".
+
+Usage:
+    python benchmarks/bench_sqlite_profile.py [writer_threads] [ops_per_thread]
+"""
+
+import sys
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel
+
+from src.backend.database import apply_sqlite_pragmas
+from src.backend.models import TaskCreate, User
+from src.backend.task_queries import create_user_task, toggle_user_task
+
+WRITERS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+OPS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+
+def writer(engine, user_id: int) -> int:
+    """Alternate creating and toggling tasks; returns the number of failed operations."""
+    failures = 0
+    task_id = None
+    for i in range(OPS):
+        try:
+            with Session(engine) as session:
+                if i % 2 == 0:
+                    task_id = create_user_task(session, user_id, TaskCreate(title=f"task {i}")).id
+                else:
+                    toggle_user_task(session, user_id, task_id)
+        except Exception as e:
+            failures += 1
+            if failures == 1:
+                print(f"    first failure: {str(e).splitlines()[0]}")
+    return failures
+
+
+def run(profile: bool) -> tuple:
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    if profile:
+        apply_sqlite_pragmas(engine)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        users = [User(email=f"w{i}@example.com", username=f"w{i}", hashed_password="x") for i in range(WRITERS)]
+        session.add_all(users)
+        session.commit()
+        user_ids = [user.id for user in users]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        failures = sum(pool.map(lambda user_id: writer(engine, user_id), user_ids))
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return WRITERS * OPS / elapsed, failures
+
+
+def main():
+    print(f"{WRITERS} writer threads x {OPS} create/toggle operations\n")
+    results = []
+    for name, profile in [("default", False), ("profile", True)]:
+        print(f"{name}:")
+        results.append((name, *run(profile)))
+
+    print(f"\n{'pragmas':>8} | {'ops/s':>8} | {'failed':>6}")
+    print("-" * 30)
+    for name, throughput, failures in results:
+        print(f"{name:>8} | {throughput:>8.1f} | {failures:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark for POST /api/tasks/batch against one request per task.
+
+For N tasks, creates, toggles and deletes them once with individual
+requests and once with three batch requests, counting HTTP requests,
+SQL statements and commits, and timing each phase. Requests go through
+the app in-process, so the wall times leave out network latency; in a
+browser every saved request also saves a network round trip.
+
+Usage:
+    python benchmarks/bench_task_batch.py [task_count]
+"""
+
+import sys
+import os
+import tempfile
+import asyncio
+import time
+from uuid import uuid4
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+import httpx
+from sqlalchemy import event
+from sqlmodel import Session
+
+from src.backend.main import app
+from src.backend.auth import create_access_token
+from src.backend.database import create_tables, engine
+from src.backend.models import User
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+
+class Counters:
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.commits = 0
+
+    def statement(self, *args):
+        self.statements += 1
+
+    def commit(self, *args):
+        self.commits += 1
+
+
+def create_user() -> dict:
+    email = f"{uuid4().hex}@example.com"
+    with Session(engine) as session:
+        session.add(User(email=email, username=email, hashed_password="x"))
+        session.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+async def individual(client: httpx.AsyncClient, headers: dict, counters: Counters) -> dict:
+    timings = {}
+
+    start = time.perf_counter()
+    ids = []
+    for i in range(COUNT):
+        response = await client.post("/api/tasks", json={"title": f"task {i}"}, headers=headers)
+        ids.append(response.json()["data"]["id"])
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task_id in ids:
+        await client.patch(f"/api/tasks/{task_id}/toggle-complete", headers=headers)
+    timings["toggle"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task_id in ids:
+        await client.delete(f"/api/tasks/{task_id}", headers=headers)
+    timings["delete"] = time.perf_counter() - start
+
+    counters.requests = COUNT * 3
+    return timings
+
+
+async def batched(client: httpx.AsyncClient, headers: dict, counters: Counters) -> dict:
+    timings = {}
+
+    async def send(operations):
+        response = await client.post("/api/tasks/batch", json={"operations": operations}, headers=headers)
+        return response.json()["data"]["results"]
+
+    start = time.perf_counter()
+    results = await send([{"op": "create", "task": {"title": f"task {i}"}} for i in range(COUNT)])
+    ids = [result["data"]["id"] for result in results]
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await send([{"op": "toggle", "id": task_id} for task_id in ids])
+    timings["toggle"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await send([{"op": "delete", "id": task_id} for task_id in ids])
+    timings["delete"] = time.perf_counter() - start
+
+    counters.requests = 3
+    return timings
+
+
+async def run(scenario) -> tuple:
+    counters = Counters()
+    headers = create_user()
+    event.listen(engine, "before_cursor_execute", counters.statement)
+    event.listen(engine, "commit", counters.commit)
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            timings = await scenario(client, headers, counters)
+    finally:
+        event.remove(engine, "before_cursor_execute", counters.statement)
+        event.remove(engine, "commit", counters.commit)
+    return timings, counters
+
+
+def main():
+    create_tables()
+    print(f"Create, toggle and delete {COUNT} tasks\n")
+    print(f"{'mode':>10} | {'requests':>8} | {'SQL':>6} | {'commits':>7} | "
+          f"{'create s':>8} | {'toggle s':>8} | {'delete s':>8}")
+    print("-" * 74)
+    for name, scenario in [("individual", individual), ("batch", batched)]:
+        timings, counters = asyncio.run(run(scenario))
+        print(f"{name:>10} | {counters.requests:>8} | {counters.statements:>6} | {counters.commits:>7} | "
+              f"{timings['create']:>8.3f} | {timings['toggle']:>8.3f} | {timings['delete']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark for title search: FTS5 trigram index vs. LIKE '%term%' scan.
+
+Seeds one user with 100k tasks into a throwaway SQLite database and
+reports the median latency of a first page of get_task_page(search=...)
+for terms of different selectivity, with the index and with the old
+sequential LIKE scan.
+
+Usage:
+    python benchmarks/bench_task_search.py [task_count]
+"""
+
+import sys
+import os
+import tempfile
+import time
+import statistics
+import random
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+from datetime import datetime, timedelta
+from sqlmodel import Session
+from sqlalchemy import insert
+
+from src.backend import task_search
+from src.backend.database import create_tables, engine
+from src.backend.models import Task, User
+from src.backend.task_queries import get_task_page
+
+SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+REPEATS = 20
+VERBS = ["Buy", "Call", "Email", "Fix", "Review", "Plan", "Book", "Clean", "Pay", "Write"]
+NOUNS = ["groceries", "dentist", "report", "invoice", "garden", "flights", "car", "taxes", "slides", "kitchen"]
+TERMS = [
+    ("unique", "zebra-7777"),   # 1 match
+    ("rare", "invoice 12"),     # ~10 matches
+    ("common", "taxes"),        # ~10% of tasks
+    ("prefix", "Buy gro"),      # ~1% of tasks
+]
+
+
+def seed_user(session: Session) -> int:
+    """Create a user with SIZE tasks using a bulk insert."""
+    user = User(email="search@example.com", username="search", hashed_password="x")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+    rng = random.Random(42)
+    base = datetime(2025, 1, 1)
+    rows = []
+    for i in range(SIZE):
+        verb, noun = rng.choice(VERBS), rng.choice(NOUNS)
+        rows.append({
+            "title": f"{verb} {noun} {i}" if i != SIZE // 2 else "Feed the zebra-7777",
+            "completed": False,
+            "priority": "medium",
+            "tags": "[]",
+            "user_id": user.id,
+            "created_at": base + timedelta(seconds=i),
+            "updated_at": base,
+        })
+    session.execute(insert(Task), rows)
+    session.commit()
+    return user.id
+
+
+def median_ms(session: Session, user_id: int, term: str) -> tuple:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        tasks, _ = get_task_page(session, user_id, limit=50, search=term)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(tasks)
+
+
+def main():
+    create_tables()
+    with Session(engine) as session:
+        print(f"Seeding {SIZE} tasks...")
+        user_id = seed_user(session)
+
+        print(f"\n{'term':>8} | {'query':>12} | {'hits':>4} | {'fts5 ms':>8} | {'like ms':>8} | {'speedup':>7}")
+        print("-" * 62)
+        for name, term in TERMS:
+            task_search.sqlite_fts_enabled = True
+            indexed, hits = median_ms(session, user_id, term)
+            task_search.sqlite_fts_enabled = False
+            scanned, _ = median_ms(session, user_id, term)
+            print(f"{name:>8} | {term:>12} | {hits:>4} | {indexed:>8.2f} | {scanned:>8.2f} | {scanned / indexed:>6.1f}x")
+        task_search.sqlite_fts_enabled = True
+
+
+if __name__ == "__main__":
+    main()
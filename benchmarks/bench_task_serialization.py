@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for task list serialization: TaskResponse + stdlib JSON vs. dict projection + orjson.
+
+For 1k and 10k tasks (each with a couple of tags), measures the CPU time
+to turn loaded Task rows into a response body the old way (TaskResponse
+per row, FastAPI's jsonable_encoder, JSONResponse) and the new way
+(task_to_dict per row, ORJSONResponse). Then pages through GET /api/tasks
+in-process to show the effect on the whole endpoint.
+
+Usage:
+    python benchmarks/bench_task_serialization.py [task_count ...]
+"""
+
+import sys
+import os
+import tempfile
+import time
+import statistics
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from src.backend.main import app, task_to_dict, task_to_response
+from src.backend.auth import create_access_token
+from src.backend.database import create_tables, engine
+from src.backend.models import Task, TaskTag, User
+from src.backend.task_queries import MAX_PAGE_SIZE
+
+SIZES = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+REPEATS = 5
+
+
+def seed_user(size: int) -> tuple:
+    """Create a user with `size` tagged tasks using bulk inserts."""
+    email = f"serialize-{size}@example.com"
+    with Session(engine) as session:
+        user = User(email=email, username=email, hashed_password="x")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+
+        base = datetime(2025, 1, 1)
+        session.execute(insert(Task), [{
+            "title": f"Task number {i} with a moderately long title",
+            "completed": i % 3 == 0,
+            "priority": ["high", "medium", "low"][i % 3],
+            "tags": "[]",
+            "due_date": (base + timedelta(days=i % 90)).date().isoformat(),
+            "user_id": user.id,
+            "created_at": base + timedelta(seconds=i),
+            "updated_at": base + timedelta(seconds=i),
+        } for i in range(size)])
+        task_ids = session.exec(select(Task.id).where(Task.user_id == user.id)).all()
+        session.execute(insert(TaskTag), [
+            {"task_id": task_id, "tag": tag, "user_id": user.id}
+            for task_id in task_ids for tag in ("work", "q1")
+        ])
+        session.commit()
+        return user.id, {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def cpu_ms(render) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.process_time()
+        render()
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings)
+
+
+def old_body(tasks: list) -> bytes:
+    content = {"success": True, "data": {"tasks": [task_to_response(task) for task in tasks]}}
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def new_body(tasks: list) -> bytes:
+    content = {"success": True, "data": {"tasks": [task_to_dict(task) for task in tasks]}}
+    return ORJSONResponse(content).body
+
+
+def page_all(client: TestClient, headers: dict) -> int:
+    pages, cursor = 0, None
+    while True:
+        params = {"limit": MAX_PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/api/tasks", params=params, headers=headers).json()["data"]
+        pages += 1
+        cursor = data["next_cursor"]
+        if not cursor:
+            return pages
+
+
+def main():
+    create_tables()
+    client = TestClient(app)
+
+    print(f"{'tasks':>6} | {'old ms':>8} | {'new ms':>8} | {'speedup':>7} | {'endpoint ms':>11} | {'pages':>5}")
+    print("-" * 62)
+    for size in SIZES:
+        user_id, headers = seed_user(size)
+        with Session(engine) as session:
+            tasks = session.exec(select(Task).where(Task.user_id == user_id)).all()
+            for task in tasks:
+                task.tag_rows  # Loaded up front so only serialization is timed
+
+            assert old_body(tasks) and new_body(tasks)
+            old = cpu_ms(lambda: old_body(tasks))
+            new = cpu_ms(lambda: new_body(tasks))
+
+        pages = page_all(client, headers)
+        endpoint = cpu_ms(lambda: page_all(client, headers))
+        print(f"{size:>6} | {old:>8.1f} | {new:>8.1f} | {old / new:>6.1f}x | {endpoint:>11.1f} | {pages:>5}")
+
+
+if __name__ == "__main__":
+    main()
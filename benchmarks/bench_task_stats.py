@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark for task statistics: task_stats counters vs. grouped SQL aggregate
+vs. loading every row.
+
+Seeds one user per size into a throwaway SQLite database and reports the
+median latency of read_task_stats() (the counters behind /api/tasks/stats)
+and count_task_stats() next to the old approach of loading all Task rows and
+counting them in Python.
+
+The counters make totals a primary-key lookup, but overdue and due-today
+still count the tasks due before tomorrow. Tasks are due on one of 60
+consecutive days, and read_task_stats() is timed for a "today" before all of
+them, after 10% of them and after all of them, to show how that part scales.
+
+Usage:
+    python benchmarks/bench_task_stats.py
+"""
+
+import sys
+import os
+import tempfile
+import time
+import statistics
+# Add the project root to the Python path to allow imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_todo_app.db")
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+
+from datetime import datetime, timedelta
+from sqlmodel import Session, select
+from sqlalchemy import insert
+
+from src.backend.database import create_tables, engine
+from src.backend.models import Task, User
+from src.backend.task_queries import backfill_task_stats, count_task_stats, read_task_stats
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+REPEATS = 20
+PRIORITIES = ["high", "medium", "low"]
+BASE = datetime(2025, 1, 1)
+# "today" for read_task_stats(), by share of tasks due before tomorrow
+DUE_BEFORE_TOMORROW = {
+    "0%": (BASE - timedelta(days=1)).date(),
+    "10%": (BASE + timedelta(days=5)).date(),
+    "100%": (BASE + timedelta(days=59)).date(),
+}
+
+
+def seed_user(session: Session, size: int) -> int:
+    """Create a user with `size` tasks using a bulk insert."""
+    user = User(email=f"bench{size}@example.com", username=f"bench{size}", hashed_password="x")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+    base = BASE
+    session.execute(insert(Task), [
+        {
+            "title": f"Task {i}",
+            "completed": i % 3 == 0,
+            "priority": PRIORITIES[i % 3],
+            "tags": "[]",
+            "due_date": (base + timedelta(days=i % 60)).date().isoformat(),
+            "user_id": user.id,
+            "created_at": base,
+            "updated_at": base,
+        }
+        for i in range(size)
+    ])
+    # The bulk insert bypasses the counters; fill them in as create_tables() would
+    backfill_task_stats(session)
+    session.commit()
+    return user.id
+
+
+def load_and_count(session: Session, user_id: int) -> dict:
+    """The previous implementation: materialize every row, count in Python."""
+    all_tasks = session.exec(select(Task).where(Task.user_id == user_id)).all()
+    completed = len([t for t in all_tasks if t.completed])
+    return {
+        "total": len(all_tasks),
+        "completed": completed,
+        "active": len(all_tasks) - completed,
+        "byPriority": {p: len([t for t in all_tasks if t.priority == p]) for p in PRIORITIES},
+    }
+
+
+def median_ms(func, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    create_tables()
+    columns = [f"counters, {share} due (ms)" for share in DUE_BEFORE_TOMORROW] + ["aggregate (ms)", "load rows (ms)"]
+    header = " | ".join([f"{'tasks':>8}", *[f"{column:>{len(column)}}" for column in columns]])
+    print(header)
+    print("-" * len(header))
+    with Session(engine) as session:
+        for size in SIZES:
+            user_id = seed_user(session, size)
+            timings = [median_ms(read_task_stats, session, user_id, today) for today in DUE_BEFORE_TOMORROW.values()]
+            timings.append(median_ms(count_task_stats, session, user_id))
+            timings.append(median_ms(load_and_count, session, user_id))
+            print(" | ".join([f"{size:>8}", *[f"{ms:>{len(column)}.2f}" for ms, column in zip(timings, columns)]]))
+
+
+if __name__ == "__main__":
+    main()
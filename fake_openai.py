@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI chat completions API, used by the chat tests.
+
+Serves POST /v1/chat/completions from a background thread so the real
+OpenAI client can be pointed at it with base_url. Supports tool calls and
+streaming (stream=true), and records every request it receives.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+def default_reply(body: dict) -> dict:
+    """
+    Build a deterministic assistant message for a request.
+
+    - After tool results: summarize them
+    - "add <title>": call add_task
+    - "list": call list_tasks
+    - anything else: echo the user's message
+    """
+    last = body["messages"][-1]
+    if last["role"] == "tool":
+        results = [json.loads(m["content"]) for m in body["messages"] if m["role"] == "tool"]
+        return {"role": "assistant", "content": " ".join(r.get("message", "Done.") for r in results)}
+
+    text = last.get("content") or ""
+    if text.startswith("add "):
+        return tool_call_message([("add_task", {"title": text[4:]})])
+    if text == "list":
+        return tool_call_message([("list_tasks", {"status": "all"})])
+    return {"role": "assistant", "content": f"You said: {text}"}
+
+
+def tool_call_message(calls: list) -> dict:
+    """Build an assistant message calling each (function_name, arguments) in order."""
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(arguments)}
+            }
+            for i, (name, arguments) in enumerate(calls)
+        ]
+    }
+
+
+def calling(calls: list) -> "FakeOpenAIServer":
+    """A started server whose first reply requests the given (function_name, arguments) calls."""
+    def reply(body: dict) -> dict:
+        if body["messages"][-1]["role"] == "user":
+            return tool_call_message(calls)
+        return default_reply(body)
+
+    return FakeOpenAIServer(reply=reply).start()
+
+
+class FakeOpenAIServer:
+    """Threaded HTTP server that answers chat completion requests."""
+
+    def __init__(self, reply: Optional[Callable[[dict], dict]] = None, delay: float = 0.0):
+        self.reply = reply or default_reply
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake._lock:
+                    fake.requests.append(body)
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                try:
+                    time.sleep(fake.delay)
+                    message = fake.reply(body)
+                    if body.get("stream"):
+                        self._send_stream(body, message)
+                    else:
+                        self._send_json(body, message)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+            def _send_json(self, body, message):
+                payload = json.dumps({
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if message.get("tool_calls") else "stop"
+                    }],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_stream(self, body, message):
+                if message.get("tool_calls"):
+                    deltas = [{
+                        "role": "assistant",
+                        "tool_calls": [
+                            {"index": i, **tc} for i, tc in enumerate(message["tool_calls"])
+                        ]
+                    }]
+                    finish_reason = "tool_calls"
+                else:
+                    words = (message.get("content") or "").split(" ")
+                    deltas = [{"role": "assistant", "content": ""}] + [
+                        {"content": word if i == 0 else " " + word} for i, word in enumerate(words)
+                    ]
+                    finish_reason = "stop"
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for i, delta in enumerate(deltas):
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": body["model"],
+                        "choices": [{
+                            "index": 0,
+                            "delta": delta,
+                            "finish_reason": finish_reason if i == len(deltas) - 1 else None
+                        }]
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a Redis server, used by the task cache tests.
+
+Speaks the Redis protocol (RESP) on a background thread and implements
+the handful of commands the task cache uses: PING, GET, SET (with EX/PX),
+INCR, DEL and FLUSHALL, with key expiry. Counts every command it receives.
+"""
+
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeRedisServer:
+    """Threaded TCP server with an in-memory key space."""
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands: List[str] = []
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self._server.server_address[1]}/0"
+
+    def start(self) -> "FakeRedisServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def command_count(self, name: str) -> int:
+        with self._lock:
+            return self.commands.count(name.upper())
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes]):
+        name = args[0].decode().upper()
+        with self._lock:
+            self.commands.append(name)
+            if name == "PING":
+                return "+PONG"
+            if name == "GET":
+                return self._get(args[1])
+            if name == "SET":
+                ttl = None
+                for option, amount in zip(args[3::2], args[4::2]):
+                    if option.upper() == b"EX":
+                        ttl = int(amount)
+                    elif option.upper() == b"PX":
+                        ttl = int(amount) / 1000
+                self.data[args[1]] = (args[2], time.monotonic() + ttl if ttl else None)
+                return "+OK"
+            if name == "INCR":
+                value = int(self._get(args[1]) or 0) + 1
+                expires_at = self.data.get(args[1], (None, None))[1]
+                self.data[args[1]] = (str(value).encode(), expires_at)
+                return value
+            if name == "DEL":
+                return sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+            if name == "FLUSHALL":
+                self.data.clear()
+                return "+OK"
+        return Exception(f"ERR unknown command '{name}'")
+
+    def _handler(self):
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    args = self._read_command()
+                    if args is None:
+                        return
+                    self.wfile.write(self._encode(fake.execute(args)))
+                    self.wfile.flush()
+
+            def _read_command(self) -> Optional[List[bytes]]:
+                header = self.rfile.readline()
+                if not header:
+                    return None
+                args = []
+                for _ in range(int(header[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                return args
+
+            @staticmethod
+            def _encode(reply) -> bytes:
+                if reply is None:
+                    return b"$-1\r\n"
+                if isinstance(reply, Exception):
+                    return f"-{reply}\r\n".encode()
+                if isinstance(reply, int):
+                    return f":{reply}\r\n".encode()
+                if isinstance(reply, str):
+                    return f"{reply}\r\n".encode()
+                return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+        return Handler
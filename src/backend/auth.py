@@ -5,9 +5,15 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import event
 from .models import User, UserLogin, TokenData
-from .database import get_session
+from .database import get_db, run_db
+from .user_queries import get_user_by_email, get_detached_user_by_email
+from .cache import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
+import time
 
 # Initialize password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -20,6 +26,21 @@ SECRET_KEY = os.getenv("SECRET_KEY", "09d25e094faa6ca2556c818166b7a9563b93f7099f
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Cache of verified token -> user principal, so authenticated requests can
+# skip the JWT decode and the user lookup. Set AUTH_CACHE_SIZE=0 to disable.
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "1024"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))  # seconds
+token_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+# bcrypt runs in its own small thread pool so hashing never blocks the event
+# loop. Requests beyond PASSWORD_HASH_MAX_PENDING get a 503 instead of queueing.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_pending_password_tasks = 0
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
     try:
@@ -41,6 +62,31 @@ def get_password_hash(password: str) -> str:
         import hashlib
         return hashlib.sha256(password.encode('utf-8')).hexdigest()
 
+async def run_password_task(func, *args):
+    """Run a bcrypt function in the password executor, rejecting with 503 when saturated."""
+    global _pending_password_tasks
+    if _pending_password_tasks >= PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_password_tasks += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        _pending_password_tasks -= 1
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a plain password without blocking the event loop."""
+    return await run_password_task(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await run_password_task(verify_password, plain_password, hashed_password)
+
 def authenticate_user(session: Session, email: str, password: str) -> Optional[User]:
     """Authenticate a user by email and password."""
     user = session.query(User).filter(User.email == email).first()
@@ -48,6 +94,18 @@ def authenticate_user(session: Session, email: str, password: str) -> Optional[U
         return None
     return user
 
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+    """Authenticate a user by email and password, verifying the hash off the event loop."""
+    # Hand the connection back to the pool while bcrypt runs, otherwise a
+    # login burst can hold every pooled connection at once
+    user = await run_db(db, get_detached_user_by_email, email)
+    if not user:
+        return None
+
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -59,8 +117,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop every cached token for a user, e.g. after the user row changes."""
+    token_cache.delete_where(lambda token, principal: principal["id"] == user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_changed(mapper, connection, target):
+    invalidate_cached_user(target.id)
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """Get the current user from the token."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        # Detached copy of the user; routes only read its attributes
+        return User(**cached)
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -75,9 +147,22 @@ async def get_current_user(token: str = Depends(oauth2_scheme), session: Session
     except JWTError:
         raise credentials_exception
 
-    user = session.query(User).filter(User.email == email).first()  # Changed to filter by email
+    user = await run_db(db, get_user_by_email, email)  # Changed to filter by email
     if user is None:
         raise credentials_exception
+
+    # Never cache a token past its own expiry
+    token_cache.set(
+        token,
+        {
+            "id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "created_at": user.created_at,
+            "updated_at": user.updated_at
+        },
+        ttl=payload["exp"] - time.time() if "exp" in payload else None
+    )
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,161 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from sqlmodel import Session
+from typing import Dict, List, Optional, Tuple
+from .chat_models import Conversation, Message
+from .chat_queries import get_unsummarized_messages, save_conversation_summary
+from .database import run_db
+import os
+
+try:
+    import tiktoken
+except ImportError:  # Token counts fall back to an estimate
+    tiktoken = None
+
+# Prompt tokens allowed for a turn's history: the rolling summary, the
+# recent messages and the new user message (the system prompt and tools
+# are fixed on top of this)
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "2000"))
+# Longest rolling summary of the older turns
+CHAT_SUMMARY_TOKENS = int(os.getenv("CHAT_SUMMARY_TOKENS", "300"))
+# Most unsummarized messages read per turn
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "200"))
+
+# Tokens the chat format adds around every message (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    from .openai_client import OPENAI_MODEL
+    try:
+        try:
+            return tiktoken.encoding_for_model(OPENAI_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The encoding files are downloaded on first use
+        print(f"Tokenizer unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in text for the chat model (about 4 characters per token without tiktoken)."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def truncate_tokens(text: str, limit: int) -> str:
+    """Cut text down to at most limit tokens."""
+    encoding = _encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return text if len(tokens) <= limit else encoding.decode(tokens[:limit])
+    return text[:limit * 4]
+
+
+def message_tokens(message: Dict[str, str]) -> int:
+    return count_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+
+
+def summary_message(summary: str) -> Dict[str, str]:
+    return {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+
+
+def pack_recent(history: List[Message], budget: int) -> Tuple[List[Message], List[Message]]:
+    """
+    Split chronological history into (older, recent): the longest run of
+    newest messages that fits in budget tokens, and everything before it.
+    """
+    used = 0
+    start = len(history)
+    while start > 0:
+        cost = message_tokens({"content": history[start - 1].content})
+        if used + cost > budget:
+            break
+        used += cost
+        start -= 1
+    return history[:start], history[start:]
+
+
+@dataclass
+class ContextPlan:
+    """A turn's history, and the older messages to fold into the summary first."""
+
+    summary: Optional[str]
+    recent: List[Message]
+    user_message: Dict[str, str]
+    to_summarize: List[Message] = field(default_factory=list)
+
+    def messages(self) -> List[Dict[str, str]]:
+        head = [summary_message(self.summary)] if self.summary else []
+        return [
+            *head,
+            *({"role": msg.role, "content": msg.content} for msg in self.recent),
+            self.user_message
+        ]
+
+
+def plan_context(db: Session, conversation: Conversation, content: str) -> ContextPlan:
+    """
+    Pack the conversation's history into CHAT_CONTEXT_TOKENS.
+
+    Messages already folded into the rolling summary are never read. If the
+    rest doesn't fit, the plan keeps only the newest messages that fit in
+    half of what's left after reserving room for a new summary, and lists
+    the others in to_summarize, so the summary is refreshed every few turns
+    rather than on every turn of a long conversation.
+    """
+    budget = CHAT_CONTEXT_TOKENS
+    user_message = {"role": "user", "content": content}
+    if conversation.id is None:
+        # Not saved yet, so no history
+        return ContextPlan(None, [], user_message)
+    history = get_unsummarized_messages(
+        db, conversation.id, conversation.summary_through, limit=CHAT_HISTORY_LIMIT
+    )
+
+    available = budget - message_tokens(user_message)
+    if conversation.summary:
+        available -= message_tokens(summary_message(conversation.summary))
+    older, recent = pack_recent(history, available)
+    if not older:
+        return ContextPlan(conversation.summary, recent, user_message)
+
+    reserved = CHAT_SUMMARY_TOKENS + message_tokens(summary_message(""))
+    to_summarize, _ = pack_recent(history, (budget - message_tokens(user_message) - reserved) // 2)
+    return ContextPlan(conversation.summary, recent, user_message, to_summarize)
+
+
+async def context_messages(db: Session, conversation: Conversation, plan: ContextPlan) -> List[Dict[str, str]]:
+    """
+    Build the OpenAI message list for a planned turn, first refreshing the
+    conversation's rolling summary if the plan asks for it.
+    """
+    from .openai_client import summarize_conversation
+
+    if not plan.to_summarize:
+        return plan.messages()
+
+    try:
+        summary = await summarize_conversation(
+            plan.summary,
+            [{"role": msg.role, "content": msg.content} for msg in plan.to_summarize],
+            CHAT_SUMMARY_TOKENS
+        )
+    except Exception as e:
+        # Still within budget: the old summary and the messages that fit
+        print(f"Conversation summary failed: {e}")
+        return plan.messages()
+
+    summary = truncate_tokens(summary, CHAT_SUMMARY_TOKENS)
+    await run_db(db, save_conversation_summary, conversation.id, summary, plan.to_summarize[-1].id)
+    # Whatever wasn't summarized is the newest messages, within half the budget
+    summarized = {msg.id for msg in plan.to_summarize}
+    return ContextPlan(
+        summary, [msg for msg in plan.recent if msg.id not in summarized], plan.user_message
+    ).messages()
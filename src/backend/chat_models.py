@@ -15,6 +15,10 @@ class Conversation(ConversationBase, table=True):
     user_id: str = Field(max_length=255, index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Rolling summary of the messages up to and including summary_through,
+    # sent in their place once they no longer fit in the context budget
+    summary: Optional[str] = Field(default=None)
+    summary_through: Optional[int] = Field(default=None)  # Message ID
 
 
 class MessageBase(SQLModel):
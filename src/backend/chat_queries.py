@@ -1,6 +1,8 @@
 from sqlmodel import Session, select
-from typing import Optional, List
+from sqlalchemy import update
+from typing import Optional, List, Tuple
 from datetime import datetime
+import json
 from .chat_models import Conversation, Message
 
 
@@ -34,6 +36,35 @@ def get_conversation_history(
     return list(reversed(messages))  # Return in chronological order
 
 
+def get_unsummarized_messages(
+    db: Session,
+    conversation_id: int,
+    after_id: Optional[int] = None,
+    limit: int = 200
+) -> List[Message]:
+    """Get the last N messages after message after_id (all if None), in chronological order."""
+    statement = select(Message).where(Message.conversation_id == conversation_id)
+    if after_id is not None:
+        statement = statement.where(Message.id > after_id)
+    messages = db.exec(statement.order_by(Message.id.desc()).limit(limit)).all()
+    return list(reversed(messages))
+
+
+def save_conversation_summary(
+    db: Session,
+    conversation_id: int,
+    summary: str,
+    through_id: int
+) -> None:
+    """Store a conversation's rolling summary, covering messages up to through_id."""
+    conversation = db.get(Conversation, conversation_id)
+    if conversation:
+        conversation.summary = summary
+        conversation.summary_through = through_id
+        db.add(conversation)
+        db.commit()
+
+
 def add_message(
     db: Session,
     conversation_id: int,
@@ -48,7 +79,7 @@ def add_message(
         user_id=user_id,
         role=role,
         content=content,
-        tool_calls=tool_calls
+        tool_calls=json.dumps(tool_calls) if tool_calls is not None else None  # Stored as JSON string
     )
     db.add(message)
 
@@ -62,6 +93,53 @@ def add_message(
     return message
 
 
+def add_turn(
+    db: Session,
+    conversation: Conversation,
+    user_id: str,
+    user_content: str,
+    assistant_content: str,
+    tool_calls: Optional[dict] = None
+) -> Tuple[Message, Message]:
+    """
+    Store a chat turn - the user's message and the assistant's reply - in one transaction.
+
+    A conversation that isn't saved yet (no ID) is inserted first; otherwise
+    its updated_at is bumped with a single UPDATE.
+
+    Returns:
+        (user message, assistant message), with IDs assigned
+    """
+    now = datetime.utcnow()
+    if conversation.id is None:
+        conversation.updated_at = now
+        db.add(conversation)
+        db.flush()  # Assigns the conversation ID
+    else:
+        db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation.id)
+            .values(updated_at=now)
+        )
+
+    user_message = Message(
+        conversation_id=conversation.id,
+        user_id=user_id,
+        role="user",
+        content=user_content
+    )
+    assistant_message = Message(
+        conversation_id=conversation.id,
+        user_id=user_id,
+        role="assistant",
+        content=assistant_content,
+        tool_calls=json.dumps(tool_calls) if tool_calls is not None else None  # Stored as JSON string
+    )
+    db.add_all([user_message, assistant_message])
+    db.commit()
+    return user_message, assistant_message
+
+
 def get_user_conversations(
     db: Session,
     user_id: str,
@@ -1,21 +1,74 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import json
 from .models import User
 
-from .chat_models import ChatRequest, ChatResponse, ToolCall
-from .database import get_session
-from .chat_queries import create_conversation, get_conversation, get_conversation_history, add_message
-from .openai_client import chat_with_ai, execute_function, get_final_response
+from .chat_models import ChatRequest, ChatResponse, ToolCall, Conversation
+from .database import get_db, run_db
+from .chat_queries import create_conversation, get_conversation, add_turn
+from .chat_context import ContextPlan, context_messages, plan_context
+from .openai_client import (
+    chat_with_ai, get_final_response,
+    stream_chat_with_ai, stream_final_response
+)
+from .tool_executor import execute_tool_calls, iter_tool_results
+from .tool_replies import render_tool_replies
 from .auth import get_current_active_user
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
+
+def prepare_chat(
+    db: Session,
+    request: ChatRequest,
+    user_id: int,
+    save_new: bool = True
+) -> Tuple[Conversation, ContextPlan]:
+    """
+    Get or create the conversation and pack its history for a turn.
+
+    With save_new=False a new conversation is returned unsaved, to be
+    inserted by add_turn() in the same transaction as the turn's messages.
+
+    Ends the transaction before returning, so the request doesn't hold a
+    pooled connection while OpenAI answers.
+
+    Raises:
+        HTTPException 404 if the conversation doesn't belong to the user
+    """
+    # Get or create conversation
+    if request.conversation_id:
+        conversation = get_conversation(
+            db, request.conversation_id
+        )
+        if not conversation or conversation.user_id != str(user_id):
+            raise HTTPException(404, "Conversation not found")
+    elif save_new:
+        conversation = create_conversation(db, str(user_id))
+    else:
+        conversation = Conversation(user_id=str(user_id))
+
+    # Pack history and the new message into the context budget
+    plan = plan_context(db, conversation, request.message)
+
+    # Detach what was loaded before rolling back the read: a rollback expires
+    # attached objects, and reading them afterwards would reconnect to reload
+    db.expunge_all()
+    db.rollback()
+    return conversation, plan
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """
     Main chat endpoint - handles user messages and AI responses.
@@ -25,7 +78,7 @@ async def chat(
     2. Fetch message history
     3. Send to OpenAI
     4. Execute any function calls
-    5. Get final AI response
+    5. Get final AI response (or render it from templates)
     6. Store messages
     7. Return response
     """
@@ -33,46 +86,22 @@ async def chat(
     try:
         user_id = current_user.id
 
-        # Step 1: Get or create conversation
-        if request.conversation_id:
-            conversation = get_conversation(
-                db, request.conversation_id
-            )
-            if not conversation or conversation.user_id != str(user_id):
-                raise HTTPException(404, "Conversation not found")
-        else:
-            conversation = create_conversation(db, str(user_id))
-
-        # Step 2: Fetch conversation history (last 10 messages)
-        history = get_conversation_history(
-            db, conversation.id, limit=10
-        )
-
-        # Format history for OpenAI
-        messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in history
-        ]
-
-        # Add new user message
-        messages.append({"role": "user", "content": request.message})
+        # Steps 1-2: Get or create conversation, fetch history
+        conversation, plan = await run_db(db, prepare_chat, request, user_id, save_new=False)
+        messages = await context_messages(db, conversation, plan)
 
         # Step 3: Send to OpenAI
-        ai_response = chat_with_ai(messages, str(user_id))
+        ai_response = await chat_with_ai(messages, str(user_id))
 
         # Step 4: Execute function calls (if any)
         tool_calls = []
         if ai_response.get("requires_function_execution"):
             function_results = []
 
-            for tool_call in ai_response["tool_calls"]:
-                result = execute_function(
-                    function_name=tool_call["function"],
-                    arguments=tool_call["arguments"],
-                    user_id=str(user_id),
-                    db=db
-                )
+            # Reads run concurrently, consecutive writes share a transaction
+            results = await execute_tool_calls(db, ai_response["tool_calls"], str(user_id))
 
+            for tool_call, result in zip(ai_response["tool_calls"], results):
                 function_results.append({
                     "tool_call_id": tool_call["id"],
                     **result
@@ -84,29 +113,24 @@ async def chat(
                     "result": result
                 })
 
-            # Step 5: Get final response from AI
-            final_response = get_final_response(messages, function_results)
+            # Step 5: Phrase predictable results from templates, else ask the AI
+            final_response = render_tool_replies(ai_response["tool_calls"], results)
+            if final_response is None:
+                final_response = await get_final_response(
+                    messages, function_results, ai_response["tool_calls"]
+                )
         else:
             # No functions called, use direct response
             final_response = ai_response["content"]
 
-        # Step 6: Store messages in database
-        # Store user message
-        user_msg = add_message(
-            db=db,
-            conversation_id=conversation.id,
+        # Step 6: Store both messages (and a new conversation) in one transaction
+        user_msg, ai_msg = await run_db(
+            db,
+            add_turn,
+            conversation,
             user_id=str(user_id),
-            role="user",
-            content=request.message
-        )
-
-        # Store AI response
-        ai_msg = add_message(
-            db=db,
-            conversation_id=conversation.id,
-            user_id=str(user_id),
-            role="assistant",
-            content=final_response,
+            user_content=request.message,
+            assistant_content=final_response,
             tool_calls={"calls": tool_calls} if tool_calls else None
         )
 
@@ -125,4 +149,99 @@ async def chat(
         print(f"Chat error: {str(e)}")
 
         # Return error response
-        raise HTTPException(500, f"Chat failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Chat failed: {str(e)}")
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Streaming chat endpoint - same flow as /api/chat, sent as Server-Sent Events.
+
+    Events:
+    - conversation: {"conversation_id"} as soon as the conversation is known
+    - tool_call: {"function", "arguments", "result"} as each function finishes
+    - token: {"content"} for each piece of the assistant's reply
+    - done: the same payload /api/chat returns, after messages are stored
+    - error: {"detail"} if the turn fails mid-stream
+    """
+    user_id = current_user.id
+    conversation, plan = await run_db(db, prepare_chat, request, user_id)
+
+    async def event_stream():
+        yield sse_event("conversation", {"conversation_id": conversation.id})
+
+        try:
+            messages = await context_messages(db, conversation, plan)
+            response_parts = []
+            tool_calls = []
+            requested_calls = []
+
+            # Send to OpenAI, streaming any direct text reply
+            async for event in stream_chat_with_ai(messages, str(user_id)):
+                if event["type"] == "token":
+                    response_parts.append(event["content"])
+                    yield sse_event("token", {"content": event["content"]})
+                else:
+                    requested_calls = event["tool_calls"]
+
+            if requested_calls:
+                # Execute function calls, reporting each batch as it completes
+                function_results = []
+                async for results in iter_tool_results(db, requested_calls, str(user_id)):
+                    for result in results:
+                        tool_call = requested_calls[len(function_results)]
+                        function_results.append({
+                            "tool_call_id": tool_call["id"],
+                            **result
+                        })
+                        tool_calls.append({
+                            "function": tool_call["function"],
+                            "arguments": tool_call["arguments"],
+                            "result": result
+                        })
+                        yield sse_event("tool_call", tool_calls[-1])
+
+                # Send a templated reply whole, or stream the AI's token by token
+                rendered = render_tool_replies(requested_calls, [tc["result"] for tc in tool_calls])
+                response_parts = []
+                if rendered is not None:
+                    response_parts.append(rendered)
+                    yield sse_event("token", {"content": rendered})
+                else:
+                    async for token in stream_final_response(messages, function_results, requested_calls):
+                        response_parts.append(token)
+                        yield sse_event("token", {"content": token})
+
+            final_response = "".join(response_parts)
+
+            # Store messages once the stream has finished
+            user_msg, ai_msg = await run_db(
+                db,
+                add_turn,
+                conversation,
+                user_id=str(user_id),
+                user_content=request.message,
+                assistant_content=final_response,
+                tool_calls={"calls": tool_calls} if tool_calls else None
+            )
+
+            yield sse_event("done", ChatResponse(
+                conversation_id=conversation.id,
+                message_id=ai_msg.id,
+                response=final_response,
+                tool_calls=tool_calls
+            ).model_dump())
+
+        except Exception as e:
+            print(f"Chat stream error: {str(e)}")
+            yield sse_event("error", {"detail": f"Chat failed: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Optional
+from .cache import TTLCache
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Content-addressed cache for OpenAI chat completions: identical requests
+# (model, messages, tools and parameters) are answered without an API call.
+# Standard library only, as the CLI (src/openai_config.py) uses it too.
+#   OPENAI_CACHE_TTL=0           disables it
+#   OPENAI_CACHE_PATH=file.db    also keeps entries in a SQLite file, shared by
+#                                workers and kept across restarts
+OPENAI_CACHE_TTL = float(os.getenv("OPENAI_CACHE_TTL", "3600"))  # seconds
+OPENAI_CACHE_SIZE = int(os.getenv("OPENAI_CACHE_SIZE", "1000"))  # entries per tier
+OPENAI_CACHE_PATH = os.getenv("OPENAI_CACHE_PATH", "")
+
+
+def completion_key(params: Dict[str, Any]) -> str:
+    """Hash of a completion request's parameters; key order doesn't matter."""
+    return hashlib.sha256(json.dumps(params, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class DiskBackend:
+    """Size-bounded, expiring key/value store in a SQLite file, evicting least recently used entries."""
+
+    def __init__(self, path: str, maxsize: int = OPENAI_CACHE_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_completions_used_at ON completions (used_at)")
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Returns (value, seconds left) or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._connection.execute("DELETE FROM completions WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE completions SET used_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1] - now
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO completions (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            self._connection.execute("DELETE FROM completions WHERE expires_at <= ?", (now,))
+            excess = self._connection.execute("SELECT COUNT(*) FROM completions").fetchone()[0] - self.maxsize
+            if excess > 0:
+                self._connection.execute(
+                    "DELETE FROM completions WHERE key IN "
+                    "(SELECT key FROM completions ORDER BY used_at LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM completions")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._connection.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        return {"size": size, "maxsize": self.maxsize, "evictions": self.evictions}
+
+
+class CompletionCache:
+    """
+    Two-tier completion cache: an in-process LRU in front of an optional
+    DiskBackend. Values are JSON-serializable dicts (the assistant message).
+    """
+
+    def __init__(self, maxsize: int = OPENAI_CACHE_SIZE, ttl: float = OPENAI_CACHE_TTL, path: str = ""):
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk = DiskBackend(path, maxsize) if path and self.enabled else None
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory.enabled
+
+    def get(self, key: str) -> Optional[dict]:
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+
+        entry = self.disk.get(key)
+        if entry is None:
+            return None
+        value, ttl = json.loads(entry[0]), entry[1]
+        self.memory.set(key, value, ttl=ttl)
+        with self._lock:
+            self.disk_hits += 1
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, json.dumps(value).encode(), self.ttl)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+        with self._lock:
+            disk_hits = self.disk_hits
+        return {
+            **memory,
+            "disk_hits": disk_hits,
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
+
+
+cache = CompletionCache(OPENAI_CACHE_SIZE, OPENAI_CACHE_TTL, OPENAI_CACHE_PATH)
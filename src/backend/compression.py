@@ -0,0 +1,166 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; without it clients get gzip
+    brotli = None
+
+# Negotiated response compression. Large task lists and chat results shrink
+# several-fold, which matters most on mobile connections; bodies below
+# COMPRESSION_MIN_SIZE go out as-is since the saving there is below the
+# per-response overhead.
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))  # 1 (fastest) - 9 (smallest)
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))  # 0 (fastest) - 11 (smallest)
+
+# Streamed responses are sent as they are produced; compressing them would
+# hold events back until the compressor flushes
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, or None for identity.
+
+    Honours q-values (q=0 refuses an encoding) and "*"; on equal q, br wins.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[name] = q
+
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Incremental gzip or brotli encoder with a common interface."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._encoder = brotli.Compressor(quality=brotli_quality)
+            self._write, self._finish = self._encoder.process, self._encoder.finish
+        else:
+            # wbits=31 writes a gzip header and trailer around the deflate stream
+            self._encoder = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._write, self._finish = self._encoder.compress, self._encoder.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._write(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int = GZIP_LEVEL,
+                  brotli_quality: int = BROTLI_QUALITY) -> bytes:
+    """Compress a complete body in one go."""
+    compressor = _Compressor(encoding, gzip_level, brotli_quality)
+    return compressor.compress(body) + compressor.finish()
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression, negotiated from Accept-Encoding.
+
+    Like Starlette's GZipMiddleware, but with brotli support, q-value
+    negotiation and a pass-through for event streams.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = choose_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+            if encoding:
+                responder = _CompressionResponder(self, encoding, send)
+                await self.app(scope, receive, responder.send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Holds back http.response.start until the first body chunk decides whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or content_type.startswith(UNCOMPRESSED_TYPES)
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            await self._start()
+            await self._send(message)
+            return
+
+        if not self.started:
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) < self.middleware.minimum_size and not more_body:
+                await self._start()
+                await self._send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._start()
+                await self._send({**message, "body": body})
+                return
+            await self._start()
+
+        body = self.compressor.compress(body)
+        if not more_body:
+            body += self.compressor.finish()
+        await self._send({**message, "body": body})
+
+    async def _start(self) -> None:
+        if not self.started:
+            self.started = True
+            await self._send(self.initial_message)
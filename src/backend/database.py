@@ -1,8 +1,14 @@
 from sqlmodel import create_engine, Session
-from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event, false, insert, inspect, select, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Callable, Dict, Optional, Union
 from urllib.parse import urlparse
 import os
 from dotenv import load_dotenv
+from .pool_metrics import TimedAsyncQueuePool, TimedQueuePool, install_idle_ping
+from .task_events import run_committed
 
 load_dotenv()
 
@@ -21,6 +27,68 @@ def setup_ssl_verification(db_url: str):
 if DATABASE_URL.startswith('postgresql'):
     DATABASE_URL = setup_ssl_verification(DATABASE_URL)
 
+# Postgres connection pool settings, per engine (i.e. per worker process).
+# Keep DB_POOL_SIZE + DB_MAX_OVERFLOW times the worker count under the
+# database's connection limit.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))  # seconds before a connection is replaced
+# always: ping on every checkout; idle: only after DB_POOL_PING_IDLE seconds
+# unused; never: rely on DB_POOL_RECYCLE alone
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "idle").lower()
+DB_POOL_PING_IDLE = float(os.getenv("DB_POOL_PING_IDLE", "30"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 disables
+
+def postgres_engine_options(async_driver: bool = False) -> Dict[str, Any]:
+    """create_engine() keyword arguments for the Postgres pool settings above."""
+    options: Dict[str, Any] = {
+        "poolclass": TimedAsyncQueuePool if async_driver else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING in ("always", "true", "1"),
+    }
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        if async_driver:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+# SQLite performance profile: WAL so readers don't block the writer,
+# synchronous=NORMAL (fsync at checkpoints rather than every commit, safe
+# in WAL mode), memory-mapped reads, a larger page cache and a busy timeout
+# so concurrent writers wait instead of failing with "database is locked".
+# Set SQLITE_PERFORMANCE=false to use SQLite's defaults.
+SQLITE_PERFORMANCE = os.getenv("SQLITE_PERFORMANCE", "true").lower() in ("1", "true", "yes")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB, i.e. 64 MiB
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMAs applied to every new SQLite connection by the performance profile."""
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "cache_size": SQLITE_CACHE_SIZE,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": "MEMORY",
+    }
+
+def apply_sqlite_pragmas(engine) -> None:
+    """Apply the performance profile PRAGMAs whenever the engine opens a connection."""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 # Create engine with proper settings
 # Use different settings for SQLite vs PostgreSQL
 if DATABASE_URL.startswith('sqlite'):
@@ -29,23 +97,153 @@ if DATABASE_URL.startswith('sqlite'):
         DATABASE_URL,
         echo=False,  # Set to True for SQL debugging
     )
+    if SQLITE_PERFORMANCE:
+        apply_sqlite_pragmas(engine)
 else:
     # PostgreSQL settings for Neon
     engine = create_engine(
         DATABASE_URL,
         echo=False,  # Set to True for SQL debugging
-        pool_pre_ping=True,  # Verify connections before use
-        pool_recycle=300,    # Recycle connections after 5 minutes
+        **postgres_engine_options()
     )
+    if DB_POOL_PRE_PING == "idle":
+        install_idle_ping(engine, DB_POOL_PING_IDLE)
+
+# DB_ASYNC=true serves requests through an AsyncSession (asyncpg for Postgres,
+# aiosqlite for SQLite) instead of a thread-pooled synchronous Session
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+def to_async_url(db_url: str) -> str:
+    """Map a sync database URL onto its async driver."""
+    if db_url.startswith('sqlite'):
+        return db_url.replace('sqlite://', 'sqlite+aiosqlite://', 1)
+    db_url = db_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    # asyncpg takes ssl=... rather than libpq's sslmode=...
+    return db_url.replace('sslmode=', 'ssl=')
+
+_async_engine: Optional[AsyncEngine] = None
+
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        if DATABASE_URL.startswith('sqlite'):
+            _async_engine = create_async_engine(to_async_url(DATABASE_URL), echo=False)
+            if SQLITE_PERFORMANCE:
+                apply_sqlite_pragmas(_async_engine.sync_engine)
+        else:
+            _async_engine = create_async_engine(
+                to_async_url(DATABASE_URL),
+                echo=False,
+                **postgres_engine_options(async_driver=True)
+            )
+            if DB_POOL_PRE_PING == "idle":
+                install_idle_ping(_async_engine.sync_engine, DB_POOL_PING_IDLE)
+    return _async_engine
+
+def active_engine():
+    """The engine serving requests in the configured mode."""
+    return get_async_engine().sync_engine if DB_ASYNC else engine
 
 def get_session():
     with Session(engine) as session:
         yield session
 
+async def get_db():
+    """
+    Request-scoped database session for async routes.
+
+    Yields an AsyncSession when DB_ASYNC is set, otherwise a sync Session.
+    Use run_db() to run queries against either.
+    """
+    # expire_on_commit=False so objects returned by run_db() stay readable on
+    # the event loop without a lazy reload
+    if DB_ASYNC:
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+            yield session
+    else:
+        session = Session(engine, expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            # Closing rolls back the open transaction and checks the
+            # connection back in, blocking round trips on Postgres
+            await run_in_threadpool(session.close)
+
+async def run_db(db: Union[Session, AsyncSession], fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a synchronous query function fn(session, *args, **kwargs) without blocking the event loop.
+
+    With an AsyncSession the function runs through run_sync on the async
+    driver, and task change notifications for what it committed are sent
+    from the threadpool afterwards; with a sync Session it runs in the
+    threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        try:
+            return await db.run_sync(fn, *args, **kwargs)
+        finally:
+            await run_committed(db.sync_session)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+async def run_db_session(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Like run_db(), but in a new session of its own, so several calls can
+    run concurrently (a session serves one query at a time).
+    """
+    if DB_ASYNC:
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+            return await run_db(session, fn, *args, **kwargs)
+
+    def call():
+        with Session(engine, expire_on_commit=False) as session:
+            return fn(session, *args, **kwargs)
+
+    return await run_in_threadpool(call)
+
 # Function to create tables
 def create_tables():
-    from .models import Task, User
+    from .models import Task, TaskChange, TaskStats, TaskTag, User
     from .chat_models import Conversation, Message
     from sqlmodel import SQLModel
 
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    has_change_log = inspect(engine).has_table(TaskChange.__tablename__)
+    SQLModel.metadata.create_all(engine)
+
+    # Seed the delta-sync change log with the tasks that predate it, so a
+    # first sync from scratch still returns every task
+    if not has_change_log:
+        with engine.begin() as connection:
+            connection.execute(
+                insert(TaskChange.__table__).from_select(
+                    ["task_id", "user_id", "deleted", "changed_at"],
+                    select(Task.id, Task.user_id, false(), Task.updated_at).order_by(Task.id)
+                )
+            )
+
+    # create_all skips indexes on tables that already exist, so make sure
+    # indexes added after the initial schema are present too
+    for index in Task.__table__.indexes | TaskTag.__table__.indexes:
+        index.create(engine, checkfirst=True)
+
+    # Likewise for the rolling summary columns added to conversations
+    conversation_columns = {column["name"] for column in inspect(engine).get_columns("conversations")}
+    with engine.begin() as connection:
+        if "summary" not in conversation_columns:
+            connection.execute(text("ALTER TABLE conversations ADD COLUMN summary TEXT"))
+        if "summary_through" not in conversation_columns:
+            connection.execute(text("ALTER TABLE conversations ADD COLUMN summary_through INTEGER"))
+
+    # Title search index (FTS5 on SQLite, pg_trgm on Postgres)
+    from .task_search import setup_search
+    setup_search(engine)
+
+    # Counters for users that have none yet, so first reads don't create them
+    from .task_queries import backfill_task_stats
+    with Session(engine) as session:
+        backfill_task_stats(session)
+        session.commit()
+
+    # Tags still in the legacy tasks.tags column move to task_tags
+    from .migrate_task_tags import migrate_tags
+    migrate_tags()
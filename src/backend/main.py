@@ -1,20 +1,36 @@
-from fastapi import FastAPI, HTTPException, Query, Depends, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, Depends, HTTPException, status, Header, Response, WebSocket
+from fastapi.websockets import WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
-from sqlmodel import Session, select
+from sqlmodel import Session
 from datetime import datetime, timedelta
-import json
+import asyncio
+import hashlib
 from passlib.context import CryptContext
 
-from .database import get_session, create_tables
+from .database import get_db, run_db, create_tables, active_engine
+from .pool_metrics import pool_stats
 from .models import (
-    Task, TaskCreate, TaskUpdate, TaskResponse,
+    Task, TaskCreate, TaskUpdate, TaskResponse, TaskBatchRequest,
     User, UserRegister, UserLogin, UserResponse, Token
 )
 from .chat_routes import router as chat_router
+from .task_queries import (
+    get_task_page, count_user_tasks, read_task_stats, get_user_task, create_user_task,
+    update_user_task, delete_user_task, toggle_user_task, apply_task_batch,
+    read_task_version, get_task_changes, task_changes_error,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_BATCH_SIZE
+)
+from .user_queries import user_exists, create_user
+from .task_search import highlight_title
+from .compression import CompressionMiddleware, COMPRESSION_ENABLED
+from .task_events import bus as task_event_bus
+from . import completion_cache, task_cache
 from .auth import (
-    authenticate_user, create_access_token,
-    get_current_user, get_current_active_user, get_password_hash, verify_password
+    authenticate_user_async, create_access_token,
+    get_current_user, get_current_active_user, get_password_hash_async,
+    token_cache
 )
 
 app = FastAPI(title="DreamFlow API", version="1.0.0")
@@ -28,6 +44,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (task lists, chat results) with gzip or brotli,
+# whichever the client accepts
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Create tables on startup
 @app.on_event("startup")
 def on_startup():
@@ -38,34 +59,25 @@ app.include_router(chat_router)
 
 # Authentication endpoints
 @app.post("/api/register", response_model=UserResponse)
-async def register_user(user_data: UserRegister, session: Session = Depends(get_session)):
+async def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
     """Register a new user."""
     try:
-        # Check if user already exists
-        existing_user = session.query(User).filter(
-            (User.email == user_data.email) | (User.username == user_data.username)
-        ).first()
-
-        if existing_user:
+        # Check if user already exists; this also releases the connection
+        # while the password is hashed
+        if await run_db(db, user_exists, user_data.email, user_data.username):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this email or username already exists"
             )
 
-        # Hash the password
-        hashed_password = get_password_hash(user_data.password)
+        # Hash in the bounded password executor
+        hashed_password = await get_password_hash_async(user_data.password)
 
         # Create new user
-        new_user = User(
-            email=user_data.email,
-            username=user_data.username,
-            hashed_password=hashed_password
+        new_user = await run_db(
+            db, create_user, user_data.email, user_data.username, hashed_password
         )
 
-        session.add(new_user)
-        session.commit()
-        session.refresh(new_user)
-
         return new_user
     except HTTPException:
         raise
@@ -77,9 +89,9 @@ async def register_user(user_data: UserRegister, session: Session = Depends(get_
         )
 
 @app.post("/api/login", response_model=Token)
-async def login_user(user_credentials: UserLogin, session: Session = Depends(get_session)):
+async def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Login a user and return access token."""
-    user = authenticate_user(session, user_credentials.email, user_credentials.password)
+    user = await authenticate_user_async(db, user_credentials.email, user_credentials.password)
 
     if not user:
         raise HTTPException(
@@ -102,219 +114,426 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 
 # Helper function to convert SQLAlchemy model to response model
 def task_to_response(task: Task) -> TaskResponse:
-    # Parse tags from JSON string to list
-    try:
-        tags_list = json.loads(task.tags) if task.tags else []
-    except (json.JSONDecodeError, TypeError):
-        tags_list = []
-
     return TaskResponse(
         id=task.id,
         title=task.title,
         completed=task.completed,
         priority=task.priority,
-        tags=tags_list,
+        tags=[row.tag for row in task.tag_rows],
         due_date=task.due_date,
         user_id=task.user_id,
         created_at=task.created_at,
         updated_at=task.updated_at
     )
 
+# Fast path for task payloads: rows are projected straight to dicts and
+# returned as ORJSONResponse, so lists skip per-row model validation and
+# FastAPI's jsonable_encoder pass
+def task_to_dict(task: Task) -> dict:
+    """Same keys and values as task_to_response(task).model_dump()."""
+    return {
+        "title": task.title,
+        "completed": task.completed,
+        "priority": task.priority,
+        "tags": [row.tag for row in task.tag_rows],
+        "due_date": task.due_date,
+        "id": task.id,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at
+    }
+
+# Conditional GET: task reads carry an ETag built from the user's task
+# version, so unchanged polls get a 304 before any Task row is loaded
+def task_etag(user_id: int, version: int, *parts) -> str:
+    """Weak ETag for a task read; changes whenever any of the user's tasks change."""
+    key = "|".join(str(part) for part in parts)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{user_id}-{version}-{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
+
+async def cached_read(user_id: int, kind: str, *parts):
+    """Look up a read model in the shared task cache. Returns (value or None, key to store under)."""
+    if task_cache.cache is None:
+        return None, None
+    return await task_cache.cache.lookup(user_id, kind, *parts)
+
+async def store_read(key: Optional[str], value: bytes) -> None:
+    if task_cache.cache is not None:
+        await task_cache.cache.store(key, value)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to DreamFlow API"}
 
+@app.get("/api/metrics")
+async def get_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Get in-process cache and resource counters for tuning.
+
+    Any signed-in user can read these, so they carry counters and sizes
+    only, never backend hosts or file paths.
+    """
+    return {
+        "success": True,
+        "data": {
+            "auth_cache": token_cache.stats(),
+            "db_pool": pool_stats(active_engine()),
+            "task_events": task_event_bus.stats(),
+            "task_cache": task_cache.cache.stats() if task_cache.cache is not None else None,
+            "openai_cache": completion_cache.cache.stats()
+        }
+    }
+
 @app.get("/api/tasks")
 async def get_tasks(
     filter_param: str = Query("all", alias="filter"),
     search: str = Query(""),
+    highlight: bool = Query(False),
+    tag: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
-    """Get all tasks for the current user with optional filtering and search"""
-    statement = select(Task)
-
-    # Filter by current user's ID
-    statement = statement.where(Task.user_id == current_user.id)
-
-    # Apply search filter
-    if search:
-        statement = statement.where(Task.title.contains(search))
+    """Get a page of tasks for the current user with optional filtering, tag filter and search.
+
+    Tasks are ordered by creation time, or by relevance when searching. Pass
+    the returned `next_cursor` as `cursor` to fetch the following page; it is
+    null on the last page. With `highlight=true`, search results include an
+    HTML-escaped `highlight` title with matches wrapped in <mark>.
+
+    `count` is the number of tasks on this page; `total` is the number of
+    tasks matching the filters across all pages. The old `page` field is no
+    longer sent, since pages are addressed by cursor.
+
+    Responses carry an ETag; send it back as If-None-Match to get a 304
+    when none of the user's tasks have changed.
+    """
+    query = (filter_param, search, highlight, tag, limit, cursor)
+    cached, cache_key = await cached_read(current_user.id, "tasks", *query)
+    if cached is not None:
+        etag, body = task_cache.unpack_response(cached)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return Response(body, media_type="application/json", headers=etag_headers(etag))
+
+    # Read the version before the tasks, so a concurrent write can only
+    # make the ETag older than the data, never newer
+    version = await run_db(db, read_task_version, current_user.id)
+    etag = task_etag(current_user.id, version, "tasks", *query)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
 
     # Apply status filter
+    completed = None
     if filter_param == "active":
-        statement = statement.where(Task.completed == False)
+        completed = False
     elif filter_param == "completed":
-        statement = statement.where(Task.completed == True)
+        completed = True
 
-    tasks = session.exec(statement).all()
+    try:
+        tasks, next_cursor = await run_db(
+            db,
+            get_task_page,
+            current_user.id,
+            limit=limit,
+            cursor=cursor,
+            completed=completed,
+            search=search,
+            tag=tag
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await run_db(db, count_user_tasks, current_user.id, completed=completed, search=search, tag=tag)
 
     # Convert to response format
-    task_responses = [task_to_response(task) for task in tasks]
+    task_responses = [task_to_dict(task) for task in tasks]
+    if highlight and search.strip():
+        for task_response in task_responses:
+            task_response["highlight"] = highlight_title(task_response["title"], search.strip())
 
-    return {
+    response = ORJSONResponse({
         "success": True,
         "data": {
             "tasks": task_responses,
-            "total": len(task_responses),
-            "page": 1,
-            "limit": len(task_responses)
+            "count": len(task_responses),
+            "total": total,
+            "limit": limit,
+            "next_cursor": next_cursor
         }
-    }
+    }, headers=etag_headers(etag))
+    await store_read(cache_key, task_cache.pack_response(etag, response.body))
+    return response
 
 @app.post("/api/tasks")
 async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Create a new task for the current user"""
     # Validate priority
     if task_data.priority not in ["high", "medium", "low"]:
         raise HTTPException(status_code=400, detail="Priority must be high, medium, or low")
 
-    # Convert tags list to JSON string
-    tags_json = json.dumps(task_data.tags) if task_data.tags else "[]"
-
     # Create new task with current user's ID
-    new_task = Task(
-        title=task_data.title,
-        completed=task_data.completed,
-        priority=task_data.priority,
-        tags=tags_json,
-        due_date=task_data.due_date,
-        user_id=current_user.id  # Set to current user's ID
+    new_task = await run_db(db, create_user_task, current_user.id, task_data)
+
+    return ORJSONResponse({
+        "success": True,
+        "data": task_to_dict(new_task),
+        "message": "Task created successfully"
+    })
+
+@app.post("/api/tasks/batch")
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Apply many create/update/delete/toggle operations in one request and one transaction.
+
+    Returns one result per operation, in order. Failed operations are
+    skipped; with `atomic` set, nothing is applied if any operation fails
+    and the request returns 400 with the per-item results.
+    """
+    if len(batch.operations) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"A batch can have at most {MAX_BATCH_SIZE} operations")
+
+    results, applied = await run_db(
+        db, apply_task_batch, current_user.id, batch.operations, batch.atomic
     )
 
-    session.add(new_task)
-    session.commit()
-    session.refresh(new_task)
+    item_results = [
+        {
+            "index": result["index"],
+            "op": result["op"],
+            "success": result["success"],
+            "data": task_to_dict(result["task"]) if result["task"] is not None else None,
+            "error": result["error"]
+        }
+        for result in results
+    ]
+    failed = len([result for result in results if not result["success"]])
 
-    return {
+    if not applied:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Batch not applied: some operations failed", "results": item_results}
+        )
+
+    return ORJSONResponse({
+        "success": failed == 0,
+        "data": {
+            "results": item_results,
+            "applied": len(results) - failed,
+            "failed": failed
+        },
+        "message": f"Applied {len(results) - failed} of {len(results)} operations"
+    })
+
+# Registered before /api/tasks/{task_id} so "stats" is not parsed as a task ID
+@app.get("/api/tasks/stats")
+async def get_task_stats(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get task statistics for the current user"""
+    # Overdue/due-today change with the date, so it is part of the cache key
+    cached, cache_key = await cached_read(current_user.id, "stats", datetime.utcnow().date().isoformat())
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+
+    # Read from the per-user task_stats counters
+    stats = await run_db(db, read_task_stats, current_user.id)
+
+    response = ORJSONResponse({
         "success": True,
-        "data": task_to_response(new_task),
-        "message": "Task created successfully"
-    }
+        "data": stats
+    })
+    await store_read(cache_key, response.body)
+    return response
+
+@app.websocket("/api/tasks/events")
+async def task_events_socket(
+    websocket: WebSocket,
+    token: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Push the current user's task changes as they commit, from any device or the assistant.
+
+    Connect with the access token as `?token=` (browsers can't set headers
+    on a WebSocket). After a {"type": "ready"} message, each committed
+    write arrives as {"type": "tasks.changed", "changed": [ids], "deleted": [ids]};
+    fetch the details with GET /api/tasks/changes. {"type": "resync"}
+    means events were dropped and the client should sync now.
+    """
+    try:
+        current_user = await get_current_user(token, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # Read the ID first: the rollback expires current_user, and reading it
+    # afterwards would check out a connection again to reload it
+    user_id = current_user.id
+    # Hand the connection back to the pool; the socket may stay open for hours
+    await run_db(db, lambda session: session.rollback())
+
+    await websocket.accept()
+    subscription = task_event_bus.subscribe(user_id)
+    try:
+        await websocket.send_json({"type": "ready"})
+
+        async def forward_events():
+            while True:
+                await websocket.send_json(await subscription.get())
+
+        async def wait_for_disconnect():
+            # Clients don't send anything; this returns when they go away
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        tasks = [asyncio.create_task(forward_events()), asyncio.create_task(wait_for_disconnect())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        task_event_bus.unsubscribe(subscription)
+
+# Registered before /api/tasks/{task_id} so "changes" is not parsed as a task ID
+@app.get("/api/tasks/changes")
+async def get_task_changes_since(
+    since: Optional[str] = Query(None),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delta sync: tasks created or changed since a sync token, plus IDs of deleted tasks.
+
+    Omit `since` on the first sync to get every task. Store the returned
+    `next_since` and send it as `since` next time; while `has_more` is true,
+    call again straight away. Supports If-None-Match like GET /api/tasks.
+    """
+    version = await run_db(db, read_task_version, current_user.id)
+    etag = task_etag(current_user.id, version, "changes", since, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    try:
+        tasks, deleted, next_since, has_more = await run_db(
+            db, get_task_changes, current_user.id, since=since, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ORJSONResponse({
+        "success": True,
+        "data": {
+            "tasks": [task_to_dict(task) for task in tasks],
+            "deleted": deleted,
+            "next_since": next_since,
+            "has_more": has_more
+        }
+    }, headers=etag_headers(etag))
 
 @app.get("/api/tasks/{task_id}")
 async def get_task(
     task_id: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
-    """Get a specific task by ID for the current user"""
-    task = session.get(Task, task_id)
-    if not task or task.user_id != current_user.id:  # Check if task belongs to current user
+    """Get a specific task by ID for the current user. Supports If-None-Match like GET /api/tasks."""
+    version = await run_db(db, read_task_version, current_user.id)
+    etag = task_etag(current_user.id, version, "task", task_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    task = await run_db(db, get_user_task, current_user.id, task_id)
+    if not task:  # Only the current user's tasks are found
         raise HTTPException(status_code=404, detail="Task not found")
 
-    return {
+    return ORJSONResponse({
         "success": True,
-        "data": task_to_response(task)
-    }
+        "data": task_to_dict(task)
+    }, headers=etag_headers(etag))
 
 @app.put("/api/tasks/{task_id}")
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Update a specific task by ID for the current user"""
-    task = session.get(Task, task_id)
-    if not task or task.user_id != current_user.id:  # Check if task belongs to current user
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    # Update task fields
+    # Update task fields, checked the same way as batch updates
     update_data = task_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        if field == "tags" and value is not None:
-            # Convert tags list to JSON string
-            setattr(task, field, json.dumps(value))
-        else:
-            setattr(task, field, value)
-
-    task.updated_at = datetime.utcnow()
-    session.add(task)
-    session.commit()
-    session.refresh(task)
+    error = task_changes_error(update_data)
+    if error is not None:
+        raise HTTPException(status_code=400, detail=error)
+    task = await run_db(db, update_user_task, current_user.id, task_id, update_data)
+    if not task:  # Only the current user's tasks are found
+        raise HTTPException(status_code=404, detail="Task not found")
 
-    return {
+    return ORJSONResponse({
         "success": True,
-        "data": task_to_response(task),
+        "data": task_to_dict(task),
         "message": "Task updated successfully"
-    }
+    })
 
 @app.delete("/api/tasks/{task_id}")
 async def delete_task(
     task_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Delete a specific task by ID for the current user"""
-    task = session.get(Task, task_id)
-    if not task or task.user_id != current_user.id:  # Check if task belongs to current user
+    task = await run_db(db, delete_user_task, current_user.id, task_id)
+    if not task:  # Only the current user's tasks are found
         raise HTTPException(status_code=404, detail="Task not found")
 
-    session.delete(task)
-    session.commit()
-
-    return {
+    return ORJSONResponse({
         "success": True,
-        "data": task_to_response(task),
+        "data": task_to_dict(task),
         "message": "Task deleted successfully"
-    }
+    })
 
 @app.patch("/api/tasks/{task_id}/toggle-complete")
 async def toggle_task_completion(
     task_id: int,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    db: Session = Depends(get_db)
 ):
     """Toggle the completion status of a task for the current user"""
-    task = session.get(Task, task_id)
-    if not task or task.user_id != current_user.id:  # Check if task belongs to current user
+    task = await run_db(db, toggle_user_task, current_user.id, task_id)
+    if not task:  # Only the current user's tasks are found
         raise HTTPException(status_code=404, detail="Task not found")
 
-    task.completed = not task.completed
-    task.updated_at = datetime.utcnow()
-    session.add(task)
-    session.commit()
-    session.refresh(task)
-
-    return {
+    return ORJSONResponse({
         "success": True,
-        "data": task_to_response(task),
+        "data": task_to_dict(task),
         "message": "Task completion status updated"
-    }
-
-@app.get("/api/tasks/stats")
-async def get_task_stats(
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
-):
-    """Get task statistics for the current user"""
-    # Filter by current user's ID
-    all_tasks = session.exec(select(Task).where(Task.user_id == current_user.id)).all()
-
-    total = len(all_tasks)
-    completed = len([t for t in all_tasks if t.completed])
-    active = total - completed
-
-    by_priority = {
-        "high": len([t for t in all_tasks if t.priority == "high"]),
-        "medium": len([t for t in all_tasks if t.priority == "medium"]),
-        "low": len([t for t in all_tasks if t.priority == "low"])
-    }
-
-    return {
-        "success": True,
-        "data": {
-            "total": total,
-            "completed": completed,
-            "active": active,
-            "byPriority": by_priority
-        }
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
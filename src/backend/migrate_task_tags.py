@@ -0,0 +1,69 @@
+"""
+Migration script to move legacy JSON tags from tasks.tags into the task_tags table.
+
+Safe to re-run: only tasks whose tags column still holds tags are touched,
+and the column is reset to "[]" once a task's tags are in task_tags.
+
+create_tables() runs it, so the app migrates on startup. To run it by hand,
+from the project root:
+    python -m src.backend.migrate_task_tags
+"""
+
+import sys
+from sqlmodel import Session, select
+from .database import create_tables, engine
+from .models import Task
+from .task_queries import parse_tags, record_task_changes, set_task_tags, update_task_stats
+
+BATCH_SIZE = 1000
+
+
+def migrate_tags(batch_size: int = BATCH_SIZE) -> int:
+    """Copy legacy tags into task_tags in batches. Returns the number of tasks migrated."""
+    migrated = 0
+    last_id = 0
+    with Session(engine) as session:
+        while True:
+            # Workers starting together each take batches the others haven't
+            # locked (Postgres; SQLite serializes the writes anyway)
+            tasks = session.exec(
+                select(Task)
+                .where(Task.id > last_id, Task.tags.is_not(None), Task.tags.not_in(["", "[]"]))
+                .order_by(Task.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not tasks:
+                break
+
+            for task in tasks:
+                # Merge with any tags already written through the new API
+                tags = [row.tag for row in task.tag_rows]
+                tags += [tag for tag in parse_tags(task.tags) if tag not in tags]
+                set_task_tags(task, tags)
+                task.tags = "[]"
+                session.add(task)
+
+            # Bump each affected user's task version so cached ETags expire,
+            # and log the tasks so delta sync clients pick up their tags
+            for user_id in {task.user_id for task in tasks}:
+                update_task_stats(session, user_id, None, None)
+                record_task_changes(session, user_id, changed=[task.id for task in tasks if task.user_id == user_id])
+
+            session.commit()
+            migrated += len(tasks)
+            last_id = tasks[-1].id
+            print(f"Migrated tags for {migrated} task(s)...")
+
+    return migrated
+
+
+if __name__ == "__main__":
+    try:
+        # Creates any missing tables, then migrates
+        create_tables()
+        print("Done: legacy tags are in task_tags")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Migration failed: {str(e)}")
+        sys.exit(1)
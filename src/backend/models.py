@@ -1,7 +1,7 @@
-from sqlmodel import SQLModel, Field
-from typing import Optional
+from sqlmodel import SQLModel, Field, Relationship
+from typing import Optional, List, Union
 from datetime import datetime, timedelta
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index, UniqueConstraint
 import bcrypt
 import jwt
 from enum import Enum
@@ -57,28 +57,111 @@ class TaskBase(SQLModel):
     title: str
     completed: bool = False
     priority: str = "medium"  # "high", "medium", "low"
-    tags: Optional[str] = "[]"  # Store as JSON string
+    tags: Optional[str] = "[]"  # Legacy JSON string; tags now live in task_tags
     due_date: Optional[str] = None  # ISO date format
 
 class Task(TaskBase, table=True):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination index for GET /api/tasks (user_id, created_at, id)
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Same order for the active/completed filters, so the status filter
+        # doesn't turn into filter-then-sort
+        Index("ix_tasks_user_id_completed_created_at_id", "user_id", "completed", "created_at", "id"),
+        # Overdue/due-today counts in /api/tasks/stats: a range on due_date,
+        # with completed included so the count never touches the table
+        Index("ix_tasks_user_id_due_date_completed", "user_id", "due_date", "completed"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(nullable=False, foreign_key="users.id", index=True)  # Reference to users table
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # Loaded with one extra IN query per batch of tasks, never per row
+    tag_rows: List["TaskTag"] = Relationship(
+        sa_relationship_kwargs={
+            "lazy": "selectin",
+            "cascade": "all, delete-orphan",
+            "order_by": "TaskTag.tag"
+        }
+    )
+
+class TaskTag(SQLModel, table=True):
+    """One tag on one task. user_id is copied from the task so tag filters are a single index lookup."""
+    __tablename__ = "task_tags"
+    __table_args__ = (
+        # Tag filter index for GET /api/tasks?tag= (user_id, tag, task_id)
+        Index("ix_task_tags_user_id_tag", "user_id", "tag", "task_id"),
+    )
+
+    task_id: int = Field(primary_key=True, foreign_key="tasks.id", ondelete="CASCADE")
+    tag: str = Field(primary_key=True, max_length=100)
+    user_id: int = Field(nullable=False, foreign_key="users.id")
+
+class TaskStats(SQLModel, table=True):
+    """Per-user task counters, updated in the same transaction as task writes."""
+    __tablename__ = "task_stats"
+
+    user_id: int = Field(primary_key=True, foreign_key="users.id")
+    total: int = Field(default=0)
+    completed: int = Field(default=0)
+    high: int = Field(default=0)
+    medium: int = Field(default=0)
+    low: int = Field(default=0)
+    # Bumped on every write to the user's tasks; the ETag for task reads
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class TaskChange(SQLModel, table=True):
+    """
+    Change log for delta sync: the latest change to each task, in seq order.
+
+    A task's row is replaced on every write, so the log holds one row per
+    task (a tombstone once it is deleted) and a sync reads only the rows
+    newer than the client's seq. Rows are keyed on (user_id, task_id):
+    SQLite can hand a deleted task's ID to another user's new task, and
+    that must not replace the first user's tombstone.
+    """
+    __tablename__ = "task_changes"
+    __table_args__ = (
+        # GET /api/tasks/changes reads (user_id, seq > since) in seq order
+        Index("ix_task_changes_user_id_seq", "user_id", "seq"),
+        UniqueConstraint("user_id", "task_id", name="uq_task_changes_user_id_task_id"),
+        # Never reuse a seq, even one whose row was replaced
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    task_id: int = Field(nullable=False)  # No FK: tombstones outlive the task
+    user_id: int = Field(nullable=False, foreign_key="users.id")
+    deleted: bool = Field(default=False)
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
+
 class TaskCreate(TaskBase):
-    pass  # Same as base but without ID
+    # A list of tags, or a JSON-encoded list as older clients send
+    tags: Optional[Union[List[str], str]] = None
 
 class TaskUpdate(SQLModel):
     title: Optional[str] = None
     completed: Optional[bool] = None
     priority: Optional[str] = None
-    tags: Optional[str] = None
+    tags: Optional[Union[List[str], str]] = None
     due_date: Optional[str] = None
 
+class TaskBatchOperation(SQLModel):
+    """One operation in a POST /api/tasks/batch request."""
+    op: str  # "create", "update", "delete" or "toggle"
+    id: Optional[int] = None  # Required for update, delete and toggle
+    task: Optional[TaskCreate] = None  # Required for create
+    changes: Optional[TaskUpdate] = None  # Required for update
+
+class TaskBatchRequest(SQLModel):
+    operations: List[TaskBatchOperation]
+    atomic: bool = False  # If true, apply nothing unless every operation succeeds
+
 class TaskResponse(TaskBase):
     id: int
+    tags: List[str] = []
     created_at: datetime
     updated_at: datetime
\ No newline at end of file
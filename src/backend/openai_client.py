@@ -1,16 +1,30 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessage
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import os
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, AsyncIterator
 from sqlmodel import Session
-
-# Initialize client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from . import completion_cache
 
 # Configuration - using gpt-4o-mini as specified in the budget strategy
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # Budget-friendly
 MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "300"))  # Cost control
 TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))  # Balance creativity/consistency
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))  # Seconds per request
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))  # In-flight requests per worker
+
+# Initialize client - async so a chat turn never blocks the event loop
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    timeout=OPENAI_TIMEOUT,
+    max_retries=OPENAI_MAX_RETRIES
+)
+
+# Caps concurrent OpenAI requests; extra chats wait for a free slot
+openai_slots = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
 
 
 # Define the tools/functions for task management
@@ -138,9 +152,93 @@ Task display format:
 """
 
 
-def chat_with_ai(
+async def cache_get(store: completion_cache.CompletionCache, key: str) -> Optional[dict]:
+    """store.get() for the event loop: disk lookups run in the threadpool."""
+    if store.disk is None:
+        return store.get(key)
+    return await run_in_threadpool(store.get, key)
+
+
+async def cache_set(store: completion_cache.CompletionCache, key: str, value: dict) -> None:
+    if store.disk is None:
+        return store.set(key, value)
+    await run_in_threadpool(store.set, key, value)
+
+
+async def create_completion(cache: bool = True, **params) -> ChatCompletionMessage:
+    """
+    Create a chat completion and return its message.
+
+    Identical requests (same endpoint, model, messages, tools and
+    parameters) are answered from the completion cache; pass cache=False
+    to always ask OpenAI, e.g. when a fresh sample is wanted.
+    """
+    store = completion_cache.cache
+    key = None
+    if cache and store.enabled:
+        key = completion_cache.completion_key({"base_url": str(client.base_url), **params})
+    if key is not None:
+        cached = await cache_get(store, key)
+        if cached is not None:
+            return ChatCompletionMessage.model_validate(cached)
+
+    async with openai_slots:
+        response = await client.chat.completions.create(**params)
+
+    message = response.choices[0].message
+    if key is not None:
+        await cache_set(store, key, message.model_dump())
+    return message
+
+
+SUMMARY_PROMPT = """Summarize this conversation between a user and their task management assistant.
+
+Keep what later turns may depend on: tasks mentioned (with IDs), what the
+user asked for, what was done, and any open questions. Be brief and factual.
+Write the summary only, as plain text.
+"""
+
+
+async def summarize_conversation(
+    summary: Optional[str],
     messages: List[Dict[str, str]],
-    user_id: str
+    max_tokens: int,
+    cache: bool = True
+) -> str:
+    """
+    Fold older messages into a conversation's rolling summary.
+
+    Args:
+        summary: The current summary, if any, covering the turns before messages
+        messages: The messages to add to it, oldest first
+        max_tokens: Longest summary to return
+        cache: Answer from the completion cache if possible
+
+    Returns:
+        The new summary text
+    """
+    transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+    if summary:
+        transcript = f"Summary so far:\n{summary}\n\nLater messages:\n{transcript}"
+
+    message = await create_completion(
+        cache,
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": transcript}
+        ],
+        max_tokens=max_tokens,
+        temperature=0
+    )
+
+    return message.content or ""
+
+
+async def chat_with_ai(
+    messages: List[Dict[str, str]],
+    user_id: str,
+    cache: bool = True
 ) -> Dict[str, Any]:
     """
     Send messages to OpenAI and get response with potential function calls.
@@ -148,6 +246,7 @@ def chat_with_ai(
     Args:
         messages: List of conversation messages
         user_id: Current user ID for function execution
+        cache: Answer from the completion cache if possible
 
     Returns:
         dict with 'content' (text response) and 'tool_calls' (functions called)
@@ -160,7 +259,8 @@ def chat_with_ai(
         ]
 
         # Call OpenAI
-        response = client.chat.completions.create(
+        message = await create_completion(
+            cache,
             model=OPENAI_MODEL,
             messages=full_messages,
             tools=TOOLS,
@@ -168,8 +268,6 @@ def chat_with_ai(
             temperature=TEMPERATURE
         )
 
-        message = response.choices[0].message
-
         # Check if AI wants to call functions
         if message.tool_calls:
             return {
@@ -201,6 +299,66 @@ def chat_with_ai(
         }
 
 
+async def stream_chat_with_ai(
+    messages: List[Dict[str, str]],
+    user_id: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming version of chat_with_ai.
+
+    Yields:
+        {"type": "token", "content": str} for each piece of assistant text, then
+        {"type": "tool_calls", "tool_calls": [...]} once if the AI called functions
+        (same shape as chat_with_ai's 'tool_calls')
+    """
+    full_messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        *messages
+    ]
+
+    # Tool call fragments arrive spread over many chunks, keyed by index
+    partial_calls: Dict[int, Dict[str, str]] = {}
+
+    async with openai_slots:
+        stream = await client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=full_messages,
+            tools=TOOLS,
+            max_tokens=MAX_TOKENS,
+            temperature=TEMPERATURE,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+
+            if delta.content:
+                yield {"type": "token", "content": delta.content}
+
+            for tc in delta.tool_calls or []:
+                call = partial_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function and tc.function.name:
+                    call["name"] += tc.function.name
+                if tc.function and tc.function.arguments:
+                    call["arguments"] += tc.function.arguments
+
+    if partial_calls:
+        yield {
+            "type": "tool_calls",
+            "tool_calls": [
+                {
+                    "id": call["id"],
+                    "function": call["name"],
+                    "arguments": json.loads(call["arguments"] or "{}")
+                }
+                for _, call in sorted(partial_calls.items())
+            ]
+        }
+
+
 def execute_function(
     function_name: str,
     arguments: Dict[str, Any],
@@ -208,7 +366,7 @@ def execute_function(
     db: Session
 ) -> Dict[str, Any]:
     """
-    Execute the called function and return result.
+    Execute the called function in its own transaction and return result.
 
     Args:
         function_name: Name of function to call
@@ -219,204 +377,276 @@ def execute_function(
     Returns:
         Function execution result
     """
-    from .models import Task, TaskCreate
-    from datetime import datetime
-    import json
+    return execute_functions([{"function": function_name, "arguments": arguments}], user_id, db)[0]
+
+
+def execute_functions(
+    calls: List[Dict[str, Any]],
+    user_id: str,
+    db: Session
+) -> List[Dict[str, Any]]:
+    """
+    Execute function calls in order, committing them in one transaction.
+
+    The calls run in a savepoint. If one raises, only the savepoint is rolled
+    back and the calls are retried one transaction each, so one failing call
+    can't undo the others.
 
+    Args:
+        calls: Tool calls, each with 'function' and 'arguments'
+        user_id: User ID for database operations
+        db: Database session
+
+    Returns:
+        One result per call, in order
+    """
     try:
-        if function_name == "add_task":
-            from .main import task_to_response
-
-            # Create a new task using TaskCreate model
-            task_create_data = TaskCreate(
-                title=arguments["title"],
-                completed=False,
-                priority="medium",
-                tags=[],  # Empty tags list
-                due_date=arguments.get("description")
-            )
-
-            # Convert user_id to integer for the new schema
-            user_id_int = int(user_id)
-
-            # Create task object with user_id
-            new_task = Task(
-                title=task_create_data.title,
-                completed=task_create_data.completed,
-                priority=task_create_data.priority,
-                tags=json.dumps(task_create_data.tags) if task_create_data.tags else "[]",
-                due_date=task_create_data.due_date,
-                user_id=user_id_int  # Use the converted user_id
-            )
-
-            db.add(new_task)
-            db.commit()
-            db.refresh(new_task)
-
-            task_response = task_to_response(new_task)
+        with db.begin_nested():
+            results = [apply_function(call["function"], call["arguments"], user_id, db) for call in calls]
+    except Exception as e:
+        # Only the savepoint was rolled back, with the task events it queued
+        if len(calls) > 1:
+            return [execute_function(call["function"], call["arguments"], user_id, db) for call in calls]
+        return [function_error(calls[0]["function"], e)]
 
-            return {
-                "success": True,
-                "task_id": task_response.id,
-                "title": task_response.title,
-                "message": f"Task '{task_response.title}' created successfully"
-            }
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        return [function_error(call["function"], e) for call in calls]
+    return results
 
-        elif function_name == "list_tasks":
-            from .main import task_to_response
-            from sqlmodel import select
 
-            status = arguments.get("status", "all")
+def function_error(function_name: str, error: Exception) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "error": str(error),
+        "message": f"Failed to {function_name}: {str(error)}"
+    }
 
-            # Convert user_id to integer for the new schema
-            user_id_int = int(user_id)
 
-            # Build query based on status and user_id
-            query = select(Task).where(Task.user_id == user_id_int)
+def apply_function(
+    function_name: str,
+    arguments: Dict[str, Any],
+    user_id: str,
+    db: Session
+) -> Dict[str, Any]:
+    """
+    Run the called function's queries without committing them.
 
-            if status == "pending":
-                query = query.where(Task.completed == False)
-            elif status == "completed":
-                query = query.where(Task.completed == True)
+    Args:
+        function_name: Name of function to call
+        arguments: Function arguments from AI
+        user_id: User ID for database operations
+        db: Database session
 
-            tasks = db.exec(query).all()
+    Returns:
+        Function execution result
 
-            return {
-                "success": True,
-                "tasks": [
-                    {
-                        "id": t.id,
-                        "title": t.title,
-                        "description": t.due_date,  # Using due_date as description for now
-                        "completed": t.completed,
-                        "created_at": t.created_at.isoformat()
-                    }
-                    for t in tasks
-                ],
-                "count": len(tasks)
-            }
+    Raises:
+        Any database error; the caller rolls back
+    """
+    from .models import Task, TaskCreate
+    from .task_queries import record_task_changes, update_task_stats, task_counter_values
+    from datetime import datetime
 
-        elif function_name == "complete_task":
-            from .main import task_to_response
-            from sqlmodel import select
+    if function_name == "add_task":
+        from .main import task_to_response
 
-            # Convert user_id to integer for the new schema
-            user_id_int = int(user_id)
+        # Create a new task using TaskCreate model
+        task_create_data = TaskCreate(
+            title=arguments["title"],
+            completed=False,
+            priority="medium",
+            due_date=arguments.get("description")
+        )
 
-            # Find task by ID and user_id
-            query = select(Task).where(Task.id == arguments["task_id"]).where(Task.user_id == user_id_int)
-            task = db.exec(query).first()
+        # Convert user_id to integer for the new schema
+        user_id_int = int(user_id)
 
-            if not task:
-                return {
-                    "success": False,
-                    "error": f"Task {arguments['task_id']} not found",
-                    "message": f"Task {arguments['task_id']} not found"
-                }
+        # Create task object with user_id
+        new_task = Task(
+            title=task_create_data.title,
+            completed=task_create_data.completed,
+            priority=task_create_data.priority,
+            due_date=task_create_data.due_date,
+            user_id=user_id_int  # Use the converted user_id
+        )
 
-            # Toggle completion
-            task.completed = not task.completed
-            task.updated_at = datetime.utcnow()
-            db.add(task)
-            db.commit()
-            db.refresh(task)
+        db.add(new_task)
+        update_task_stats(db, user_id_int, None, task_counter_values(new_task))
+        db.flush()
+        record_task_changes(db, user_id_int, changed=[new_task.id])
+        db.flush()
+        db.refresh(new_task)
 
-            task_response = task_to_response(task)
+        task_response = task_to_response(new_task)
 
-            return {
-                "success": True,
-                "task_id": task_response.id,
-                "title": task_response.title,
-                "completed": task_response.completed,
-                "message": f"Task '{task_response.title}' marked as {'complete' if task_response.completed else 'incomplete'}"
-            }
+        return {
+            "success": True,
+            "task_id": task_response.id,
+            "title": task_response.title,
+            "message": f"Task '{task_response.title}' created successfully"
+        }
 
-        elif function_name == "update_task":
-            from .main import task_to_response
-            from sqlmodel import select
+    elif function_name == "list_tasks":
+        from .main import task_to_response
+        from sqlmodel import select
 
-            # Convert user_id to integer for the new schema
-            user_id_int = int(user_id)
+        status = arguments.get("status", "all")
 
-            # Find task by ID and user_id
-            query = select(Task).where(Task.id == arguments["task_id"]).where(Task.user_id == user_id_int)
-            task = db.exec(query).first()
+        # Convert user_id to integer for the new schema
+        user_id_int = int(user_id)
 
-            if not task:
-                return {
-                    "success": False,
-                    "error": f"Task {arguments['task_id']} not found",
-                    "message": f"Task {arguments['task_id']} not found"
+        # Build query based on status and user_id
+        query = select(Task).where(Task.user_id == user_id_int)
+
+        if status == "pending":
+            query = query.where(Task.completed == False)
+        elif status == "completed":
+            query = query.where(Task.completed == True)
+
+        tasks = db.exec(query).all()
+
+        return {
+            "success": True,
+            "tasks": [
+                {
+                    "id": t.id,
+                    "title": t.title,
+                    "description": t.due_date,  # Using due_date as description for now
+                    "completed": t.completed,
+                    "created_at": t.created_at.isoformat()
                 }
+                for t in tasks
+            ],
+            "count": len(tasks)
+        }
 
-            # Update task fields
-            if "title" in arguments and arguments["title"]:
-                task.title = arguments["title"]
-            if "description" in arguments and arguments["description"] is not None:
-                task.due_date = arguments["description"]  # Using due_date as description for now
+    elif function_name == "complete_task":
+        from .main import task_to_response
+        from sqlmodel import select
 
-            task.updated_at = datetime.utcnow()
-            db.add(task)
-            db.commit()
-            db.refresh(task)
+        # Convert user_id to integer for the new schema
+        user_id_int = int(user_id)
 
-            task_response = task_to_response(task)
+        # Find task by ID and user_id
+        query = select(Task).where(Task.id == arguments["task_id"]).where(Task.user_id == user_id_int)
+        task = db.exec(query).first()
 
+        if not task:
             return {
-                "success": True,
-                "task_id": task_response.id,
-                "title": task_response.title,
-                "message": f"Task '{task_response.title}' updated successfully"
+                "success": False,
+                "error": f"Task {arguments['task_id']} not found",
+                "message": f"Task {arguments['task_id']} not found"
             }
 
-        elif function_name == "delete_task":
-            from .main import task_to_response
-            from sqlmodel import select
+        # Toggle completion
+        before = task_counter_values(task)
+        task.completed = not task.completed
+        task.updated_at = datetime.utcnow()
+        db.add(task)
+        update_task_stats(db, user_id_int, before, task_counter_values(task))
+        record_task_changes(db, user_id_int, changed=[task.id])
+        db.flush()
+        db.refresh(task)
 
-            # Convert user_id to integer for the new schema
-            user_id_int = int(user_id)
+        task_response = task_to_response(task)
 
-            # Find task by ID and user_id
-            query = select(Task).where(Task.id == arguments["task_id"]).where(Task.user_id == user_id_int)
-            task = db.exec(query).first()
+        return {
+            "success": True,
+            "task_id": task_response.id,
+            "title": task_response.title,
+            "completed": task_response.completed,
+            "message": f"Task '{task_response.title}' marked as {'complete' if task_response.completed else 'incomplete'}"
+        }
 
-            if not task:
-                return {
-                    "success": False,
-                    "error": f"Task {arguments['task_id']} not found",
-                    "message": f"Task {arguments['task_id']} not found"
-                }
+    elif function_name == "update_task":
+        from .main import task_to_response
+        from sqlmodel import select
 
-            # Delete task
-            db.delete(task)
-            db.commit()
+        # Convert user_id to integer for the new schema
+        user_id_int = int(user_id)
 
-            task_response = task_to_response(task)
+        # Find task by ID and user_id
+        query = select(Task).where(Task.id == arguments["task_id"]).where(Task.user_id == user_id_int)
+        task = db.exec(query).first()
 
+        if not task:
             return {
-                "success": True,
-                "task_id": task_response.id,
-                "title": task_response.title,
-                "message": f"Task '{task_response.title}' deleted successfully"
+                "success": False,
+                "error": f"Task {arguments['task_id']} not found",
+                "message": f"Task {arguments['task_id']} not found"
             }
 
-        else:
+        # Update task fields
+        before = task_counter_values(task)
+        if "title" in arguments and arguments["title"]:
+            task.title = arguments["title"]
+        if "description" in arguments and arguments["description"] is not None:
+            task.due_date = arguments["description"]  # Using due_date as description for now
+
+        task.updated_at = datetime.utcnow()
+        db.add(task)
+        update_task_stats(db, user_id_int, before, task_counter_values(task))
+        record_task_changes(db, user_id_int, changed=[task.id])
+        db.flush()
+        db.refresh(task)
+
+        task_response = task_to_response(task)
+
+        return {
+            "success": True,
+            "task_id": task_response.id,
+            "title": task_response.title,
+            "message": f"Task '{task_response.title}' updated successfully"
+        }
+
+    elif function_name == "delete_task":
+        from .main import task_to_response
+        from sqlmodel import select
+
+        # Convert user_id to integer for the new schema
+        user_id_int = int(user_id)
+
+        # Find task by ID and user_id
+        query = select(Task).where(Task.id == arguments["task_id"]).where(Task.user_id == user_id_int)
+        task = db.exec(query).first()
+
+        if not task:
             return {
                 "success": False,
-                "error": f"Unknown function: {function_name}"
+                "error": f"Task {arguments['task_id']} not found",
+                "message": f"Task {arguments['task_id']} not found"
             }
 
-    except Exception as e:
+        # Delete task
+        db.delete(task)
+        update_task_stats(db, user_id_int, task_counter_values(task), None)
+        record_task_changes(db, user_id_int, deleted=[task.id])
+        db.flush()
+
+        task_response = task_to_response(task)
+
+        return {
+            "success": True,
+            "task_id": task_response.id,
+            "title": task_response.title,
+            "message": f"Task '{task_response.title}' deleted successfully"
+        }
+
+    else:
         return {
             "success": False,
-            "error": str(e),
-            "message": f"Failed to {function_name}: {str(e)}"
+            "error": f"Unknown function: {function_name}"
         }
 
 
-def get_final_response(
+async def get_final_response(
     messages: List[Dict],
-    function_results: List[Dict]
+    function_results: List[Dict],
+    tool_calls: Optional[List[Dict]] = None,
+    cache: bool = True
 ) -> str:
     """
     After executing functions, get AI's final response.
@@ -424,21 +654,18 @@ def get_final_response(
     Args:
         messages: Original conversation messages
         function_results: Results from executed functions
+        tool_calls: Tool calls from chat_with_ai, replayed as the assistant
+            message that the tool results answer
+        cache: Answer from the completion cache if possible
 
     Returns:
         AI's final response text
     """
-    # Add function results to conversation
-    tool_messages = []
-    for result in function_results:
-        tool_messages.append({
-            "role": "tool",
-            "content": json.dumps(result),
-            "tool_call_id": result.get("tool_call_id")
-        })
+    tool_messages = build_tool_messages(function_results, tool_calls)
 
     # Get final response
-    response = client.chat.completions.create(
+    message = await create_completion(
+        cache,
         model=OPENAI_MODEL,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -448,4 +675,68 @@ def get_final_response(
         max_tokens=MAX_TOKENS
     )
 
-    return response.choices[0].message.content
\ No newline at end of file
+    return message.content
+
+
+async def stream_final_response(
+    messages: List[Dict],
+    function_results: List[Dict],
+    tool_calls: Optional[List[Dict]] = None
+) -> AsyncIterator[str]:
+    """
+    Streaming version of get_final_response.
+
+    Yields:
+        Pieces of the AI's final response text as they arrive
+    """
+    tool_messages = build_tool_messages(function_results, tool_calls)
+
+    async with openai_slots:
+        stream = await client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                *messages,
+                *tool_messages
+            ],
+            max_tokens=MAX_TOKENS,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+def build_tool_messages(
+    function_results: List[Dict],
+    tool_calls: Optional[List[Dict]] = None
+) -> List[Dict]:
+    """Build the assistant tool_calls message and the tool result messages that answer it."""
+    # Tool results must follow the assistant message that requested them
+    tool_messages = []
+    if tool_calls:
+        tool_messages.append({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": tc["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tc["function"],
+                        "arguments": json.dumps(tc["arguments"])
+                    }
+                }
+                for tc in tool_calls
+            ]
+        })
+
+    # Add function results to conversation
+    for result in function_results:
+        tool_messages.append({
+            "role": "tool",
+            "content": json.dumps(result),
+            "tool_call_id": result.get("tool_call_id")
+        })
+
+    return tool_messages
\ No newline at end of file
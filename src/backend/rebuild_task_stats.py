@@ -0,0 +1,48 @@
+"""
+Repair script to rebuild the per-user task_stats counters from the tasks table.
+
+Run from the project root:
+    python -m src.backend.rebuild_task_stats            # all users
+    python -m src.backend.rebuild_task_stats 42 43      # specific user IDs
+"""
+
+import sys
+from sqlmodel import Session, select
+from .database import create_tables, engine
+from .models import TaskStats, User
+from .task_queries import rebuild_task_stats
+
+
+def rebuild_counters(user_ids=None) -> int:
+    """Rebuild counters for the given users (all users if None). Returns the number rebuilt."""
+    create_tables()
+
+    with Session(engine) as session:
+        if user_ids is None:
+            user_ids = session.exec(select(User.id)).all()
+
+        drifted = 0
+        for user_id in user_ids:
+            old = session.get(TaskStats, user_id)
+            old_values = (old.total, old.completed, old.high, old.medium, old.low) if old else None
+
+            new = rebuild_task_stats(session, user_id)
+            session.commit()
+
+            if old_values != (new.total, new.completed, new.high, new.medium, new.low):
+                drifted += 1
+                print(f"User {user_id}: counters were {old_values}, rebuilt to "
+                      f"{(new.total, new.completed, new.high, new.medium, new.low)}")
+
+    print(f"Rebuilt task stats for {len(user_ids)} user(s), {drifted} had drifted")
+    return len(user_ids)
+
+
+if __name__ == "__main__":
+    try:
+        ids = [int(arg) for arg in sys.argv[1:]] or None
+        rebuild_counters(ids)
+        sys.exit(0)
+    except Exception as e:
+        print(f"Rebuild failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,270 @@
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from .cache import TTLCache
+from .task_events import add_commit_listener
+import hashlib
+import queue
+import socket
+import threading
+import os
+
+# Shared read-through cache for GET /api/tasks pages and /api/tasks/stats.
+#   TASK_CACHE_URL=redis://host:6379/0  shared by every worker (use this with several workers)
+#   TASK_CACHE_URL=memory://            per-process, for single-worker deployments
+# Unset disables the cache. Every committed task write invalidates the user's
+# entries; the TTL bounds staleness if an invalidation is lost.
+TASK_CACHE_URL = os.getenv("TASK_CACHE_URL", "")
+TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", "30"))  # seconds
+TASK_CACHE_SIZE = int(os.getenv("TASK_CACHE_SIZE", "10000"))  # entries, memory backend only
+TASK_CACHE_TIMEOUT = float(os.getenv("TASK_CACHE_TIMEOUT", "0.25"))  # seconds per Redis command
+
+
+class CacheBackendError(Exception):
+    """The cache backend could not be reached or returned an error."""
+
+
+class MemoryBackend:
+    """In-process backend: a size-bounded TTL cache for entries, plain counters for generations."""
+
+    blocking = False
+
+    def __init__(self, maxsize: int = TASK_CACHE_SIZE, ttl: float = TASK_CACHE_TTL):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+        return self.entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, ttl=ttl)
+
+    def incr(self, key: str) -> int:
+        # Counters are never evicted: losing one could resurrect stale entries
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self.entries.stats()
+        return {"backend": "memory", "size": entries["size"], "maxsize": entries["maxsize"], "evictions": entries["evictions"]}
+
+
+class RedisBackend:
+    """
+    Minimal Redis protocol client (GET, SET PX, INCR) over a small pool of sockets.
+
+    Blocking, so TaskReadCache calls it from the threadpool. Size bounds are
+    the server's (maxmemory with a volatile-* policy keeps the generation
+    counters, which have no TTL).
+    """
+
+    blocking = True
+
+    def __init__(self, url: str, timeout: float = TASK_CACHE_TIMEOUT, pool_size: int = 8):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue" = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        connection = (sock, sock.makefile("rb"))
+        if self.password:
+            self._send(connection, "AUTH", self.password)
+        if self.db:
+            self._send(connection, "SELECT", self.db)
+        return connection
+
+    @staticmethod
+    def _send(connection, *args) -> Any:
+        sock, reader = connection
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        sock.sendall(b"".join(parts))
+
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            return None if int(rest) < 0 else reader.read(int(rest) + 2)[:-2]
+        if kind == b"-":
+            raise CacheBackendError(rest.decode())
+        raise ConnectionError(f"unexpected reply {line!r}")
+
+    def command(self, *args) -> Any:
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = None
+        try:
+            if connection is None:
+                connection = self._connect()
+            reply = self._send(connection, *args)
+        except CacheBackendError:
+            # An error reply; the connection itself is fine
+            self._release(connection)
+            raise
+        except (OSError, ConnectionError, ValueError) as e:
+            if connection is not None:
+                connection[0].close()
+            raise CacheBackendError(str(e)) from e
+        self._release(connection)
+        return reply
+
+    def _release(self, connection) -> None:
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection[0].close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.command("SET", key, value, "PX", max(int(ttl * 1000), 1))
+
+    def incr(self, key: str) -> int:
+        return self.command("INCR", key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+
+class TaskReadCache:
+    """
+    Read-through cache for per-user task read models.
+
+    Keys embed the user's cache generation, and every committed task write
+    bumps it (invalidate()), so later reads miss and reload. A read that
+    raced with a write loaded its data before the bump and stores it under
+    the old generation, where nothing reads it again. Backend failures are
+    counted and treated as misses, so the cache never fails a request.
+    """
+
+    def __init__(self, backend, ttl: float = TASK_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._backend_down = False
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @staticmethod
+    def _generation_key(user_id: int) -> str:
+        return f"tasks:{user_id}:gen"
+
+    async def _call(self, fn, *args) -> Any:
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    def _record(self, counter: str, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            # Report an outage once, not on every request
+            if error is not None and not self._backend_down:
+                print(f"Task cache unavailable: {error}")
+            self._backend_down = error is not None
+
+    async def lookup(self, user_id: int, kind: str, *parts) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Look up a cached read model.
+
+        Returns:
+            (value or None, key) - on a miss, store() the freshly loaded
+            value under key; key is None if the backend is unavailable
+        """
+        try:
+            generation = await self._call(self.backend.get, self._generation_key(user_id))
+            digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+            key = f"tasks:{user_id}:{int(generation or 0)}:{kind}:{digest}"
+            value = await self._call(self.backend.get, key)
+        except CacheBackendError as e:
+            self._record("errors", e)
+            return None, None
+
+        self._record("hits" if value is not None else "misses")
+        return value, key
+
+    async def store(self, key: Optional[str], value: bytes) -> None:
+        if key is None:
+            return
+        try:
+            await self._call(self.backend.set, key, value, self.ttl)
+        except CacheBackendError as e:
+            self._record("errors", e)
+            return
+        self._record("stores")
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the user's cached read models. Blocking; runs after commit, never on the event loop."""
+        try:
+            self.backend.incr(self._generation_key(user_id))
+        except CacheBackendError as e:
+            self._record("errors", e)
+            return
+        self._record("invalidations")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                **self.backend.stats(),
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "invalidations": self.invalidations,
+                "errors": self.errors
+            }
+
+
+def pack_response(etag: str, body: bytes) -> bytes:
+    """Store a response body together with its ETag."""
+    return etag.encode("ascii") + b"\n" + body
+
+
+def unpack_response(value: bytes) -> Tuple[str, bytes]:
+    etag, body = value.split(b"\n", 1)
+    return etag.decode("ascii"), body
+
+
+def create_task_cache(url: str = TASK_CACHE_URL) -> Optional[TaskReadCache]:
+    """Build the cache for a TASK_CACHE_URL, or None if it is unset."""
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return TaskReadCache(MemoryBackend(TASK_CACHE_SIZE, TASK_CACHE_TTL), TASK_CACHE_TTL)
+    if url.startswith("redis://"):
+        return TaskReadCache(RedisBackend(url), TASK_CACHE_TTL)
+    raise ValueError(f"Unsupported TASK_CACHE_URL: {url}")
+
+
+cache = create_task_cache()
+
+
+def _invalidate_committed(user_id: int) -> None:
+    if cache is not None:
+        cache.invalidate(user_id)
+
+
+add_commit_listener(_invalidate_committed)
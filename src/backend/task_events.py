@@ -0,0 +1,220 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import asyncio
+import os
+import threading
+
+# Events queued per subscriber. A client that falls this far behind gets a
+# single "resync" event instead of the backlog, and catches up through
+# GET /api/tasks/changes.
+TASK_EVENTS_QUEUE_SIZE = int(os.getenv("TASK_EVENTS_QUEUE_SIZE", "100"))
+
+# Session.info key for events waiting on their transaction to commit
+_PENDING_KEY = "task_events"
+# Session.info key for committed events left for run_committed()
+_COMMITTED_KEY = "task_events_committed"
+# Session.info key for the pending events as each open savepoint found them
+_SAVEPOINTS_KEY = "task_events_savepoints"
+
+# Called with the user ID once a write to their tasks commits, before
+# subscribers are notified, e.g. to invalidate cached reads
+_commit_listeners: List[Callable[[int], None]] = []
+
+
+class Subscription:
+    """One listener's queue of events, owned by the event loop that subscribed."""
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def _put(self, message: dict) -> None:
+        # Runs on self.loop
+        if self.queue.full():
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = {"type": "resync"}
+        self.queue.put_nowait(message)
+
+
+class TaskEventBus:
+    """
+    In-process pub/sub for task change events, keyed by user ID.
+
+    publish() is thread-safe: sync sessions commit on worker threads, and
+    each event is handed to its subscribers' event loops. To fan out across
+    processes, a broker-backed bus would override publish() to send to the
+    broker and call deliver() for each message it receives.
+    """
+
+    def __init__(self, queue_size: int = TASK_EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Start receiving the user's events. Call from the event loop that will read them."""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: int, message: dict) -> None:
+        """Send an event to every subscriber of the user."""
+        with self._lock:
+            self.published += 1
+        self.deliver(user_id, message)
+
+    def deliver(self, user_id: int, message: dict) -> None:
+        """Hand an event to this process's subscribers of the user."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, message)
+            except RuntimeError:
+                # The subscriber's loop has closed
+                self.unsubscribe(subscription)
+                continue
+            with self._lock:
+                self.delivered += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscriptions = [s for subscribers in self._subscribers.values() for s in subscribers]
+            return {
+                "users": len(self._subscribers),
+                "subscribers": len(subscriptions),
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped": sum(s.dropped for s in subscriptions)
+            }
+
+
+bus = TaskEventBus()
+
+
+def queue_task_events(
+    db: Session,
+    user_id: int,
+    changed: Iterable[int] = (),
+    deleted: Iterable[int] = ()
+) -> None:
+    """
+    Queue a tasks.changed event for the user, published once db commits.
+
+    With no task IDs, only the commit listeners run (e.g. after counters are
+    rebuilt, which changes what the user reads but no task).
+    """
+    pending = db.info.setdefault(_PENDING_KEY, {})
+    entry = pending.setdefault(user_id, {"changed": [], "deleted": []})
+    entry["changed"] += [task_id for task_id in changed if task_id not in entry["changed"]]
+    entry["deleted"] += [task_id for task_id in deleted if task_id not in entry["deleted"]]
+
+
+def add_commit_listener(listener: Callable[[int], None]) -> None:
+    """
+    Run listener(user_id) after every commit that wrote the user's tasks.
+
+    Listeners may block: they run on the committing thread, or in the
+    threadpool when an async session commits on the event loop.
+    """
+    _commit_listeners.append(listener)
+
+
+def task_change_event(changed: List[int], deleted: List[int]) -> dict:
+    return {"type": "tasks.changed", "changed": changed, "deleted": deleted}
+
+
+def _notify(pending: dict) -> None:
+    for user_id, entry in pending.items():
+        # Listeners first, so a client reacting to the event never reads stale data
+        for listener in _commit_listeners:
+            listener(user_id)
+        changed = [task_id for task_id in entry["changed"] if task_id not in entry["deleted"]]
+        if changed or entry["deleted"]:
+            bus.publish(user_id, task_change_event(changed, entry["deleted"]))
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+async def run_committed(session: Session) -> None:
+    """
+    Notify listeners and subscribers of writes the session committed on the
+    event loop, from the threadpool. run_db() calls it after every run_sync.
+    """
+    committed: Optional[dict] = session.info.pop(_COMMITTED_KEY, None)
+    if committed:
+        await run_in_threadpool(_notify, committed)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    pending: Optional[dict] = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if not _on_event_loop():
+        _notify(pending)
+        return
+
+    # An async session committing inside run_sync: listeners may block (a
+    # Redis round trip), so leave them to run_committed()
+    committed = session.info.setdefault(_COMMITTED_KEY, {})
+    for user_id, entry in pending.items():
+        target = committed.setdefault(user_id, {"changed": [], "deleted": []})
+        target["changed"] += [task_id for task_id in entry["changed"] if task_id not in target["changed"]]
+        target["deleted"] += [task_id for task_id in entry["deleted"] if task_id not in target["deleted"]]
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    if not session.in_nested_transaction():
+        session.info.pop(_PENDING_KEY, None)
+        return
+
+    # A savepoint rolled back inside a transaction that stays open: drop
+    # only the events queued since it began, so task IDs that never commit
+    # aren't published and the earlier writes still are
+    snapshot = session.info.get(_SAVEPOINTS_KEY, {}).get(session.get_nested_transaction())
+    if snapshot is not None:
+        session.info[_PENDING_KEY] = snapshot
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _snapshot_savepoint(session: Session, transaction) -> None:
+    if transaction.nested:
+        pending = session.info.get(_PENDING_KEY, {})
+        session.info.setdefault(_SAVEPOINTS_KEY, {})[transaction] = {
+            user_id: {"changed": list(entry["changed"]), "deleted": list(entry["deleted"])}
+            for user_id, entry in pending.items()
+        }
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_savepoint(session: Session, transaction) -> None:
+    session.info.get(_SAVEPOINTS_KEY, {}).pop(transaction, None)
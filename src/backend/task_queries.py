@@ -0,0 +1,731 @@
+from sqlmodel import Session, select
+from sqlalchemy import and_, or_, case, delete, exists, func, insert, literal, update
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Iterable, Optional, List, Tuple
+from datetime import datetime, date, timedelta
+import base64
+import json
+from .models import Task, TaskBatchOperation, TaskChange, TaskCreate, TaskStats, TaskTag, User
+from .task_search import search_filter, search_rank
+from .task_events import queue_task_events
+
+
+# Default and maximum page sizes for the task list endpoint
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Largest number of operations accepted by POST /api/tasks/batch
+MAX_BATCH_SIZE = 500
+
+# Counter columns kept in the task_stats table
+PRIORITIES = ("high", "medium", "low")
+COUNTER_FIELDS = ("total", "completed") + PRIORITIES
+
+
+def encode_cursor(task: Task, rank: Optional[int] = None) -> str:
+    """Encode the (created_at, id) position of a task, plus its search rank if any, as an opaque cursor."""
+    position = [task.created_at.isoformat(), task.id]
+    if rank is not None:
+        position.append(rank)
+    payload = json.dumps(position)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int, Optional[int]]:
+    """Decode a cursor produced by encode_cursor into (created_at, id, rank). Raises ValueError if malformed."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        created_at, task_id = position[:2]
+        rank = int(position[2]) if len(position) > 2 else None
+        return datetime.fromisoformat(created_at), int(task_id), rank
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_tags(value: Any) -> List[str]:
+    """
+    Normalize tags to a list of unique, stripped, non-empty strings.
+
+    Accepts a list, a JSON-encoded list, or the double-encoded JSON string
+    older versions stored in tasks.tags. Anything unparseable yields [].
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value else []
+            # Older create/update paths json.dumps'd an already-JSON string
+            if isinstance(value, str):
+                value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+
+    if not isinstance(value, list):
+        return []
+
+    tags = []
+    for tag in value:
+        if isinstance(tag, str) and tag.strip() and tag.strip() not in tags:
+            tags.append(tag.strip())
+    return tags
+
+
+def set_task_tags(task: Task, tags: List[str]) -> None:
+    """Replace a task's tags, keeping the task_tags rows that are unchanged."""
+    existing = {row.tag: row for row in task.tag_rows}
+    task.tag_rows = [existing.get(tag) or TaskTag(tag=tag, user_id=task.user_id) for tag in tags]
+
+
+def get_task_page(
+    db: Session,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    completed: Optional[bool] = None,
+    search: str = "",
+    tag: Optional[str] = None
+) -> Tuple[List[Task], Optional[str]]:
+    """
+    Get one page of a user's tasks ordered by (created_at, id).
+
+    Uses keyset pagination so each page is an index range scan starting
+    right after the cursor position, regardless of how many tasks come before it.
+    A tag filter is a lookup on the (user_id, tag) task_tags index. A search
+    goes through the title search index (see task_search.py) and orders
+    results by relevance first: exact, then prefix, then substring matches.
+
+    Returns:
+        (tasks, next_cursor) - next_cursor is None on the last page
+    """
+    search = search.strip()
+    rank = search_rank(search) if search else None
+
+    statement = select(Task, rank) if rank is not None else select(Task)
+    statement = _filter_tasks(db, statement, user_id, completed, search, tag)
+
+    if cursor:
+        after_created_at, after_id, after_rank = decode_cursor(cursor)
+        after = or_(
+            Task.created_at > after_created_at,
+            and_(Task.created_at == after_created_at, Task.id > after_id)
+        )
+        if rank is not None and after_rank is not None:
+            after = or_(rank > after_rank, and_(rank == after_rank, after))
+        statement = statement.where(after)
+
+    # Fetch one extra row to know whether another page exists
+    order = (rank, Task.created_at, Task.id) if rank is not None else (Task.created_at, Task.id)
+    statement = statement.order_by(*order).limit(limit + 1)
+    rows = db.exec(statement).all()
+    if rank is not None:
+        tasks, ranks = [row[0] for row in rows], [row[1] for row in rows]
+    else:
+        tasks, ranks = list(rows), None
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1], ranks[limit - 1] if ranks else None)
+
+    return tasks, next_cursor
+
+
+def _filter_tasks(db: Session, statement, user_id: int, completed: Optional[bool], search: str, tag: Optional[str]):
+    """Restrict a statement over tasks to the user's tasks matching the list filters."""
+    statement = statement.where(Task.user_id == user_id)
+
+    if tag:
+        statement = statement.join(TaskTag, TaskTag.task_id == Task.id).where(
+            TaskTag.user_id == user_id, TaskTag.tag == tag
+        )
+
+    if completed is not None:
+        statement = statement.where(Task.completed == completed)
+
+    if search:
+        statement = statement.where(search_filter(db, search))
+
+    return statement
+
+
+def count_user_tasks(
+    db: Session,
+    user_id: int,
+    completed: Optional[bool] = None,
+    search: str = "",
+    tag: Optional[str] = None
+) -> int:
+    """
+    Count the user's tasks matching the same filters as get_task_page().
+
+    Without a search or tag filter this is a primary-key lookup on the
+    task_stats counters; otherwise a COUNT over the same indexes the page
+    query uses.
+    """
+    search = search.strip()
+    if not search and not tag:
+        row = db.get(TaskStats, user_id)
+        if row is not None:
+            if completed is None:
+                return row.total
+            return row.completed if completed else row.total - row.completed
+
+    statement = _filter_tasks(db, select(func.count(Task.id)), user_id, completed, search, tag)
+    return db.exec(statement).one()
+
+
+def _due_date_counters(today: date):
+    """Build conditional sums counting overdue and due-today tasks."""
+    today_str = today.isoformat()
+    tomorrow_str = (today + timedelta(days=1)).isoformat()
+
+    # due_date is stored as an ISO string, so date comparisons are lexicographic
+    overdue = case(
+        (and_(Task.completed == False, Task.due_date < today_str), 1),
+        else_=0
+    )
+    due_today = case(
+        (and_(Task.due_date >= today_str, Task.due_date < tomorrow_str), 1),
+        else_=0
+    )
+    return func.sum(overdue), func.sum(due_today), tomorrow_str
+
+
+def count_task_stats(db: Session, user_id: int, today: Optional[date] = None) -> dict:
+    """
+    Count a user's tasks by completion and priority in a single grouped query.
+
+    Overdue and due-today counts are folded into the same GROUP BY as
+    conditional sums, so no Task rows are loaded into Python.
+
+    Returns:
+        dict with 'total', 'completed', 'active', 'byPriority', 'overdue', 'dueToday'
+    """
+    overdue, due_today, _ = _due_date_counters(today or datetime.utcnow().date())
+
+    statement = (
+        select(Task.completed, Task.priority, func.count(), overdue, due_today)
+        .where(Task.user_id == user_id)
+        .group_by(Task.completed, Task.priority)
+    )
+
+    stats = {
+        "total": 0,
+        "completed": 0,
+        "active": 0,
+        "byPriority": {"high": 0, "medium": 0, "low": 0},
+        "overdue": 0,
+        "dueToday": 0
+    }
+    for completed, priority, count, overdue_count, due_today_count in db.exec(statement).all():
+        stats["total"] += count
+        stats["completed" if completed else "active"] += count
+        if priority in stats["byPriority"]:
+            stats["byPriority"][priority] += count
+        stats["overdue"] += overdue_count or 0
+        stats["dueToday"] += due_today_count or 0
+
+    return stats
+
+
+def task_counter_values(task: Task) -> dict:
+    """Get how much a single task contributes to each task_stats counter."""
+    values = {
+        "total": 1,
+        "completed": 1 if task.completed else 0
+    }
+    for priority in PRIORITIES:
+        values[priority] = 1 if task.priority == priority else 0
+    return values
+
+
+def rebuild_task_stats(db: Session, user_id: int) -> TaskStats:
+    """
+    Recompute a user's task_stats row from the tasks table.
+
+    Used to repair counters that have drifted (see rebuild_task_stats.py);
+    missing rows are created by create_task_stats() instead. The version
+    still moves forward, so ETags issued before the rebuild stop matching,
+    and cached reads are invalidated on commit. Does not commit.
+    """
+    counts = count_task_stats(db, user_id)
+    existing = db.get(TaskStats, user_id)
+    row = TaskStats(
+        user_id=user_id,
+        total=counts["total"],
+        completed=counts["completed"],
+        version=(existing.version + 1) if existing else 1,
+        updated_at=datetime.utcnow(),
+        **counts["byPriority"]
+    )
+    queue_task_events(db, user_id)
+    return db.merge(row)
+
+
+def create_task_stats(db: Session, user_id: int, version: int = 0) -> bool:
+    """
+    Create a user's task_stats row from the tasks table unless one exists.
+
+    Uses INSERT ... ON CONFLICT (user_id) DO NOTHING, so concurrent first
+    requests for the same user can't fail on the primary key. Does not
+    commit.
+
+    Returns:
+        True if this call created the row, False if it already existed
+    """
+    counts = count_task_stats(db, user_id)
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(TaskStats).values(
+        user_id=user_id,
+        total=counts["total"],
+        completed=counts["completed"],
+        version=version,
+        updated_at=datetime.utcnow(),
+        **counts["byPriority"]
+    ).on_conflict_do_nothing(index_elements=["user_id"])
+    return db.execute(statement).rowcount == 1
+
+
+def backfill_task_stats(db: Session) -> int:
+    """
+    Create task_stats rows for every user that has none, in one statement.
+
+    Run by create_tables(), so users that predate the table (or the last
+    start) already have counters when they first read them. Does not commit.
+
+    Returns:
+        Number of rows created
+    """
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    counts = (
+        select(
+            User.id,
+            func.count(Task.id),
+            count_where(Task.completed == True),
+            *[count_where(Task.priority == priority) for priority in PRIORITIES],
+            literal(0),
+            literal(datetime.utcnow(), TaskStats.__table__.c.updated_at.type)
+        )
+        .select_from(User)
+        .outerjoin(Task, Task.user_id == User.id)
+        .where(~exists().where(TaskStats.user_id == User.id))
+        .group_by(User.id)
+    )
+    result = db.execute(
+        insert(TaskStats).from_select(
+            ["user_id", "total", "completed", *PRIORITIES, "version", "updated_at"], counts
+        )
+    )
+    return result.rowcount
+
+
+def update_task_stats(
+    db: Session,
+    user_id: int,
+    before: Optional[dict],
+    after: Optional[dict]
+) -> None:
+    """
+    Apply a task change to the user's counters inside the current transaction.
+
+    Also bumps the user's task version, so call it for every task write,
+    including ones that leave the counters unchanged.
+
+    Args:
+        before: task_counter_values() of the task before the change (None on create)
+        after: task_counter_values() of the task after the change (None on delete)
+    """
+    deltas = {
+        field: (after or {}).get(field, 0) - (before or {}).get(field, 0)
+        for field in COUNTER_FIELDS
+    }
+
+    # Increment in SQL so concurrent writers don't overwrite each other
+    values = {
+        getattr(TaskStats, field): getattr(TaskStats, field) + delta
+        for field, delta in deltas.items() if delta
+    }
+    values[TaskStats.version] = TaskStats.version + 1
+    values[TaskStats.updated_at] = datetime.utcnow()
+    result = db.execute(
+        update(TaskStats).where(TaskStats.user_id == user_id).values(values)
+    )
+
+    if result.rowcount == 0:
+        # No counters yet - build them from the tasks table, which already
+        # includes this change once it is flushed
+        db.flush()
+        if not create_task_stats(db, user_id, version=1):
+            # Another request created them first, without this change
+            db.execute(update(TaskStats).where(TaskStats.user_id == user_id).values(values))
+
+
+def read_task_stats(db: Session, user_id: int, today: Optional[date] = None) -> dict:
+    """
+    Read a user's task statistics from the task_stats counters.
+
+    Totals come from a single primary-key lookup. Overdue and due-today
+    depend on the current date, so they are counted over tasks due before
+    tomorrow only.
+
+    Returns:
+        dict with the same shape as count_task_stats()
+    """
+    row = db.get(TaskStats, user_id)
+    if row is None:
+        # A user created since the last create_tables() backfill
+        create_task_stats(db, user_id)
+        db.commit()
+        row = db.get(TaskStats, user_id)
+
+    overdue, due_today, tomorrow_str = _due_date_counters(today or datetime.utcnow().date())
+    overdue_count, due_today_count = db.exec(
+        select(overdue, due_today)
+        .where(Task.user_id == user_id)
+        .where(Task.due_date < tomorrow_str)
+    ).one()
+
+    return {
+        "total": row.total,
+        "completed": row.completed,
+        "active": row.total - row.completed,
+        "byPriority": {priority: getattr(row, priority) for priority in PRIORITIES},
+        "overdue": overdue_count or 0,
+        "dueToday": due_today_count or 0
+    }
+
+
+def read_task_version(db: Session, user_id: int) -> int:
+    """
+    Get the user's task version with a primary-key lookup on task_stats.
+
+    Any write to the user's tasks changes it, so it can stand in for the
+    contents of every task read in an ETag. A user without a task_stats row
+    has never written through the counters and is at version 0; rows are
+    created at that version, and the first write moves it to 1, so the read
+    never needs to create the row.
+    """
+    version = db.exec(select(TaskStats.version).where(TaskStats.user_id == user_id)).first()
+    return version if version is not None else 0
+
+
+def record_task_changes(
+    db: Session,
+    user_id: int,
+    changed: Iterable[int] = (),
+    deleted: Iterable[int] = ()
+) -> None:
+    """
+    Log task writes for delta sync inside the current transaction.
+
+    Each task's previous log row is replaced by one with a new seq, marked
+    as a tombstone for deleted tasks. Call it after update_task_stats: that
+    UPDATE locks the user's task_stats row until commit, so a user's seqs
+    are handed out in commit order and a sync can never skip past a change
+    that commits late. New tasks must be flushed first so they have IDs.
+
+    The changes are also pushed to the user's live subscribers once the
+    transaction commits (see task_events).
+    """
+    entries = {task_id: False for task_id in changed}
+    entries.update({task_id: True for task_id in deleted})
+    if not entries:
+        return
+
+    db.execute(
+        delete(TaskChange).where(TaskChange.user_id == user_id, TaskChange.task_id.in_(entries)),
+        execution_options={"synchronize_session": False}
+    )
+    now = datetime.utcnow()
+    db.execute(insert(TaskChange), [
+        {"task_id": task_id, "user_id": user_id, "deleted": is_deleted, "changed_at": now}
+        for task_id, is_deleted in entries.items()
+    ])
+    queue_task_events(
+        db,
+        user_id,
+        changed=[task_id for task_id, is_deleted in entries.items() if not is_deleted],
+        deleted=[task_id for task_id, is_deleted in entries.items() if is_deleted]
+    )
+
+
+def encode_sync_token(seq: int) -> str:
+    """Encode a change-log position as an opaque sync token."""
+    return base64.urlsafe_b64encode(json.dumps(["seq", seq]).encode("utf-8")).decode("ascii")
+
+
+def decode_sync_token(token: str) -> int:
+    """Decode a token produced by encode_sync_token. Raises ValueError if malformed."""
+    try:
+        kind, seq = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        if kind != "seq":
+            raise ValueError
+        return int(seq)
+    except Exception:
+        raise ValueError("Invalid sync token")
+
+
+def get_task_changes(
+    db: Session,
+    user_id: int,
+    since: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[Task], List[int], str, bool]:
+    """
+    Get the user's tasks changed after a sync token, oldest change first.
+
+    Reads at most `limit` change-log rows on the (user_id, seq) index, so
+    the cost follows the number of changes, not the number of tasks. With
+    no token, every live task is returned (as changes since the start).
+
+    Returns:
+        (tasks, deleted_ids, next_since, has_more) - pass next_since back as
+        `since`; if has_more is set, call again straight away for the rest
+    """
+    after_seq = decode_sync_token(since) if since else 0
+
+    changes = db.exec(
+        select(TaskChange)
+        .where(TaskChange.user_id == user_id, TaskChange.seq > after_seq)
+        .order_by(TaskChange.seq)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    live_ids = [change.task_id for change in changes if not change.deleted]
+    tasks_by_id = {}
+    if live_ids:
+        tasks_by_id = {
+            task.id: task
+            for task in db.exec(select(Task).where(Task.user_id == user_id, Task.id.in_(live_ids))).all()
+        }
+
+    tasks = [tasks_by_id[task_id] for task_id in live_ids if task_id in tasks_by_id]
+    deleted_ids = [change.task_id for change in changes if change.task_id not in tasks_by_id]
+    next_seq = changes[-1].seq if changes else after_seq
+    return tasks, deleted_ids, encode_sync_token(next_seq), has_more
+
+
+def get_user_task(db: Session, user_id: int, task_id: int) -> Optional[Task]:
+    """Get a task by ID if it belongs to the user."""
+    task = db.get(Task, task_id)
+    if not task or task.user_id != user_id:
+        return None
+    return task
+
+
+def create_user_task(db: Session, user_id: int, task_data: TaskCreate) -> Task:
+    """Create a task for the user and update their counters in the same transaction."""
+    new_task = Task(
+        title=task_data.title,
+        completed=task_data.completed,
+        priority=task_data.priority,
+        due_date=task_data.due_date,
+        user_id=user_id
+    )
+    set_task_tags(new_task, parse_tags(task_data.tags))
+
+    db.add(new_task)
+    update_task_stats(db, user_id, None, task_counter_values(new_task))
+    db.flush()
+    record_task_changes(db, user_id, changed=[new_task.id])
+    db.commit()
+    db.refresh(new_task)
+    return new_task
+
+
+# Task columns that can't be set to null by a partial update
+NOT_NULL_TASK_FIELDS = frozenset(column.name for column in Task.__table__.columns if not column.nullable)
+
+
+def task_changes_error(update_data: dict) -> Optional[str]:
+    """Why a partial update (TaskUpdate fields) can't be applied, or None if it can."""
+    for field, value in update_data.items():
+        if value is None and field in NOT_NULL_TASK_FIELDS:
+            return f"{field.capitalize()} cannot be null"
+    if "priority" in update_data and update_data["priority"] not in PRIORITIES:
+        return "Priority must be high, medium, or low"
+    return None
+
+
+def apply_task_changes(task: Task, update_data: dict) -> None:
+    """Apply a partial update (TaskUpdate fields) to a task in memory."""
+    for field, value in update_data.items():
+        if field == "tags":
+            set_task_tags(task, parse_tags(value))
+        else:
+            setattr(task, field, value)
+
+    task.updated_at = datetime.utcnow()
+
+
+def update_user_task(db: Session, user_id: int, task_id: int, update_data: dict) -> Optional[Task]:
+    """Apply a partial update to one of the user's tasks. Returns None if not found."""
+    task = get_user_task(db, user_id, task_id)
+    if not task:
+        return None
+
+    before = task_counter_values(task)
+    apply_task_changes(task, update_data)
+    db.add(task)
+    update_task_stats(db, user_id, before, task_counter_values(task))
+    record_task_changes(db, user_id, changed=[task.id])
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def toggle_user_task(db: Session, user_id: int, task_id: int) -> Optional[Task]:
+    """Flip the completion status of one of the user's tasks. Returns None if not found."""
+    task = get_user_task(db, user_id, task_id)
+    if not task:
+        return None
+
+    before = task_counter_values(task)
+    task.completed = not task.completed
+    task.updated_at = datetime.utcnow()
+    db.add(task)
+    update_task_stats(db, user_id, before, task_counter_values(task))
+    record_task_changes(db, user_id, changed=[task.id])
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def delete_user_task(db: Session, user_id: int, task_id: int) -> Optional[Task]:
+    """Delete one of the user's tasks. Returns the deleted task, or None if not found."""
+    task = get_user_task(db, user_id, task_id)
+    if not task:
+        return None
+
+    db.delete(task)
+    update_task_stats(db, user_id, task_counter_values(task), None)
+    record_task_changes(db, user_id, deleted=[task.id])
+    db.commit()
+    return task
+
+
+def _add_counter_values(totals: dict, task: Task) -> None:
+    for field, value in task_counter_values(task).items():
+        totals[field] += value
+
+
+def apply_task_batch(
+    db: Session,
+    user_id: int,
+    operations: List[TaskBatchOperation],
+    atomic: bool = False
+) -> Tuple[List[dict], bool]:
+    """
+    Apply a list of create/update/delete/toggle operations in one transaction.
+
+    Tasks referenced by ID are loaded with a single query, every change is
+    made in memory, and one flush writes them as batched INSERT, UPDATE and
+    DELETE statements. The counters get one combined update, and there is a
+    single commit.
+
+    Operations run in order, so later operations see earlier ones (e.g. a
+    toggle after an update). Failed operations are skipped, unless atomic is
+    set, in which case nothing is applied if any operation fails.
+
+    Returns:
+        (results, applied) - one {"index", "op", "success", "task", "error"}
+        dict per operation, and whether the changes were committed. Each
+        result's task is the task object itself, so it shows the task's
+        state after the whole batch
+    """
+    ids = {operation.id for operation in operations if operation.id is not None}
+    tasks = {}
+    if ids:
+        tasks = {
+            task.id: task
+            for task in db.exec(select(Task).where(Task.user_id == user_id, Task.id.in_(ids))).all()
+        }
+
+    before = dict.fromkeys(COUNTER_FIELDS, 0)
+    after = dict.fromkeys(COUNTER_FIELDS, 0)
+    results = []
+    deleted_ids = []
+
+    for index, operation in enumerate(operations):
+        task, error = None, None
+
+        if operation.op == "create":
+            if operation.task is None:
+                error = "Missing task"
+            elif operation.task.priority not in PRIORITIES:
+                error = "Priority must be high, medium, or low"
+            else:
+                task = Task(
+                    title=operation.task.title,
+                    completed=operation.task.completed,
+                    priority=operation.task.priority,
+                    due_date=operation.task.due_date,
+                    user_id=user_id
+                )
+                set_task_tags(task, parse_tags(operation.task.tags))
+                db.add(task)
+                _add_counter_values(after, task)
+
+        elif operation.op in ("update", "delete", "toggle"):
+            task = tasks.get(operation.id)
+            changes = None
+            if operation.op == "update":
+                if operation.changes is None:
+                    error = "Missing changes"
+                else:
+                    changes = operation.changes.model_dump(exclude_unset=True)
+                    # Checked here rather than left to the flush, which
+                    # would fail the whole batch
+                    error = task_changes_error(changes)
+            if task is None:
+                error = "Task not found"
+            elif error is not None:
+                task = None
+            else:
+                _add_counter_values(before, task)
+                if operation.op == "update":
+                    apply_task_changes(task, changes)
+                elif operation.op == "toggle":
+                    task.completed = not task.completed
+                    task.updated_at = datetime.utcnow()
+                else:
+                    db.delete(task)
+                    deleted_ids.append(task.id)
+                    # Later operations on this ID find nothing
+                    del tasks[operation.id]
+
+                if operation.op != "delete":
+                    _add_counter_values(after, task)
+
+        else:
+            error = f"Unknown operation '{operation.op}'"
+
+        results.append({
+            "index": index,
+            "op": operation.op,
+            "success": error is None,
+            "task": task,
+            "error": error
+        })
+
+    failed = any(not result["success"] for result in results)
+    if atomic and failed:
+        db.rollback()
+        for result in results:
+            result["task"] = None
+            if result["success"]:
+                result["success"], result["error"] = False, "Not applied"
+        return results, False
+
+    update_task_stats(db, user_id, before, after)
+    # Flush before committing so new tasks have their IDs without a refresh
+    db.flush()
+    changed_ids = dict.fromkeys(
+        result["task"].id for result in results
+        if result["task"] is not None and result["op"] != "delete" and result["task"].id not in deleted_ids
+    )
+    record_task_changes(db, user_id, changed=changed_ids, deleted=deleted_ids)
+    db.commit()
+    return results, True
@@ -0,0 +1,108 @@
+from sqlmodel import Session
+from sqlalchemy import Integer, case, func, text
+from sqlalchemy.engine import Engine
+import html
+import re
+from .models import Task
+
+# Trigram indexes need at least 3 characters; shorter terms fall back to a
+# plain case-insensitive LIKE over the user's tasks
+MIN_INDEXED_LENGTH = 3
+
+# Set by setup_search() once the SQLite FTS5 table and triggers exist
+sqlite_fts_enabled = False
+
+SQLITE_FTS_SETUP = [
+    # External-content FTS5 table over tasks.title. The trigram tokenizer
+    # indexes every 3-character substring, so MATCH does case-insensitive
+    # substring search rather than whole-word search.
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, content='tasks', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+    END""",
+]
+
+POSTGRES_SEARCH_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Serves ILIKE '%term%' on tasks.title
+    "CREATE INDEX IF NOT EXISTS ix_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)",
+]
+
+
+def setup_search(engine: Engine) -> None:
+    """Create the title search index for the engine's database. Safe to call on every startup."""
+    global sqlite_fts_enabled
+
+    try:
+        with engine.begin() as connection:
+            if engine.dialect.name == "sqlite":
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'")
+                ).first()
+                for statement in SQLITE_FTS_SETUP:
+                    connection.execute(text(statement))
+                if not exists:
+                    # Index the tasks that predate the FTS table
+                    connection.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+                sqlite_fts_enabled = True
+            elif engine.dialect.name == "postgresql":
+                for statement in POSTGRES_SEARCH_SETUP:
+                    connection.execute(text(statement))
+    except Exception as e:
+        # Search still works without the index, just as a scan
+        print(f"Search index setup failed, falling back to LIKE search: {str(e)}")
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def search_filter(db: Session, term: str):
+    """WHERE clause matching tasks whose title contains term, case-insensitively."""
+    if sqlite_fts_enabled and db.get_bind().dialect.name == "sqlite" and len(term) >= MIN_INDEXED_LENGTH:
+        # A quoted FTS5 string is a phrase, which the trigram tokenizer
+        # matches as a substring
+        phrase = '"' + term.replace('"', '""') + '"'
+        matches = text(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH :phrase"
+        ).bindparams(phrase=phrase).columns(rowid=Integer)
+        return Task.id.in_(matches)
+
+    # ILIKE on Postgres, served by the pg_trgm index; lower() LIKE elsewhere
+    return Task.title.ilike(f"%{_escape_like(term)}%", escape="/")
+
+
+def search_rank(term: str):
+    """
+    Relevance tier for a matching title: 0 exact, 1 prefix, 2 substring.
+
+    Lower is better; ties are broken by creation order.
+    """
+    lowered = term.lower()
+    title = func.lower(Task.title)
+    return case(
+        (title == lowered, 0),
+        (title.like(f"{_escape_like(lowered)}%", escape="/"), 1),
+        else_=2
+    )
+
+
+def highlight_title(title: str, term: str) -> str:
+    """HTML-escape a title and wrap each case-insensitive match of term in <mark>."""
+    if not term:
+        return html.escape(title)
+
+    parts = re.split(f"({re.escape(term)})", title, flags=re.IGNORECASE)
+    return "".join(
+        f"<mark>{html.escape(part)}</mark>" if i % 2 else html.escape(part)
+        for i, part in enumerate(parts)
+    )
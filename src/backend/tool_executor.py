@@ -0,0 +1,66 @@
+from sqlmodel import Session
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from .database import run_db, run_db_session
+from .openai_client import execute_functions
+import asyncio
+
+# Tools that only read; everything else writes
+READ_ONLY_TOOLS = {"list_tasks"}
+
+
+def is_read_only(tool_call: Dict[str, Any]) -> bool:
+    return tool_call["function"] in READ_ONLY_TOOLS
+
+
+def plan_tool_batches(tool_calls: List[Dict[str, Any]]) -> List[Tuple[bool, List[int]]]:
+    """
+    Split a turn's tool calls into batches of consecutive reads or writes.
+
+    Returns:
+        (read_only, indexes into tool_calls) per batch, in call order. A
+        read sees every write requested before it and none requested after
+        it, so batches run one after another.
+    """
+    batches: List[Tuple[bool, List[int]]] = []
+    for index, tool_call in enumerate(tool_calls):
+        read_only = is_read_only(tool_call)
+        if batches and batches[-1][0] == read_only:
+            batches[-1][1].append(index)
+        else:
+            batches.append((read_only, [index]))
+    return batches
+
+
+async def iter_tool_results(
+    db: Session,
+    tool_calls: List[Dict[str, Any]],
+    user_id: str
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Execute a turn's tool calls, yielding each batch's results as it finishes.
+
+    Reads in a batch run concurrently, each in its own session; writes in a
+    batch run in order in the request's session and commit together.
+    """
+    for read_only, indexes in plan_tool_batches(tool_calls):
+        calls = [tool_calls[index] for index in indexes]
+        if read_only and len(calls) > 1:
+            results = await asyncio.gather(*[
+                run_db_session(lambda session, call=call: execute_functions([call], user_id, session)[0])
+                for call in calls
+            ])
+        else:
+            results = await run_db(db, lambda session: execute_functions(calls, user_id, session))
+        yield list(results)
+
+
+async def execute_tool_calls(
+    db: Session,
+    tool_calls: List[Dict[str, Any]],
+    user_id: str
+) -> List[Dict[str, Any]]:
+    """Execute a turn's tool calls and return their results in call order."""
+    results: List[Dict[str, Any]] = []
+    async for batch in iter_tool_results(db, tool_calls, user_id):
+        results += batch
+    return results
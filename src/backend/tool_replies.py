@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import os
+
+# Tools whose results are phrased from a template instead of a second model
+# call, comma separated. Leave empty to always ask the model.
+TOOL_REPLY_TEMPLATES = {
+    name.strip()
+    for name in os.getenv("TOOL_REPLY_TEMPLATES", "list_tasks,complete_task,delete_task").split(",")
+    if name.strip()
+}
+
+# Most tasks a templated list reply shows; the rest are summed up as
+# "...and N more", so a reply (and the stored message) stays short
+TOOL_REPLY_MAX_TASKS = int(os.getenv("TOOL_REPLY_MAX_TASKS", "20"))
+
+STATUS_LABELS = {"all": "", "pending": "pending ", "completed": "completed "}
+
+
+def format_timestamp(value: str) -> str:
+    try:
+        return datetime.fromisoformat(value).strftime("%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def render_task(task: Dict[str, Any]) -> str:
+    """One task in the SYSTEM_PROMPT display format."""
+    lines = [f"[{task['id']}] {'✅' if task.get('completed') else '☐'} {task['title']}"]
+    if task.get("description"):
+        lines.append(f"    {task['description']}")
+    if task.get("created_at"):
+        lines.append(f"    Created: {format_timestamp(task['created_at'])}")
+    return "\n".join(lines)
+
+
+def render_list_tasks(arguments: Dict[str, Any], result: Dict[str, Any]) -> str:
+    label = STATUS_LABELS.get(arguments.get("status", "all"), "")
+    if not result["tasks"]:
+        return f"You have no {label}tasks."
+    header = f"Here are your {label}tasks ({result['count']}):"
+    shown = result["tasks"][:TOOL_REPLY_MAX_TASKS]
+    lines = [header, *[render_task(task) for task in shown]]
+    if result["count"] > len(shown):
+        lines.append(f"…and {result['count'] - len(shown)} more.")
+    return "\n".join(lines)
+
+
+def render_complete_task(arguments: Dict[str, Any], result: Dict[str, Any]) -> str:
+    mark = "✅" if result["completed"] else "☐"
+    state = "complete" if result["completed"] else "incomplete"
+    return f"Marked as {state}:\n[{result['task_id']}] {mark} {result['title']}"
+
+
+def render_delete_task(arguments: Dict[str, Any], result: Dict[str, Any]) -> str:
+    return f"Deleted task [{result['task_id']}] {result['title']}."
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], str]] = {
+    "list_tasks": render_list_tasks,
+    "complete_task": render_complete_task,
+    "delete_task": render_delete_task,
+}
+
+
+def render_tool_reply(tool_call: Dict[str, Any], result: Dict[str, Any]) -> Optional[str]:
+    """The reply for one tool result, or None if its tool isn't templated."""
+    name = tool_call["function"]
+    if name not in TOOL_REPLY_TEMPLATES or name not in RENDERERS:
+        return None
+    if not result.get("success"):
+        return result.get("message") or result.get("error")
+    return RENDERERS[name](tool_call["arguments"], result)
+
+
+def render_tool_replies(
+    tool_calls: List[Dict[str, Any]],
+    results: List[Dict[str, Any]]
+) -> Optional[str]:
+    """
+    Phrase a turn's tool results without asking the model again.
+
+    Returns:
+        The assistant's reply, or None if any call's tool has no template
+        (the caller then asks the model with get_final_response)
+    """
+    replies = []
+    for tool_call, result in zip(tool_calls, results):
+        reply = render_tool_reply(tool_call, result)
+        if reply is None:
+            return None
+        replies.append(reply)
+    return "\n\n".join(replies) if replies else None
@@ -0,0 +1,44 @@
+from sqlmodel import Session, select
+from typing import Optional
+from .models import User
+
+
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Get a user by email."""
+    return db.exec(select(User).where(User.email == email)).first()
+
+
+def get_detached_user_by_email(db: Session, email: str) -> Optional[User]:
+    """
+    Get a user by email and end the transaction, keeping the loaded user.
+
+    Returns the connection to the pool, so callers can do slow work such
+    as bcrypt afterwards without holding a connection.
+    """
+    user = get_user_by_email(db, email)
+    if user:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+def user_exists(db: Session, email: str, username: str) -> bool:
+    """Check whether a user with this email or username exists, then end the transaction."""
+    existing_user = db.exec(
+        select(User.id).where((User.email == email) | (User.username == username))
+    ).first()
+    db.rollback()
+    return existing_user is not None
+
+
+def create_user(db: Session, email: str, username: str, hashed_password: str) -> User:
+    """Create a new user."""
+    new_user = User(
+        email=email,
+        username=username,
+        hashed_password=hashed_password
+    )
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return new_user
@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from itertools import cycle
 import time
 
+from src.backend import completion_cache
+
 
 @dataclass
 class OpenAIConfig:
@@ -83,22 +85,21 @@ class OpenAIManager:
 
     def __init__(self, config: OpenAIConfig):
         self.config = config
-        self.usage_stats = {"calls_made": 0, "tokens_used": 0}
+        self.usage_stats = {"calls_made": 0, "tokens_used": 0, "cache_hits": 0}
 
-    def chat_completion(self, messages: List[dict], **kwargs) -> Optional[str]:
+    def chat_completion(self, messages: List[dict], cache: bool = True, **kwargs) -> Optional[str]:
         """
         Make a chat completion call with minimal usage.
 
         Args:
             messages: List of messages in the conversation
+            cache: Answer identical requests from the completion cache
+                (no API call, no rate limit wait)
             **kwargs: Additional parameters to override config
 
         Returns:
             Response content or None if failed
         """
-        # Enforce rate limiting
-        self.config.enforce_rate_limit()
-
         # Override config with kwargs if provided
         params = {
             "model": self.config.model,
@@ -109,6 +110,22 @@ class OpenAIManager:
         }
         params.update(kwargs)
 
+        store = completion_cache.cache
+        cache_key = None
+        if cache and store.enabled:
+            # The timeout doesn't change the answer
+            cache_key = completion_cache.completion_key({
+                "base_url": str(openai.base_url or ""),
+                **{name: value for name, value in params.items() if name != "timeout"}
+            })
+            cached = store.get(cache_key)
+            if cached is not None:
+                self.usage_stats["cache_hits"] += 1
+                return cached["content"]
+
+        # Enforce rate limiting
+        self.config.enforce_rate_limit()
+
         max_retries = len(self.config.api_keys)  # Try each key once
 
         for attempt in range(max_retries):
@@ -122,6 +139,8 @@ class OpenAIManager:
                 tokens_used += len(response.choices[0].message.content.split())
                 self.usage_stats["tokens_used"] += tokens_used
 
+                if cache_key is not None:
+                    store.set(cache_key, response.choices[0].message.model_dump())
                 return response.choices[0].message.content
 
             except Exception as e:
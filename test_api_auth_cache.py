@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Test script for the verified-token cache used by get_current_user."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+import time
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.models import User
+from src.backend.auth import token_cache
+from src.backend.cache import TTLCache
+
+create_tables()
+client = TestClient(app)
+
+
+def test_repeat_request_hits_cache():
+    """Test 1: Repeat Request Hits Cache"""
+    print("Test 1: Repeat Request Hits Cache")
+    _, headers = create_user()
+    before = token_cache.stats()
+
+    first = client.get("/api/users/me", headers=headers)
+    second = client.get("/api/users/me", headers=headers)
+
+    after = token_cache.stats()
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    print("✅ Passed")
+
+
+def test_user_update_invalidates_cache():
+    """Test 2: User Update Invalidates Cache"""
+    print("Test 2: User Update Invalidates Cache")
+    user_id, headers = create_user()
+    client.get("/api/users/me", headers=headers)
+
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        user.username = f"renamed-{user_id}"
+        session.add(user)
+        session.commit()
+
+    response = client.get("/api/users/me", headers=headers)
+    assert response.json()["username"] == f"renamed-{user_id}"
+    print("✅ Passed")
+
+
+def test_deleted_user_token_rejected():
+    """Test 3: Deleted User Token Rejected"""
+    print("Test 3: Deleted User Token Rejected")
+    user_id, headers = create_user()
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    with Session(engine) as session:
+        session.delete(session.get(User, user_id))
+        session.commit()
+
+    assert client.get("/api/users/me", headers=headers).status_code == 401
+    print("✅ Passed")
+
+
+def test_cache_evicts_least_recently_used():
+    """Test 4: Cache Evicts Least Recently Used"""
+    print("Test 4: Cache Evicts Least Recently Used")
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    print("✅ Passed")
+
+
+def test_cache_entries_expire():
+    """Test 5: Cache Entries Expire"""
+    print("Test 5: Cache Entries Expire")
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=0.01)
+    cache.set("long", 2)
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    print("✅ Passed")
+
+
+def test_metrics_report_auth_cache():
+    """Edge Case: Metrics Report Auth Cache"""
+    print("Edge Case: Metrics Report Auth Cache")
+    _, headers = create_user()
+    data = client.get("/api/metrics", headers=headers).json()["data"]
+
+    assert data["auth_cache"]["maxsize"] == token_cache.maxsize
+    assert 0.0 <= data["auth_cache"]["hit_ratio"] <= 1.0
+    # Only signed-in users can read them
+    assert client.get("/api/metrics").status_code == 401
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running auth cache tests...\n")
+
+    test_repeat_request_hits_cache()
+    test_user_update_invalidates_cache()
+    test_deleted_user_token_rejected()
+    test_cache_evicts_least_recently_used()
+    test_cache_entries_expire()
+    test_metrics_report_auth_cache()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
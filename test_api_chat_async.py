@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Test script for the async chat pipeline against a local fake OpenAI server."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user, run_with_server
+
+import asyncio
+import time
+import httpx
+from sqlmodel import Session, select
+
+from src.backend import openai_client
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.models import Task
+from fake_openai import FakeOpenAIServer
+
+create_tables()
+
+
+def run_chats(server: FakeOpenAIServer, messages: list, headers: dict) -> list:
+    """Point the OpenAI client at the fake server and send all chats concurrently on one event loop."""
+    async def send_all():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.post("/api/chat", json={"message": message}, headers=headers)
+                for message in messages
+            ])
+
+    return run_with_server(server, send_all)
+
+
+def test_plain_chat_reply():
+    """Test 1: Plain Chat Reply"""
+    print("Test 1: Plain Chat Reply")
+    server = FakeOpenAIServer().start()
+    try:
+        _, headers = create_user()
+        [response] = run_chats(server, ["hello"], headers)
+    finally:
+        server.stop()
+
+    assert response.status_code == 200
+    assert response.json()["response"] == "You said: hello"
+    assert response.json()["tool_calls"] == []
+    print("✅ Passed")
+
+
+def test_tool_call_round_trip():
+    """Test 2: Tool Call Round Trip"""
+    print("Test 2: Tool Call Round Trip")
+    server = FakeOpenAIServer().start()
+    try:
+        user_id, headers = create_user()
+        [response] = run_chats(server, ["add buy milk"], headers)
+    finally:
+        server.stop()
+
+    data = response.json()
+    assert response.status_code == 200
+    assert data["tool_calls"][0]["function"] == "add_task"
+    assert data["response"] == "Task 'buy milk' created successfully"
+
+    # The follow-up request replays the assistant tool call before its result
+    follow_up = server.requests[1]["messages"]
+    assert follow_up[-2]["role"] == "assistant"
+    assert follow_up[-2]["tool_calls"][0]["id"] == follow_up[-1]["tool_call_id"]
+
+    with Session(engine) as session:
+        titles = session.exec(select(Task.title).where(Task.user_id == user_id)).all()
+    assert titles == ["buy milk"]
+    print("✅ Passed")
+
+
+def test_concurrent_chats_run_in_parallel():
+    """Test 3: Concurrent Chats Run In Parallel"""
+    print("Test 3: Concurrent Chats Run In Parallel")
+    delay = 0.3
+    chats = 10
+    server = FakeOpenAIServer(delay=delay).start()
+    try:
+        _, headers = create_user()
+        start = time.perf_counter()
+        responses = run_chats(server, [f"message {i}" for i in range(chats)], headers)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    assert all(r.status_code == 200 for r in responses)
+    # Serial execution would take chats * delay = 3s; leave headroom for
+    # slow CI machines, since max_in_flight is the real parallelism check
+    assert elapsed < chats * delay / 2
+    assert server.max_in_flight > 1
+    print(f"✅ Passed ({chats} chats in {elapsed:.2f}s, {server.max_in_flight} in flight)")
+
+
+def test_concurrency_limit_respected():
+    """Edge Case: Concurrency Limit Respected"""
+    print("Edge Case: Concurrency Limit Respected")
+    original = openai_client.openai_slots
+    openai_client.openai_slots = asyncio.Semaphore(2)
+    server = FakeOpenAIServer(delay=0.1).start()
+    try:
+        _, headers = create_user()
+        responses = run_chats(server, [f"message {i}" for i in range(6)], headers)
+    finally:
+        server.stop()
+        openai_client.openai_slots = original
+
+    assert all(r.status_code == 200 for r in responses)
+    assert server.max_in_flight == 2
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running async chat tests...\n")
+
+    test_plain_chat_reply()
+    test_tool_call_round_trip()
+    test_concurrent_chats_run_in_parallel()
+    test_concurrency_limit_respected()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
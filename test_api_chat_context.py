@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Test script for token-budgeted chat context and rolling conversation summaries."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user, post_chat
+
+from contextlib import contextmanager
+from typing import Optional
+from sqlmodel import Session
+
+from src.backend import chat_context, openai_client
+from src.backend.database import create_tables, engine
+from src.backend.chat_models import Conversation
+from src.backend.chat_queries import add_message, create_conversation, get_unsummarized_messages
+from src.backend.chat_context import message_tokens
+from src.backend.openai_client import SUMMARY_PROMPT
+from fake_openai import FakeOpenAIServer, default_reply
+
+create_tables()
+
+
+def create_history(user_id: int, count: int, size: int) -> tuple:
+    """Create a conversation with count alternating messages of size characters; return (id, message IDs)."""
+    with Session(engine) as session:
+        conversation = create_conversation(session, str(user_id))
+        ids = [
+            add_message(session, conversation.id, str(user_id), "user" if n % 2 == 0 else "assistant",
+                        f"{n:03d}" + "x" * (size - 3)).id
+            for n in range(count)
+        ]
+        return conversation.id, ids
+
+
+def get_conversation(conversation_id: int) -> Conversation:
+    with Session(engine) as session:
+        return session.get(Conversation, conversation_id)
+
+
+class SummarizingServer(FakeOpenAIServer):
+    """Fake OpenAI server that answers summary requests with "summary N"."""
+
+    def __init__(self):
+        super().__init__(reply=self.answer)
+
+    def answer(self, body: dict) -> dict:
+        if body["messages"][0]["content"] == SUMMARY_PROMPT:
+            return {"role": "assistant", "content": f"summary {len(self.summary_requests())}"}
+        return default_reply(body)
+
+    def summary_requests(self) -> list:
+        return [r for r in self.requests if r["messages"][0]["content"] == SUMMARY_PROMPT]
+
+    def chat_requests(self) -> list:
+        return [r for r in self.requests if r["messages"][0]["content"] != SUMMARY_PROMPT]
+
+
+@contextmanager
+def context_budget(tokens: int, summary_tokens: int):
+    original = chat_context.CHAT_CONTEXT_TOKENS, chat_context.CHAT_SUMMARY_TOKENS
+    chat_context.CHAT_CONTEXT_TOKENS, chat_context.CHAT_SUMMARY_TOKENS = tokens, summary_tokens
+    try:
+        yield
+    finally:
+        chat_context.CHAT_CONTEXT_TOKENS, chat_context.CHAT_SUMMARY_TOKENS = original
+
+
+def cost_of(content: str) -> int:
+    """Tokens one message with this content takes, with whichever tokenizer is in use."""
+    return message_tokens({"content": content})
+
+
+def send(server: FakeOpenAIServer, headers: dict, message: str, conversation_id: Optional[int] = None) -> dict:
+    """Send one chat message through the app with the OpenAI client pointed at the fake server."""
+    response = post_chat(server, headers, {"message": message, "conversation_id": conversation_id})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def history_tokens(request: dict) -> int:
+    """Tokens of a chat request's history, i.e. everything after the system prompt."""
+    return sum(message_tokens(message) for message in request["messages"][1:])
+
+
+def test_short_chats_send_all_history():
+    """Test 1: Short Chats Send All Their History"""
+    print("Test 1: Short Chats Send All Their History")
+    server = SummarizingServer().start()
+    try:
+        _, headers = create_user()
+        conversation_id = send(server, headers, "hello 0")["conversation_id"]
+        for n in range(1, 8):
+            send(server, headers, f"hello {n}", conversation_id)
+    finally:
+        server.stop()
+
+    last = server.chat_requests()[-1]["messages"]
+    # More than the 10 messages the old fixed window allowed
+    assert len(last) == 1 + 14 + 1
+    assert last[1] == {"role": "user", "content": "hello 0"}
+    assert last[-1] == {"role": "user", "content": "hello 7"}
+    assert server.summary_requests() == []
+    print("✅ Passed")
+
+
+def test_overflow_is_summarized_and_cached():
+    """Test 2: Overflowing History Is Summarized Once And Cached"""
+    print("Test 2: Overflowing History Is Summarized Once And Cached")
+    user_id, headers = create_user()
+    conversation_id, ids = create_history(user_id, count=20, size=400)
+    cost = cost_of("000" + "x" * 397)
+    server = SummarizingServer().start()
+    try:
+        # Four messages fit; after summarizing, one fits in half the budget
+        with context_budget(5 * cost, summary_tokens=cost):
+            send(server, headers, "next", conversation_id)
+            first = get_conversation(conversation_id)
+            send(server, headers, "again", conversation_id)
+    finally:
+        server.stop()
+
+    [summary_request] = server.summary_requests()
+    transcript = summary_request["messages"][1]["content"]
+    assert transcript.startswith("user: 000") and "assistant: 017" in transcript and "019" not in transcript
+    assert first.summary == "summary 1" and first.summary_through == ids[18]
+
+    turn, later = server.chat_requests()
+    assert turn["messages"][1] == {"role": "system", "content": "Summary of the earlier conversation:\nsummary 1"}
+    assert [m["content"][:3] for m in turn["messages"][2:-1]] == ["019"]
+    assert history_tokens(turn) <= 5 * cost
+    # The next turn reuses the stored summary
+    assert later["messages"][1] == turn["messages"][1]
+    assert [m["content"] for m in later["messages"][3:]] == ["next", "You said: next", "again"]
+    print("✅ Passed")
+
+
+def test_long_chats_stay_within_budget():
+    """Test 3: Long Chats Stay Within Budget, Summarizing Every Few Turns"""
+    print("Test 3: Long Chats Stay Within Budget, Summarizing Every Few Turns")
+    _, headers = create_user()
+    cost = cost_of("0" * 400)
+    server = SummarizingServer().start()
+    try:
+        with context_budget(8 * cost, summary_tokens=cost):
+            conversation_id = send(server, headers, "0" * 400)["conversation_id"]
+            for n in range(1, 12):
+                send(server, headers, str(n % 10) * 400, conversation_id)
+    finally:
+        server.stop()
+
+    assert all(history_tokens(request) <= 8 * cost for request in server.chat_requests())
+    summaries = server.summary_requests()
+    assert 1 < len(summaries) < 8
+    # Each refresh builds on the previous summary
+    assert summaries[1]["messages"][1]["content"].startswith("Summary so far:\nsummary 1\n")
+    print("✅ Passed")
+
+
+def test_pack_recent():
+    """Test 4: Packing Keeps The Newest Messages That Fit"""
+    print("Test 4: Packing Keeps The Newest Messages That Fit")
+    user_id, _ = create_user()
+    conversation_id, _ = create_history(user_id, count=6, size=40)
+
+    with Session(engine) as session:
+        history = get_unsummarized_messages(session, conversation_id)
+        cost = cost_of(history[0].content)
+        older, recent = chat_context.pack_recent(history, cost * 2 + cost // 2)
+        none_fit = chat_context.pack_recent(history, cost - 1)
+        after = get_unsummarized_messages(session, conversation_id, history[3].id)
+
+    assert [m.content[:3] for m in older] == ["000", "001", "002", "003"]
+    assert [m.content[:3] for m in recent] == ["004", "005"]
+    assert none_fit == (history, [])
+    assert [m.content[:3] for m in after] == ["004", "005"]
+    print("✅ Passed")
+
+
+def test_summary_failure_still_answers():
+    """Edge Case: A Failed Summary Still Answers Within Budget"""
+    print("Edge Case: A Failed Summary Still Answers Within Budget")
+    user_id, headers = create_user()
+    conversation_id, _ = create_history(user_id, count=20, size=400)
+    cost = cost_of("000" + "x" * 397)
+    original = openai_client.summarize_conversation
+
+    async def failing(*args):
+        raise RuntimeError("summary unavailable")
+
+    server = SummarizingServer().start()
+    openai_client.summarize_conversation = failing
+    try:
+        with context_budget(5 * cost, summary_tokens=cost):
+            response = send(server, headers, "next", conversation_id)
+    finally:
+        openai_client.summarize_conversation = original
+        server.stop()
+
+    [turn] = server.chat_requests()
+    assert response["response"] == "You said: next"
+    assert history_tokens(turn) <= 5 * cost
+    assert [m["content"][:3] for m in turn["messages"][1:-1]] == ["016", "017", "018", "019"]
+    assert get_conversation(conversation_id).summary is None
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running chat context tests...\n")
+
+    test_short_chats_send_all_history()
+    test_overflow_is_summarized_and_cached()
+    test_long_chats_stay_within_budget()
+    test_pack_recent()
+    test_summary_failure_still_answers()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test script for the streaming (SSE) chat endpoint."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user, post_chat
+
+import json
+from sqlmodel import Session, select
+
+from src.backend.database import create_tables, engine
+from src.backend.chat_models import Message
+from fake_openai import FakeOpenAIServer
+
+create_tables()
+
+
+def stream_chat(message: str, headers: dict) -> list:
+    """Send one streaming chat through a fake OpenAI server and return the parsed (event, data) list."""
+    server = FakeOpenAIServer().start()
+    try:
+        response = post_chat(server, headers, {"message": message}, "/api/chat/stream")
+    finally:
+        server.stop()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_plain_reply_streams_tokens():
+    """Test 1: Plain Reply Streams Tokens"""
+    print("Test 1: Plain Reply Streams Tokens")
+    events = stream_chat("hello there", create_user()[1])
+    names = [name for name, _ in events]
+    tokens = [data["content"] for name, data in events if name == "token"]
+
+    assert names[0] == "conversation"
+    assert names[-1] == "done"
+    assert len(tokens) > 1
+    assert "".join(tokens) == "You said: hello there"
+    assert events[-1][1]["response"] == "You said: hello there"
+    print("✅ Passed")
+
+
+def test_tool_calls_stream_before_tokens():
+    """Test 2: Tool Calls Stream Before Tokens"""
+    print("Test 2: Tool Calls Stream Before Tokens")
+    events = stream_chat("add water plants", create_user()[1])
+    names = [name for name, _ in events]
+
+    assert names.index("tool_call") < names.index("token")
+    tool_call = dict(events)["tool_call"]
+    assert tool_call["function"] == "add_task"
+    assert tool_call["result"]["success"] is True
+    assert events[-1][1]["response"] == "Task 'water plants' created successfully"
+    print("✅ Passed")
+
+
+def test_messages_persisted_after_stream():
+    """Test 3: Messages Persisted After Stream"""
+    print("Test 3: Messages Persisted After Stream")
+    events = stream_chat("add call mom", create_user()[1])
+    done = events[-1][1]
+
+    with Session(engine) as session:
+        stored = session.exec(
+            select(Message)
+            .where(Message.conversation_id == done["conversation_id"])
+            .order_by(Message.id)
+        ).all()
+
+    assert [m.role for m in stored] == ["user", "assistant"]
+    assert stored[0].content == "add call mom"
+    assert stored[1].id == done["message_id"]
+    assert stored[1].content == done["response"]
+    assert json.loads(stored[1].tool_calls)["calls"][0]["function"] == "add_task"
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running streaming chat tests...\n")
+
+    test_plain_reply_streams_tokens()
+    test_tool_calls_stream_before_tokens()
+    test_messages_persisted_after_stream()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Test script for batched tool execution: concurrent reads and single-transaction writes."""
+
+# Test database and settings; imported before anything from src
+from api_testing import add_tasks, counted_commits, create_user, run_turn
+
+import json
+import time
+from sqlmodel import Session, select
+
+from src.backend import database, openai_client
+from src.backend.database import create_tables, engine
+from src.backend.models import Task
+from src.backend.tool_executor import plan_tool_batches
+from fake_openai import calling
+
+create_tables()
+
+
+def test_plan_tool_batches():
+    """Test 1: Calls Are Batched Into Runs Of Reads And Writes"""
+    print("Test 1: Calls Are Batched Into Runs Of Reads And Writes")
+    names = ["list_tasks", "list_tasks", "add_task", "complete_task", "list_tasks", "delete_task"]
+    batches = plan_tool_batches([{"function": name, "arguments": {}} for name in names])
+
+    assert batches == [(True, [0, 1]), (False, [2, 3]), (True, [4]), (False, [5])]
+    assert plan_tool_batches([]) == []
+    print("✅ Passed")
+
+
+def test_writes_share_one_transaction():
+    """Test 2: Independent Writes Commit In One Transaction, Results In Order"""
+    print("Test 2: Independent Writes Commit In One Transaction, Results In Order")
+    user_id, headers = create_user()
+    ids = add_tasks(user_id, ["a", "b", "c"])
+    server = calling([("complete_task", {"task_id": task_id}) for task_id in ids] + [("add_task", {"title": "d"})])
+
+    with counted_commits() as commits:
+        response = run_turn(server, headers)
+
+    data = response.json()
+    assert response.status_code == 200
+    assert [call["result"].get("task_id") for call in data["tool_calls"][:3]] == ids
+    assert data["tool_calls"][3]["result"]["title"] == "d"
+    # One for all four tools, one for storing the turn
+    assert len(commits) == 2
+
+    # Results reach the model in call order, each answering its own call
+    follow_up = server.requests[1]["messages"]
+    assert [m["tool_call_id"] for m in follow_up[-4:]] == ["call_0", "call_1", "call_2", "call_3"]
+
+    with Session(engine) as session:
+        tasks = session.exec(select(Task).where(Task.user_id == user_id).order_by(Task.id)).all()
+    assert [(t.title, t.completed) for t in tasks] == [("a", True), ("b", True), ("c", True), ("d", False)]
+    print("✅ Passed")
+
+
+def test_reads_run_concurrently():
+    """Test 3: Reads Run Concurrently"""
+    print("Test 3: Reads Run Concurrently")
+    user_id, headers = create_user()
+    add_tasks(user_id, ["a"])
+    delay = 0.3
+    original = openai_client.apply_function
+
+    def slow_apply(function_name, arguments, user_id, db):
+        time.sleep(delay)
+        return original(function_name, arguments, user_id, db)
+
+    server = calling([("list_tasks", {"status": status}) for status in ["all", "pending", "completed", "all"]])
+    openai_client.apply_function = slow_apply
+    try:
+        start = time.perf_counter()
+        response = run_turn(server, headers)
+        elapsed = time.perf_counter() - start
+    finally:
+        openai_client.apply_function = original
+
+    counts = [call["result"]["count"] for call in response.json()["tool_calls"]]
+    assert counts == [1, 1, 0, 1]
+    # Serially, the four reads alone would take 4 * delay. The sleep stands in
+    # for a slow query; with DB_ASYNC it would block the event loop instead
+    if not database.DB_ASYNC:
+        assert elapsed < 3 * delay
+    print(f"✅ Passed (4 reads in {elapsed:.2f}s)")
+
+
+def test_reads_see_earlier_writes_only():
+    """Test 4: A Read Sees The Writes Requested Before It, Not After"""
+    print("Test 4: A Read Sees The Writes Requested Before It, Not After")
+    _, headers = create_user()
+    server = calling([
+        ("add_task", {"title": "before"}),
+        ("list_tasks", {"status": "all"}),
+        ("list_tasks", {"status": "pending"}),
+        ("add_task", {"title": "after"})
+    ])
+
+    response = run_turn(server, headers, "/api/chat/stream")
+
+    events = response.text.split("\n\n")
+    tool_events = [json.loads(e.split("data: ", 1)[1]) for e in events if e.startswith("event: tool_call")]
+    assert [e["function"] for e in tool_events] == ["add_task", "list_tasks", "list_tasks", "add_task"]
+    for listed in tool_events[1:3]:
+        assert [t["title"] for t in listed["result"]["tasks"]] == ["before"]
+    print("✅ Passed")
+
+
+def test_failing_call_does_not_undo_the_others():
+    """Edge Case: A Failing Write Doesn't Undo The Others In Its Batch"""
+    print("Edge Case: A Failing Write Doesn't Undo The Others In Its Batch")
+    user_id, headers = create_user()
+    [task_id] = add_tasks(user_id, ["a"])
+    server = calling([
+        ("complete_task", {"task_id": task_id}),
+        ("complete_task", {"task_id": 999999}),
+        ("add_task", {}),  # Missing title: raises inside the transaction
+        ("add_task", {"title": "b"})
+    ])
+
+    response = run_turn(server, headers)
+
+    results = [call["result"] for call in response.json()["tool_calls"]]
+    assert results[0]["success"] and results[0]["completed"]
+    assert results[1] == {"success": False, "error": "Task 999999 not found", "message": "Task 999999 not found"}
+    assert not results[2]["success"] and results[2]["message"].startswith("Failed to add_task")
+    assert results[3]["success"]
+
+    with Session(engine) as session:
+        tasks = session.exec(select(Task).where(Task.user_id == user_id).order_by(Task.id)).all()
+    assert [(t.title, t.completed) for t in tasks] == [("a", True), ("b", False)]
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running chat tool execution tests...\n")
+
+    test_plan_tool_batches()
+    test_writes_share_one_transaction()
+    test_reads_run_concurrently()
+    test_reads_see_earlier_writes_only()
+    test_failing_call_does_not_undo_the_others()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
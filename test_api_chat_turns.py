@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Test script for storing a chat turn (messages and conversation) in one transaction."""
+
+# Test database and settings; imported before anything from src
+from api_testing import counted_commits, create_user, post_chat
+
+import json
+from sqlmodel import Session, select
+
+from src.backend.database import create_tables, engine
+from src.backend.chat_models import Conversation, Message
+from src.backend.chat_queries import add_turn, create_conversation
+from fake_openai import FakeOpenAIServer, tool_call_message
+
+create_tables()
+
+
+def stored_turns(user_id: int) -> list:
+    """(conversation ID, role, content) for every stored message of the user, in order."""
+    with Session(engine) as session:
+        rows = session.exec(
+            select(Message.conversation_id, Message.role, Message.content)
+            .where(Message.user_id == str(user_id))
+            .order_by(Message.id)
+        ).all()
+    return [tuple(row) for row in rows]
+
+
+def test_new_chat_is_one_commit():
+    """Test 1: A New Chat's First Turn Is One Commit"""
+    print("Test 1: A New Chat's First Turn Is One Commit")
+    user_id, headers = create_user()
+    server = FakeOpenAIServer().start()
+    try:
+        with counted_commits() as commits:
+            response = post_chat(server, headers, {"message": "hello"})
+    finally:
+        server.stop()
+
+    data = response.json()
+    assert response.status_code == 200
+    assert len(commits) == 1
+    assert stored_turns(user_id) == [
+        (data["conversation_id"], "user", "hello"),
+        (data["conversation_id"], "assistant", "You said: hello")
+    ]
+    with Session(engine) as session:
+        assert session.get(Message, data["message_id"]).role == "assistant"
+    print("✅ Passed")
+
+
+def test_follow_up_bumps_conversation():
+    """Test 2: A Follow-Up Turn Is One Commit And Bumps updated_at"""
+    print("Test 2: A Follow-Up Turn Is One Commit And Bumps updated_at")
+    user_id, headers = create_user()
+    server = FakeOpenAIServer().start()
+    try:
+        conversation_id = post_chat(server, headers, {"message": "first"}).json()["conversation_id"]
+        before = get_updated_at(conversation_id)
+        with counted_commits() as commits:
+            response = post_chat(server, headers, {"message": "second", "conversation_id": conversation_id})
+    finally:
+        server.stop()
+
+    assert response.json()["conversation_id"] == conversation_id
+    assert len(commits) == 1
+    assert get_updated_at(conversation_id) > before
+    assert [content for _, _, content in stored_turns(user_id)] == [
+        "first", "You said: first", "second", "You said: second"
+    ]
+    print("✅ Passed")
+
+
+def get_updated_at(conversation_id: int):
+    with Session(engine) as session:
+        return session.get(Conversation, conversation_id).updated_at
+
+
+def test_add_turn():
+    """Test 3: add_turn Stores Both Messages With Tool Calls"""
+    print("Test 3: add_turn Stores Both Messages With Tool Calls")
+    user_id, _ = create_user()
+    with Session(engine) as session:
+        conversation = create_conversation(session, str(user_id))
+        user_msg, ai_msg = add_turn(
+            session, conversation, str(user_id), "add milk", "Added milk.",
+            tool_calls={"calls": [{"function": "add_task"}]}
+        )
+        assert user_msg.id < ai_msg.id
+        assert json.loads(session.get(Message, ai_msg.id).tool_calls) == {"calls": [{"function": "add_task"}]}
+        assert session.get(Message, user_msg.id).tool_calls is None
+    print("✅ Passed")
+
+
+def test_stream_stores_turn_once():
+    """Test 4: The Streaming Route Stores The Turn In One Commit"""
+    print("Test 4: The Streaming Route Stores The Turn In One Commit")
+    user_id, headers = create_user()
+    server = FakeOpenAIServer().start()
+    try:
+        with counted_commits() as commits:
+            response = post_chat(server, headers, {"message": "hi there"}, "/api/chat/stream")
+    finally:
+        server.stop()
+
+    done = json.loads(response.text.split("event: done\ndata: ", 1)[1].split("\n", 1)[0])
+    # The conversation is created up front so its ID can be streamed first
+    assert len(commits) == 2
+    assert stored_turns(user_id) == [
+        (done["conversation_id"], "user", "hi there"),
+        (done["conversation_id"], "assistant", "You said: hi there")
+    ]
+    print("✅ Passed")
+
+
+def test_failed_turn_leaves_no_empty_conversation():
+    """Edge Case: A Failed First Turn Leaves No Empty Conversation"""
+    print("Edge Case: A Failed First Turn Leaves No Empty Conversation")
+    user_id, headers = create_user()
+
+    def reply(body: dict) -> dict:
+        if body["messages"][-1]["role"] == "tool":
+            raise RuntimeError("upstream failure")
+        # update_task has no reply template, so the turn needs a second completion
+        return tool_call_message([("update_task", {"task_id": 999999, "title": "x"})])
+
+    server = FakeOpenAIServer(reply=reply).start()
+    try:
+        response = post_chat(server, headers, {"message": "list"})
+    finally:
+        server.stop()
+
+    assert response.status_code == 500
+    with Session(engine) as session:
+        conversations = session.exec(select(Conversation).where(Conversation.user_id == str(user_id))).all()
+    assert conversations == []
+    assert stored_turns(user_id) == []
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running chat turn persistence tests...\n")
+
+    test_new_chat_is_one_commit()
+    test_follow_up_bumps_conversation()
+    test_add_turn()
+    test_stream_stores_turn_once()
+    test_failed_turn_leaves_no_empty_conversation()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Test script for negotiated gzip/brotli response compression."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+import gzip
+from unittest import mock
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from src.backend import compression
+from src.backend.compression import CompressionMiddleware, choose_encoding, compress_body
+from src.backend.main import app
+from src.backend.database import create_tables
+
+create_tables()
+client = TestClient(app)
+
+
+def create_user_with_tasks(count: int) -> dict:
+    """Create a user with `count` tasks through the batch endpoint and return auth headers."""
+    _, headers = create_user()
+    if count:
+        client.post("/api/tasks/batch", json={"operations": [
+            {"op": "create", "task": {"title": f"Compressible task number {i}", "tags": ["work"]}}
+            for i in range(count)
+        ]}, headers=headers)
+    return headers
+
+
+def test_large_list_is_gzipped():
+    """Test 1: Large Task List Is Gzipped"""
+    print("Test 1: Large Task List Is Gzipped")
+    headers = create_user_with_tasks(100)
+
+    plain = client.get("/api/tasks", params={"limit": 100}, headers={**headers, "Accept-Encoding": "identity"})
+    gzipped = client.get("/api/tasks", params={"limit": 100}, headers={**headers, "Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+    assert gzipped.json() == plain.json()
+    # The wire size, before httpx decodes it
+    assert gzipped.num_bytes_downloaded * 4 < plain.num_bytes_downloaded
+    print("✅ Passed")
+
+
+def test_small_and_empty_responses_untouched():
+    """Test 2: Small And Empty Responses Are Not Compressed"""
+    print("Test 2: Small And Empty Responses Are Not Compressed")
+    headers = create_user_with_tasks(1)
+
+    small = client.get("/", headers={"Accept-Encoding": "gzip"})
+    first = client.get("/api/tasks", headers={**headers, "Accept-Encoding": "gzip"})
+    not_modified = client.get(
+        "/api/tasks", headers={**headers, "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]}
+    )
+
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"message": "Welcome to DreamFlow API"}
+    assert not_modified.status_code == 304
+    assert "content-encoding" not in not_modified.headers
+    print("✅ Passed")
+
+
+def test_negotiation():
+    """Test 3: Accept-Encoding Negotiation"""
+    print("Test 3: Accept-Encoding Negotiation")
+    with mock.patch.object(compression, "brotli", object()):
+        assert choose_encoding("gzip, deflate, br") == "br"
+        assert choose_encoding("br;q=0.5, gzip") == "gzip"
+        assert choose_encoding("br;q=0, *") == "gzip"
+    with mock.patch.object(compression, "brotli", None):
+        assert choose_encoding("br") is None
+        assert choose_encoding("br, gzip") == "gzip"
+        assert choose_encoding("*") == "gzip"
+    assert choose_encoding("") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("GZIP;q=bogus, deflate") is None
+    print("✅ Passed")
+
+
+def test_brotli_when_installed():
+    """Test 4: Brotli When Installed"""
+    print("Test 4: Brotli When Installed")
+    if compression.brotli is None:
+        print("Brotli package not installed; checked gzip fallback instead")
+        assert choose_encoding("br, gzip") == "gzip"
+        print("✅ Passed")
+        return
+
+    headers = create_user_with_tasks(100)
+    response = client.get("/api/tasks", params={"limit": 100}, headers={**headers, "Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json()["data"]["count"] == 100
+    assert compression.brotli.decompress(compress_body(b"x" * 5000, "br")) == b"x" * 5000
+    print("✅ Passed")
+
+
+def test_streamed_responses():
+    """Edge Case: Streamed Bodies Compress, Event Streams Pass Through"""
+    print("Edge Case: Streamed Bodies Compress, Event Streams Pass Through")
+
+    def chunks():
+        for i in range(50):
+            yield f"chunk {i} ".encode() * 20
+
+    async def download(request):
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async def events(request):
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    streaming_app = Starlette(routes=[Route("/download", download), Route("/events", events)])
+    streaming_app.add_middleware(CompressionMiddleware, minimum_size=10)
+    streaming_client = TestClient(streaming_app)
+    expected = b"".join(chunks())
+
+    download_response = streaming_client.get("/download", headers={"Accept-Encoding": "gzip"})
+    events_response = streaming_client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert download_response.headers["content-encoding"] == "gzip"
+    assert download_response.content == expected
+    assert "content-encoding" not in events_response.headers
+    assert events_response.content == expected
+    assert gzip.decompress(compress_body(expected, "gzip")) == expected
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running compression tests...\n")
+
+    test_large_list_is_gzipped()
+    test_small_and_empty_responses_untouched()
+    test_negotiation()
+    test_brotli_when_installed()
+    test_streamed_responses()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
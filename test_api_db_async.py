@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Test script for the async database mode (DB_ASYNC)."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user, using_openai_server
+
+import asyncio
+import threading
+from uuid import uuid4
+import httpx
+from sqlalchemy import event
+
+from src.backend import database
+from src.backend.main import app
+from src.backend.database import active_engine, create_tables, engine, to_async_url
+from src.backend.auth import create_access_token
+from src.backend.models import Task
+from fake_openai import FakeOpenAIServer, default_reply
+
+create_tables()
+
+
+def run_async_mode(scenario) -> tuple:
+    """
+    Run scenario(client) with DB_ASYNC switched on.
+
+    Returns (scenario result, number of statements sent through the async engine).
+    """
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = database.get_async_engine().sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count)
+    database.DB_ASYNC = True
+
+    async def run():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await scenario(client)
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        database.DB_ASYNC = False
+        event.remove(sync_engine, "before_cursor_execute", count)
+        # Connections belong to the loop that opened them
+        asyncio.run(database.get_async_engine().dispose())
+    return result, len(statements)
+
+
+def test_async_url_mapping():
+    """Test 1: Async URL Mapping"""
+    print("Test 1: Async URL Mapping")
+    assert to_async_url("sqlite:///./todo_app.db") == "sqlite+aiosqlite:///./todo_app.db"
+    assert (
+        to_async_url("postgresql://u:p@host/db?sslmode=require")
+        == "postgresql+asyncpg://u:p@host/db?ssl=require"
+    )
+    print("✅ Passed")
+
+
+def test_task_routes_in_async_mode():
+    """Test 2: Task Routes In Async Mode"""
+    print("Test 2: Task Routes In Async Mode")
+    _, headers = create_user()
+
+    async def scenario(client):
+        created = await client.post(
+            "/api/tasks", json={"title": "async task", "priority": "high"}, headers=headers
+        )
+        task_id = created.json()["data"]["id"]
+        toggled = await client.patch(f"/api/tasks/{task_id}/toggle-complete", headers=headers)
+        updated = await client.put(f"/api/tasks/{task_id}", json={"title": "renamed"}, headers=headers)
+        listed = await client.get("/api/tasks", headers=headers)
+        stats = await client.get("/api/tasks/stats", headers=headers)
+        deleted = await client.delete(f"/api/tasks/{task_id}", headers=headers)
+        missing = await client.get(f"/api/tasks/{task_id}", headers=headers)
+        return created, toggled, updated, listed, stats, deleted, missing
+
+    (created, toggled, updated, listed, stats, deleted, missing), statements = run_async_mode(scenario)
+
+    assert created.status_code == 200
+    assert toggled.json()["data"]["completed"] is True
+    assert updated.json()["data"]["title"] == "renamed"
+    assert [t["title"] for t in listed.json()["data"]["tasks"]] == ["renamed"]
+    assert stats.json()["data"]["completed"] == 1
+    assert deleted.status_code == 200
+    assert missing.status_code == 404
+    assert statements > 0
+    print("✅ Passed")
+
+
+def test_auth_routes_in_async_mode():
+    """Test 3: Auth Routes In Async Mode"""
+    print("Test 3: Auth Routes In Async Mode")
+    email = f"{uuid4().hex}@example.com"
+
+    async def scenario(client):
+        register = await client.post("/api/register", json={"email": email, "username": email, "password": "s3cret"})
+        duplicate = await client.post("/api/register", json={"email": email, "username": email, "password": "s3cret"})
+        login = await client.post("/api/login", json={"email": email, "password": "s3cret"})
+        bad = await client.post("/api/login", json={"email": email, "password": "wrong"})
+        token = create_access_token({"sub": email})
+        me = await client.get("/api/users/me", headers={"Authorization": f"Bearer {token}"})
+        return register, duplicate, login, bad, me
+
+    (register, duplicate, login, bad, me), statements = run_async_mode(scenario)
+
+    assert register.status_code == 200
+    assert duplicate.status_code == 400
+    assert login.status_code == 200
+    assert bad.status_code == 401
+    assert me.json()["email"] == email
+    assert statements > 0
+    print("✅ Passed")
+
+
+def test_chat_releases_connection_during_openai_calls():
+    """Test 4: Chats Hold No Connection While OpenAI Answers"""
+    print("Test 4: Chats Hold No Connection While OpenAI Answers")
+    _, headers = create_user()
+    checked_out = []
+
+    def reply(body: dict) -> dict:
+        checked_out.append(active_engine().pool.checkedout())
+        return default_reply(body)
+
+    server = FakeOpenAIServer(reply=reply).start()
+
+    async def scenario(client, mode: str):
+        async with using_openai_server(server):
+            first = await client.post("/api/chat", json={"message": f"add {mode} milk"}, headers=headers)
+            conversation_id = first.json()["conversation_id"]
+            follow_up = await client.post(
+                "/api/chat", json={"message": "thanks", "conversation_id": conversation_id}, headers=headers
+            )
+            stream = await client.post(
+                "/api/chat/stream", json={"message": f"add {mode} eggs", "conversation_id": conversation_id}, headers=headers
+            )
+            return first, follow_up, stream
+
+    async def sync_mode():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await scenario(client, "sync")
+
+    try:
+        sync_responses = asyncio.run(sync_mode())
+        async_responses, _ = run_async_mode(lambda client: scenario(client, "async"))
+    finally:
+        server.stop()
+
+    for first, follow_up, stream in (sync_responses, async_responses):
+        assert first.status_code == follow_up.status_code == stream.status_code == 200
+        assert "event: done" in stream.text
+    # Two calls per tool turn, one for the plain follow-up, in both modes
+    assert checked_out == [0] * 10, checked_out
+    print("✅ Passed")
+
+
+def test_sync_sessions_close_off_the_loop():
+    """Test 5: Sync Sessions Are Released Off The Event Loop"""
+    print("Test 5: Sync Sessions Are Released Off The Event Loop")
+    task = Task(title="off the loop")
+    _, headers = create_user([task])
+    loop_threads, pool_threads = [], []
+
+    def record(*args):
+        pool_threads.append(threading.get_ident())
+
+    async def scenario():
+        loop_threads.append(threading.get_ident())
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return [
+                await client.get("/api/tasks", headers=headers),
+                await client.get("/api/tasks/stats", headers=headers),
+                await client.get(f"/api/tasks/{task.id}", headers=headers),
+            ]
+
+    # The default (sync) mode, whatever DB_ASYNC the suite runs with
+    original = database.DB_ASYNC
+    database.DB_ASYNC = False
+    event.listen(engine, "reset", record)
+    event.listen(engine, "checkin", record)
+    try:
+        responses = asyncio.run(scenario())
+    finally:
+        event.remove(engine, "reset", record)
+        event.remove(engine, "checkin", record)
+        database.DB_ASYNC = original
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert pool_threads and loop_threads[0] not in pool_threads
+    print("✅ Passed")
+
+
+def test_chat_in_async_mode():
+    """Edge Case: Chat Tool Calls In Async Mode"""
+    print("Edge Case: Chat Tool Calls In Async Mode")
+    _, headers = create_user()
+    server = FakeOpenAIServer().start()
+
+    async def scenario(client):
+        async with using_openai_server(server):
+            chat = await client.post("/api/chat", json={"message": "add async milk"}, headers=headers)
+            listed = await client.post(
+                "/api/chat",
+                json={"message": "list", "conversation_id": chat.json()["conversation_id"]},
+                headers=headers
+            )
+            return chat, listed
+
+    try:
+        (chat, listed), statements = run_async_mode(scenario)
+    finally:
+        server.stop()
+
+    assert chat.status_code == 200
+    assert chat.json()["response"] == "Task 'async milk' created successfully"
+    assert listed.json()["tool_calls"][0]["result"]["tasks"][0]["title"] == "async milk"
+    assert statements > 0
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running async database mode tests...\n")
+
+    test_async_url_mapping()
+    test_task_routes_in_async_mode()
+    test_auth_routes_in_async_mode()
+    test_chat_releases_connection_during_openai_calls()
+    test_sync_sessions_close_off_the_loop()
+    test_chat_in_async_mode()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Test script for the connection pool settings and pool metrics."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+import tempfile
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+
+from src.backend import database
+from src.backend.main import app
+from src.backend.database import create_tables
+from src.backend.pool_metrics import TimedQueuePool, install_idle_ping, pool_stats
+
+create_tables()
+client = TestClient(app)
+
+
+def timed_engine(**kwargs):
+    """A small SQLite engine on the timed pool."""
+    return create_engine(
+        f"sqlite:///{tempfile.mkdtemp()}/pool.db",
+        poolclass=TimedQueuePool,
+        **kwargs
+    )
+
+
+def test_postgres_engine_options():
+    """Test 1: Postgres Engine Options From Settings"""
+    print("Test 1: Postgres Engine Options From Settings")
+    original = (database.DB_POOL_SIZE, database.DB_POOL_PRE_PING, database.DB_STATEMENT_TIMEOUT_MS)
+    database.DB_POOL_SIZE = 3
+    database.DB_POOL_PRE_PING = "always"
+    database.DB_STATEMENT_TIMEOUT_MS = 5000
+    try:
+        sync_options = database.postgres_engine_options()
+        async_options = database.postgres_engine_options(async_driver=True)
+    finally:
+        database.DB_POOL_SIZE, database.DB_POOL_PRE_PING, database.DB_STATEMENT_TIMEOUT_MS = original
+
+    assert sync_options["pool_size"] == 3
+    assert sync_options["pool_pre_ping"] is True
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+    assert async_options["poolclass"].__name__ == "TimedAsyncQueuePool"
+    print("✅ Passed")
+
+
+def test_pool_gauges():
+    """Test 2: Pool Gauges Track Checkouts"""
+    print("Test 2: Pool Gauges Track Checkouts")
+    engine = timed_engine(pool_size=2, max_overflow=1)
+    connections = [engine.connect() for _ in range(3)]
+    busy = pool_stats(engine)
+    for connection in connections:
+        connection.close()
+    idle = pool_stats(engine)
+
+    assert busy["checked_out"] == 3
+    assert busy["overflow"] == 1
+    assert busy["checkouts"] == 3
+    assert idle["checked_out"] == 0
+    assert idle["checked_in"] == 2
+    print("✅ Passed")
+
+
+def test_pool_timeout_counted():
+    """Test 3: Pool Timeouts Counted With Wait Time"""
+    print("Test 3: Pool Timeouts Counted With Wait Time")
+    engine = timed_engine(pool_size=1, max_overflow=0, pool_timeout=0.1)
+    held = engine.connect()
+    try:
+        engine.connect()
+        assert False, "expected a pool timeout"
+    except exc.TimeoutError:
+        pass
+    finally:
+        held.close()
+
+    stats = pool_stats(engine)
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_max"] >= 100
+    print("✅ Passed")
+
+
+def test_metrics_endpoint_reports_pool():
+    """Test 4: Metrics Endpoint Reports Pool"""
+    print("Test 4: Metrics Endpoint Reports Pool")
+    _, headers = create_user()
+    response = client.get("/api/metrics", headers=headers)
+    db_pool = response.json()["data"]["db_pool"]
+
+    assert response.status_code == 200
+    assert db_pool["pool"] == "QueuePool"
+    assert "checked_out" in db_pool
+    print("✅ Passed")
+
+
+def test_idle_ping_replaces_dead_connection():
+    """Edge Case: Idle Ping Replaces Dead Connection"""
+    print("Edge Case: Idle Ping Replaces Dead Connection")
+    engine = timed_engine(pool_size=1, max_overflow=0)
+    install_idle_ping(engine, idle_seconds=0)
+
+    with engine.connect() as connection:
+        first = connection.connection.dbapi_connection
+    # Simulate the server dropping the pooled connection
+    first.close()
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+        assert connection.connection.dbapi_connection is not first
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running connection pool tests...\n")
+
+    test_postgres_engine_options()
+    test_pool_gauges()
+    test_pool_timeout_counted()
+    test_metrics_endpoint_reports_pool()
+    test_idle_ping_replaces_dead_connection()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Test script for the OpenAI completion cache (memory and disk tiers, per-call opt-out)."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user, run_with_server, using_cache
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+import openai
+
+from src.backend import completion_cache, openai_client
+from src.backend.completion_cache import CompletionCache, completion_key
+from src.backend.main import app
+from src.backend.database import create_tables
+from src.openai_config import OpenAIConfig, OpenAIManager
+from fake_openai import FakeOpenAIServer
+
+create_tables()
+
+
+def test_identical_chats_hit_the_cache():
+    """Test 1: Identical Chat Requests Are Answered From The Cache"""
+    print("Test 1: Identical Chat Requests Are Answered From The Cache")
+    _, headers = create_user()
+    server = FakeOpenAIServer().start()
+
+    async def two_new_chats():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.post("/api/chat", json={"message": "what can you do?"}, headers=headers)
+            second = await client.post("/api/chat", json={"message": "what can you do?"}, headers=headers)
+            stats = (await client.get("/api/metrics", headers=headers)).json()["data"]["openai_cache"]
+            return first, second, stats
+
+    try:
+        with using_cache(completion_cache, CompletionCache(maxsize=10, ttl=60)):
+            first, second, stats = run_with_server(server, two_new_chats)
+    finally:
+        server.stop()
+
+    assert first.json()["response"] == second.json()["response"] == "You said: what can you do?"
+    assert first.json()["conversation_id"] != second.json()["conversation_id"]
+    assert len(server.requests) == 1
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["size"] == 1
+    print("✅ Passed")
+
+
+def test_keys_cover_every_parameter():
+    """Test 2: Keys Cover Model, Messages, Tools And Parameters"""
+    print("Test 2: Keys Cover Model, Messages, Tools And Parameters")
+    base = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "tools": [], "max_tokens": 5}
+    key = completion_key(base)
+
+    assert completion_key(dict(reversed(list(base.items())))) == key
+    assert completion_key({**base, "model": "other"}) != key
+    assert completion_key({**base, "messages": [{"role": "user", "content": "hi!"}]}) != key
+    assert completion_key({**base, "tools": [{"type": "function"}]}) != key
+    assert completion_key({**base, "max_tokens": 6}) != key
+    assert completion_key({**base, "temperature": 0}) != key
+    print("✅ Passed")
+
+
+def test_ttl_lru_and_disk_tier():
+    """Test 3: TTL, LRU Eviction And The Disk Tier"""
+    print("Test 3: TTL, LRU Eviction And The Disk Tier")
+    path = os.path.join(tempfile.mkdtemp(), "completions.db")
+
+    memory = CompletionCache(maxsize=2, ttl=60)
+    for name in ["a", "b"]:
+        memory.set(name, {"content": name})
+    memory.get("a")  # "b" is now least recently used
+    memory.set("c", {"content": "c"})
+    assert memory.get("b") is None and memory.get("a") == {"content": "a"}
+    assert memory.stats()["evictions"] == 1
+
+    cache = CompletionCache(maxsize=2, ttl=60, path=path)
+    for name in ["a", "b", "c"]:
+        cache.set(name, {"content": name})
+    assert cache.stats()["disk"]["size"] == 2 and cache.stats()["disk"]["evictions"] == 1
+    assert "path" not in cache.stats()["disk"]
+
+    # A new process (or another worker) finds entries on disk
+    restarted = CompletionCache(maxsize=2, ttl=60, path=path)
+    assert restarted.get("a") is None
+    assert restarted.get("c") == {"content": "c"}
+    assert restarted.get("c") == {"content": "c"}
+    assert restarted.stats()["disk_hits"] == 1
+
+    short = CompletionCache(maxsize=2, ttl=0.05, path=os.path.join(tempfile.mkdtemp(), "short.db"))
+    short.set("x", {"content": "x"})
+    time.sleep(0.06)
+    assert short.get("x") is None
+    assert not CompletionCache(ttl=0).enabled
+    print("✅ Passed")
+
+
+def test_per_call_opt_out_and_manager():
+    """Test 4: Per-Call Opt-Out, Also In OpenAIManager"""
+    print("Test 4: Per-Call Opt-Out, Also In OpenAIManager")
+    server = FakeOpenAIServer().start()
+    messages = [{"role": "user", "content": "tip please"}]
+
+    async def scenario():
+        cached = [await openai_client.chat_with_ai(messages, "1") for _ in range(2)]
+        fresh = [await openai_client.chat_with_ai(messages, "1", cache=False) for _ in range(2)]
+        return cached, fresh
+
+    original_base_url, original_key = openai.base_url, openai.api_key
+    try:
+        with using_cache(completion_cache, CompletionCache(maxsize=10, ttl=60)):
+            cached, fresh = run_with_server(server, scenario)
+            chat_requests = len(server.requests)
+
+            openai.base_url, openai.api_key = server.base_url, "test-key"
+            manager = OpenAIManager(OpenAIConfig(api_keys=["test-key"], rpm_limit=6000))
+            tips = [manager.chat_completion(messages) for _ in range(3)]
+            manager.chat_completion(messages, cache=False)
+    finally:
+        openai.base_url, openai.api_key = original_base_url, original_key
+        server.stop()
+
+    assert cached[0]["content"] == cached[1]["content"] == "You said: tip please"
+    assert fresh[0]["content"] == "You said: tip please"
+    assert chat_requests == 3
+    assert tips == ["You said: tip please"] * 3
+    assert manager.get_usage_summary()["cache_hits"] == 2
+    assert len(server.requests) == 3 + 2
+    print("✅ Passed")
+
+
+def test_cli_needs_no_backend_packages():
+    """Test 5: The CLI Imports Without The Backend's Packages"""
+    print("Test 5: The CLI Imports Without The Backend's Packages")
+    # pyproject.toml only declares openai and python-dotenv
+    script = (
+        "import sys\n"
+        "for name in ('fastapi', 'orjson', 'sqlalchemy', 'sqlmodel', 'starlette'):\n"
+        "    sys.modules[name] = None\n"
+        "import src.main\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    print("✅ Passed")
+
+
+def test_failures_are_not_cached():
+    """Edge Case: Failed Requests Are Not Cached"""
+    print("Edge Case: Failed Requests Are Not Cached")
+    attempts = []
+
+    def flaky(body: dict) -> dict:
+        attempts.append(body)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream failure")
+        return {"role": "assistant", "content": "ok"}
+
+    server = FakeOpenAIServer(reply=flaky).start()
+    messages = [{"role": "user", "content": "hello"}]
+
+    async def scenario():
+        failed = await openai_client.chat_with_ai(messages, "1")
+        return failed, await openai_client.chat_with_ai(messages, "1"), await openai_client.chat_with_ai(messages, "1")
+
+    try:
+        with using_cache(completion_cache, CompletionCache(maxsize=10, ttl=60)) as cache:
+            failed, retried, cached = run_with_server(server, scenario)
+    finally:
+        server.stop()
+
+    assert "error" in failed
+    assert retried["content"] == cached["content"] == "ok"
+    assert len(attempts) == 2
+    assert cache.stats()["size"] == 1
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running OpenAI completion cache tests...\n")
+
+    test_identical_chats_hit_the_cache()
+    test_keys_cover_every_parameter()
+    test_ttl_lru_and_disk_tier()
+    test_per_call_opt_out_and_manager()
+    test_cli_needs_no_backend_packages()
+    test_failures_are_not_cached()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
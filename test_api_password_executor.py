@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Test script for running bcrypt in the bounded password executor."""
+
+# Test database and settings; imported before anything from src
+import api_testing
+
+import asyncio
+import time
+from uuid import uuid4
+from fastapi.testclient import TestClient
+
+from src.backend import auth
+from src.backend.main import app
+from src.backend.database import create_tables
+
+create_tables()
+client = TestClient(app)
+
+
+def test_register_and_login():
+    """Test 1: Register And Login Through Executor"""
+    print("Test 1: Register And Login Through Executor")
+    email = f"{uuid4().hex}@example.com"
+    register = client.post("/api/register", json={"email": email, "username": email, "password": "s3cret"})
+    good = client.post("/api/login", json={"email": email, "password": "s3cret"})
+    bad = client.post("/api/login", json={"email": email, "password": "wrong"})
+
+    assert register.status_code == 200
+    assert good.status_code == 200
+    assert "access_token" in good.json()
+    assert bad.status_code == 401
+    print("✅ Passed")
+
+
+def test_saturated_executor_returns_503():
+    """Test 2: Saturated Executor Returns 503"""
+    print("Test 2: Saturated Executor Returns 503")
+    original = auth.PASSWORD_HASH_MAX_PENDING
+    auth.PASSWORD_HASH_MAX_PENDING = 0
+    try:
+        response = client.post("/api/login", json={"email": "nobody@example.com", "password": "x"})
+        email = f"{uuid4().hex}@example.com"
+        register = client.post("/api/register", json={"email": email, "username": email, "password": "x"})
+    finally:
+        auth.PASSWORD_HASH_MAX_PENDING = original
+
+    # Unknown users never reach bcrypt, so they still get a normal 401
+    assert response.status_code == 401
+    assert register.status_code == 503
+    assert register.headers["Retry-After"] == "1"
+    print("✅ Passed")
+
+
+def test_hashing_does_not_block_event_loop():
+    """Test 3: Hashing Does Not Block Event Loop"""
+    print("Test 3: Hashing Does Not Block Event Loop")
+
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        ticker_task = asyncio.create_task(ticker())
+        await asyncio.gather(*[auth.get_password_hash_async("password") for _ in range(4)])
+        ticker_task.cancel()
+        return max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    # A single bcrypt round takes far longer than this if it ran on the loop
+    assert asyncio.run(scenario()) < 0.1
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running password executor tests...\n")
+
+    test_register_and_login()
+    test_saturated_executor_returns_503()
+    test_hashing_does_not_block_event_loop()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Query-plan regression tests: the hot task queries must stay on their indexes."""
+
+# Test database and settings; imported before anything from src
+from api_testing import captured_statements, create_user
+
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+from sqlmodel import Session
+
+from src.backend.database import create_tables, engine
+from src.backend.models import Task
+from src.backend.task_queries import backfill_task_stats, get_task_page, read_task_stats
+
+create_tables()
+
+
+def create_user_with_tasks(count: int) -> int:
+    """Create a user with a spread of tasks and return the user ID."""
+    base = datetime(2025, 1, 1)
+    user_id, _ = create_user(
+        Task(
+            title=f"Task {i}",
+            completed=(i % 2 == 0),
+            due_date=(base + timedelta(days=i)).date().isoformat(),
+            created_at=base + timedelta(minutes=i)
+        )
+        for i in range(count)
+    )
+    with Session(engine) as session:
+        # The tasks bypass the counters; fill them in as create_tables() would
+        backfill_task_stats(session)
+        # Give the planner real statistics, as a production database would have
+        session.execute(text("ANALYZE"))
+        session.commit()
+    return user_id
+
+
+def query_plan(statement: str, parameters) -> str:
+    """EXPLAIN QUERY PLAN for a captured statement, as one string."""
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def plan_for(query, marker: str) -> str:
+    """Run query(session) and return the plan of the first captured statement containing marker."""
+    with captured_statements() as statements:
+        with Session(engine) as session:
+            query(session)
+
+    statement, parameters = next((s, p) for s, p in statements if marker in s)
+    return query_plan(statement, parameters)
+
+
+USER_ID = create_user_with_tasks(200)
+
+
+def test_task_page_uses_keyset_index():
+    """Test 1: Task Page Uses Keyset Index"""
+    print("Test 1: Task Page Uses Keyset Index")
+    plan = plan_for(lambda s: get_task_page(s, USER_ID, limit=20), "FROM tasks")
+
+    assert "ix_tasks_user_id_created_at_id" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+    print("✅ Passed")
+
+
+def test_status_filter_uses_completed_index():
+    """Test 2: Status Filter Uses Completed Index"""
+    print("Test 2: Status Filter Uses Completed Index")
+    for completed in (True, False):
+        plan = plan_for(lambda s: get_task_page(s, USER_ID, limit=20, completed=completed), "FROM tasks")
+
+        assert "ix_tasks_user_id_completed_created_at_id" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+    print("✅ Passed")
+
+
+def test_due_date_counts_use_covering_index():
+    """Test 3: Due-Date Counts Use Covering Index"""
+    print("Test 3: Due-Date Counts Use Covering Index")
+    plan = plan_for(lambda s: read_task_stats(s, USER_ID, today=date(2025, 3, 1)), "due_date <")
+
+    assert "COVERING INDEX ix_tasks_user_id_due_date_completed" in plan, plan
+    print("✅ Passed")
+
+
+def test_cursor_page_stays_on_index():
+    """Edge Case: Later Pages Stay On The Index"""
+    print("Edge Case: Later Pages Stay On The Index")
+    with Session(engine) as session:
+        _, cursor = get_task_page(session, USER_ID, limit=20, completed=False)
+    plan = plan_for(
+        lambda s: get_task_page(s, USER_ID, limit=20, completed=False, cursor=cursor), "FROM tasks"
+    )
+
+    assert "ix_tasks_user_id_completed_created_at_id" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running query plan tests...\n")
+
+    test_task_page_uses_keyset_index()
+    test_status_filter_uses_completed_index()
+    test_due_date_counts_use_covering_index()
+    test_cursor_page_stays_on_index()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
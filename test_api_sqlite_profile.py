@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Test script for the SQLite performance profile PRAGMAs."""
+
+# Test database and settings; imported before anything from src
+import api_testing
+
+import tempfile
+import asyncio
+from sqlalchemy import create_engine, text
+
+from src.backend import database
+from src.backend.database import apply_sqlite_pragmas, engine
+
+
+def read_pragmas(connection) -> dict:
+    """Read back the PRAGMAs the profile sets."""
+    return {
+        name: connection.execute(text(f"PRAGMA {name}")).scalar()
+        for name in ["journal_mode", "synchronous", "busy_timeout", "temp_store", "cache_size"]
+    }
+
+
+def test_app_engine_uses_profile():
+    """Test 1: App Engine Uses Profile"""
+    print("Test 1: App Engine Uses Profile")
+    with engine.connect() as connection:
+        pragmas = read_pragmas(connection)
+
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["synchronous"] == 1  # NORMAL
+    assert pragmas["busy_timeout"] == database.SQLITE_BUSY_TIMEOUT_MS
+    assert pragmas["temp_store"] == 2  # MEMORY
+    assert pragmas["cache_size"] == database.SQLITE_CACHE_SIZE
+    print("✅ Passed")
+
+
+def test_async_engine_uses_profile():
+    """Test 2: Async Engine Uses Profile"""
+    print("Test 2: Async Engine Uses Profile")
+
+    async def read():
+        async_engine = database.get_async_engine()
+        try:
+            async with async_engine.connect() as connection:
+                return await connection.run_sync(read_pragmas)
+        finally:
+            await async_engine.dispose()
+
+    pragmas = asyncio.run(read())
+    assert pragmas["journal_mode"] == "wal"
+    assert pragmas["synchronous"] == 1
+    print("✅ Passed")
+
+
+def test_profile_is_opt_in_per_engine():
+    """Edge Case: Engines Without The Profile Keep SQLite Defaults"""
+    print("Edge Case: Engines Without The Profile Keep SQLite Defaults")
+    directory = tempfile.mkdtemp()
+    plain = create_engine(f"sqlite:///{directory}/plain.db")
+    tuned = create_engine(f"sqlite:///{directory}/tuned.db")
+    apply_sqlite_pragmas(tuned)
+
+    with plain.connect() as connection:
+        assert read_pragmas(connection)["journal_mode"] == "delete"
+    with tuned.connect() as connection:
+        assert read_pragmas(connection)["journal_mode"] == "wal"
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running SQLite profile tests...\n")
+
+    test_app_engine_uses_profile()
+    test_async_engine_uses_profile()
+    test_profile_is_opt_in_per_engine()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Test script for POST /api/tasks/batch."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.task_queries import MAX_BATCH_SIZE, count_task_stats
+
+create_tables()
+client = TestClient(app)
+
+
+def batch(headers: dict, operations: list, atomic: bool = False):
+    return client.post("/api/tasks/batch", json={"operations": operations, "atomic": atomic}, headers=headers)
+
+
+def assert_counters_match(user_id: int, headers: dict) -> None:
+    """The maintained counters agree with a fresh count over the tasks table."""
+    stats = client.get("/api/tasks/stats", headers=headers).json()["data"]
+    with Session(engine) as session:
+        expected = count_task_stats(session, user_id)
+    for field in ("total", "completed", "active", "byPriority"):
+        assert stats[field] == expected[field], field
+
+
+def test_batch_create():
+    """Test 1: Batch Create"""
+    print("Test 1: Batch Create")
+    user_id, headers = create_user()
+    response = batch(headers, [
+        {"op": "create", "task": {"title": "one", "priority": "high", "tags": ["work"]}},
+        {"op": "create", "task": {"title": "two"}},
+        {"op": "create", "task": {"title": "three", "completed": True}}
+    ])
+    data = response.json()["data"]
+
+    assert response.status_code == 200
+    assert data["applied"] == 3
+    assert [r["data"]["title"] for r in data["results"]] == ["one", "two", "three"]
+    assert all(r["data"]["id"] for r in data["results"])
+    assert data["results"][0]["data"]["tags"] == ["work"]
+    assert_counters_match(user_id, headers)
+    print("✅ Passed")
+
+
+def test_mixed_operations_with_failures():
+    """Test 2: Mixed Operations With Per-Item Failures"""
+    print("Test 2: Mixed Operations With Per-Item Failures")
+    user_id, headers = create_user()
+    created = batch(headers, [{"op": "create", "task": {"title": f"t{i}"}} for i in range(3)])
+    a, b, c = [r["data"]["id"] for r in created.json()["data"]["results"]]
+
+    response = batch(headers, [
+        {"op": "update", "id": a, "changes": {"title": "renamed", "priority": "low"}},
+        {"op": "toggle", "id": b},
+        {"op": "delete", "id": c},
+        {"op": "toggle", "id": c},
+        {"op": "delete", "id": 999999},
+        {"op": "create", "task": {"title": "bad", "priority": "urgent"}},
+        {"op": "archive", "id": a}
+    ])
+    data = response.json()["data"]
+
+    assert response.status_code == 200
+    assert [r["success"] for r in data["results"]] == [True, True, True, False, False, False, False]
+    assert [r["error"] for r in data["results"][3:]] == [
+        "Task not found", "Task not found",
+        "Priority must be high, medium, or low", "Unknown operation 'archive'"
+    ]
+    assert data["applied"] == 3 and data["failed"] == 4
+
+    titles = {t["id"]: t for t in client.get("/api/tasks", headers=headers).json()["data"]["tasks"]}
+    assert titles[a]["title"] == "renamed" and titles[a]["priority"] == "low"
+    assert titles[b]["completed"] is True
+    assert c not in titles
+    assert_counters_match(user_id, headers)
+    print("✅ Passed")
+
+
+def test_single_commit_no_per_row_reads():
+    """Test 3: One Commit And No Per-Row Reads"""
+    print("Test 3: One Commit And No Per-Row Reads")
+    _, headers = create_user()
+    commits = []
+    selects = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "commit", on_commit)
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        response = batch(headers, [{"op": "create", "task": {"title": f"bulk {i}"}} for i in range(50)])
+    finally:
+        event.remove(engine, "commit", on_commit)
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    assert response.json()["data"]["applied"] == 50
+    assert len(commits) == 1
+    # No session.get/refresh per task (INSERTs are only batched on Postgres;
+    # SQLite's RETURNING can't guarantee row order, so the ORM sends one each)
+    assert len(selects) < 5
+    print("✅ Passed")
+
+
+def test_atomic_batch_rolls_back():
+    """Test 4: Atomic Batch Rolls Back On Failure"""
+    print("Test 4: Atomic Batch Rolls Back On Failure")
+    user_id, headers = create_user()
+    response = batch(headers, [
+        {"op": "create", "task": {"title": "kept?"}},
+        {"op": "toggle", "id": 999999}
+    ], atomic=True)
+    detail = response.json()["detail"]
+
+    assert response.status_code == 400
+    assert [r["error"] for r in detail["results"]] == ["Not applied", "Task not found"]
+    assert client.get("/api/tasks", headers=headers).json()["data"]["tasks"] == []
+    assert_counters_match(user_id, headers)
+    print("✅ Passed")
+
+
+def test_invalid_changes_fail_per_item():
+    """Test 5: Invalid Update Changes Fail Per Item"""
+    print("Test 5: Invalid Update Changes Fail Per Item")
+    user_id, headers = create_user()
+    created = batch(headers, [{"op": "create", "task": {"title": "keep", "priority": "high"}}])
+    [task_id] = [r["data"]["id"] for r in created.json()["data"]["results"]]
+
+    response = batch(headers, [
+        {"op": "update", "id": task_id, "changes": {"title": None}},
+        {"op": "update", "id": task_id, "changes": {"completed": None}},
+        {"op": "update", "id": task_id, "changes": {"priority": "bogus"}},
+        {"op": "update", "id": task_id, "changes": {"due_date": None, "tags": ["ok"]}}
+    ])
+    data = response.json()["data"]
+
+    assert response.status_code == 200
+    assert [r["error"] for r in data["results"]] == [
+        "Title cannot be null", "Completed cannot be null", "Priority must be high, medium, or low", None
+    ]
+    [task] = client.get("/api/tasks", headers=headers).json()["data"]["tasks"]
+    assert task["title"] == "keep" and task["priority"] == "high" and task["tags"] == ["ok"]
+    assert_counters_match(user_id, headers)
+    print("✅ Passed")
+
+
+def test_single_update_rejects_same_changes():
+    """Test 6: PUT Rejects The Same Changes As A Batch Update"""
+    print("Test 6: PUT Rejects The Same Changes As A Batch Update")
+    user_id, headers = create_user()
+    task_id = client.post("/api/tasks", json={"title": "keep", "priority": "high"}, headers=headers).json()["data"]["id"]
+
+    for changes, error in [
+        ({"title": None}, "Title cannot be null"),
+        ({"completed": None}, "Completed cannot be null"),
+        ({"priority": "urgent"}, "Priority must be high, medium, or low"),
+    ]:
+        response = client.put(f"/api/tasks/{task_id}", json=changes, headers=headers)
+        assert response.status_code == 400 and response.json()["detail"] == error, response.text
+
+    task = client.get(f"/api/tasks/{task_id}", headers=headers).json()["data"]
+    assert task["title"] == "keep" and task["priority"] == "high"
+    assert_counters_match(user_id, headers)
+    print("✅ Passed")
+
+
+def test_batch_size_limit():
+    """Edge Case: Batch Size Limit"""
+    print("Edge Case: Batch Size Limit")
+    _, headers = create_user()
+    response = batch(headers, [{"op": "create", "task": {"title": "x"}}] * (MAX_BATCH_SIZE + 1))
+
+    assert response.status_code == 400
+    assert client.get("/api/tasks", headers=headers).json()["data"]["tasks"] == []
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running batch endpoint tests...\n")
+
+    test_batch_create()
+    test_mixed_operations_with_failures()
+    test_single_commit_no_per_row_reads()
+    test_atomic_batch_rolls_back()
+    test_invalid_changes_fail_per_item()
+    test_single_update_rejects_same_changes()
+    test_batch_size_limit()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Test script for the shared read-through task cache (memory and Redis backends)."""
+
+# Test database and settings; imported before anything from src
+from api_testing import captured_statements, create_user, using_cache
+
+import asyncio
+import socket
+import httpx
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from fake_redis import FakeRedisServer
+from src.backend import database, task_cache
+from src.backend.task_cache import MemoryBackend, RedisBackend, TaskReadCache
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.openai_client import execute_function
+
+create_tables()
+client = TestClient(app)
+
+
+def titles(headers: dict) -> list:
+    return [t["title"] for t in client.get("/api/tasks", headers=headers).json()["data"]["tasks"]]
+
+
+def test_hits_skip_the_database():
+    """Test 1: Cache Hits Skip The Database"""
+    print("Test 1: Cache Hits Skip The Database")
+    _, headers = create_user()
+    client.post("/api/tasks", json={"title": "a"}, headers=headers)
+
+    with using_cache(task_cache, TaskReadCache(MemoryBackend(100, 30))) as cache:
+        first = client.get("/api/tasks", headers=headers)
+        first_stats = client.get("/api/tasks/stats", headers=headers)
+        with captured_statements() as statements:
+            second = client.get("/api/tasks", headers=headers)
+            second_stats = client.get("/api/tasks/stats", headers=headers)
+            not_modified = client.get("/api/tasks", headers={**headers, "If-None-Match": first.headers["ETag"]})
+
+    assert second.json() == first.json() and second.headers["ETag"] == first.headers["ETag"]
+    assert second_stats.json() == first_stats.json()
+    assert not_modified.status_code == 304
+    assert statements == []
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 2
+    print("✅ Passed")
+
+
+def test_every_write_invalidates():
+    """Test 2: Every Write Invalidates, Including The Assistant's"""
+    print("Test 2: Every Write Invalidates, Including The Assistant's")
+    user_id, headers = create_user()
+
+    with using_cache(task_cache, TaskReadCache(MemoryBackend(100, 30))):
+        assert titles(headers) == []
+        task_id = client.post("/api/tasks", json={"title": "a"}, headers=headers).json()["data"]["id"]
+        assert titles(headers) == ["a"]
+        client.put(f"/api/tasks/{task_id}", json={"title": "b"}, headers=headers)
+        assert titles(headers) == ["b"]
+        client.post("/api/tasks/batch", json={"operations": [{"op": "create", "task": {"title": "c"}}]}, headers=headers)
+        assert titles(headers) == ["b", "c"]
+        with Session(engine) as session:
+            execute_function("add_task", {"title": "d"}, str(user_id), db=session)
+        assert titles(headers) == ["b", "c", "d"]
+        assert client.get("/api/tasks/stats", headers=headers).json()["data"]["total"] == 3
+        client.delete(f"/api/tasks/{task_id}", headers=headers)
+        assert titles(headers) == ["c", "d"]
+        assert client.get("/api/tasks/stats", headers=headers).json()["data"]["total"] == 2
+    print("✅ Passed")
+
+
+def test_redis_backend_shared_between_workers():
+    """Test 3: Redis Backend Is Shared Between Workers"""
+    print("Test 3: Redis Backend Is Shared Between Workers")
+    server = FakeRedisServer().start()
+    try:
+        worker_a = TaskReadCache(RedisBackend(server.url), ttl=30)
+        worker_b = TaskReadCache(RedisBackend(server.url), ttl=30)
+        _, headers = create_user()
+        client.post("/api/tasks", json={"title": "a"}, headers=headers)
+
+        with using_cache(task_cache, worker_a):
+            assert titles(headers) == ["a"]
+        with using_cache(task_cache, worker_b):
+            assert titles(headers) == ["a"]
+            # A write handled by worker B...
+            client.post("/api/tasks", json={"title": "b"}, headers=headers)
+        with using_cache(task_cache, worker_a):
+            # ...is seen by worker A
+            assert titles(headers) == ["a", "b"]
+
+        assert worker_a.stats()["misses"] == 2 and worker_b.stats()["hits"] == 1
+        assert server.command_count("INCR") == 1
+        assert server.command_count("SET") == 2
+    finally:
+        server.stop()
+    print("✅ Passed")
+
+
+def test_ttl_size_bound_and_stale_stores():
+    """Test 4: TTL, Size Bound And Stale Stores"""
+    print("Test 4: TTL, Size Bound And Stale Stores")
+
+    async def scenario():
+        cache = TaskReadCache(MemoryBackend(maxsize=2, ttl=0.05), ttl=0.05)
+        for page in range(3):
+            _, key = await cache.lookup(1, "tasks", page)
+            await cache.store(key, b"page %d" % page)
+        size_bounded = cache.stats()
+
+        value, _ = await cache.lookup(1, "tasks", 2)
+        await asyncio.sleep(0.06)
+        expired, _ = await cache.lookup(1, "tasks", 2)
+
+        # A read that loaded before a write must not be served after it
+        _, key = await cache.lookup(2, "tasks")
+        cache.invalidate(2)
+        await cache.store(key, b"stale")
+        stale, _ = await cache.lookup(2, "tasks")
+        return size_bounded, value, expired, stale
+
+    size_bounded, value, expired, stale = asyncio.run(scenario())
+
+    assert size_bounded["size"] == 2 and size_bounded["evictions"] == 1
+    assert value == b"page 2"
+    assert expired is None
+    assert stale is None
+    print("✅ Passed")
+
+
+class RecordingRedisBackend(RedisBackend):
+    """RedisBackend that records whether each INCR ran on an event loop."""
+
+    def __init__(self, url: str):
+        super().__init__(url)
+        self.incr_on_loop = []
+
+    def incr(self, key: str) -> int:
+        try:
+            asyncio.get_running_loop()
+            self.incr_on_loop.append(True)
+        except RuntimeError:
+            self.incr_on_loop.append(False)
+        return super().incr(key)
+
+
+def test_async_mode_invalidates_off_the_loop():
+    """Test 5: With DB_ASYNC, Redis Invalidation Runs Off The Event Loop"""
+    print("Test 5: With DB_ASYNC, Redis Invalidation Runs Off The Event Loop")
+    server = FakeRedisServer().start()
+    backend = RecordingRedisBackend(server.url)
+    _, headers = create_user()
+
+    async def scenario():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as http:
+            async def listed():
+                response = await http.get("/api/tasks", headers=headers)
+                return [t["title"] for t in response.json()["data"]["tasks"]]
+
+            before = await listed()
+            await http.post("/api/tasks", json={"title": "a"}, headers=headers)
+            after = await listed()
+            await http.post("/api/tasks/batch", json={"operations": [{"op": "create", "task": {"title": "b"}}]}, headers=headers)
+            return before, after, await listed()
+
+    original = database.DB_ASYNC
+    database.DB_ASYNC = True
+    try:
+        with using_cache(task_cache, TaskReadCache(backend, ttl=30)):
+            before, after, batched = asyncio.run(scenario())
+    finally:
+        database.DB_ASYNC = original
+        # Connections belong to the loop that opened them
+        asyncio.run(database.get_async_engine().dispose())
+        server.stop()
+
+    # Each read right after a write already sees it
+    assert (before, after, batched) == ([], ["a"], ["a", "b"])
+    assert backend.incr_on_loop == [False, False]
+    print("✅ Passed")
+
+
+def test_backend_outage_fails_open():
+    """Edge Case: Backend Outage Fails Open"""
+    print("Edge Case: Backend Outage Fails Open")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    _, headers = create_user()
+
+    with using_cache(task_cache, TaskReadCache(RedisBackend(f"redis://127.0.0.1:{port}/0", timeout=0.1))):
+        client.post("/api/tasks", json={"title": "a"}, headers=headers)
+        response = client.get("/api/tasks", headers=headers)
+        stats = client.get("/api/metrics", headers=headers).json()["data"]["task_cache"]
+
+    assert response.status_code == 200
+    assert [t["title"] for t in response.json()["data"]["tasks"]] == ["a"]
+    assert stats["errors"] >= 2 and stats["hits"] == 0
+    # Backend addresses stay out of the metrics
+    assert stats["backend"] == "redis" and "host" not in stats and "port" not in stats
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running task cache tests...\n")
+
+    test_hits_skip_the_database()
+    test_every_write_invalidates()
+    test_redis_backend_shared_between_workers()
+    test_ttl_size_bound_and_stale_stores()
+    test_async_mode_invalidates_off_the_loop()
+    test_backend_outage_fails_open()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
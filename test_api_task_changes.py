@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Test script for delta sync via GET /api/tasks/changes."""
+
+# Test database and settings; imported before anything from src
+from api_testing import captured_statements, create_user
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.models import TaskChange
+
+create_tables()
+client = TestClient(app)
+
+
+def create_tasks(headers: dict, *titles) -> list:
+    return [
+        client.post("/api/tasks", json={"title": title}, headers=headers).json()["data"]["id"]
+        for title in titles
+    ]
+
+
+def changes(headers: dict, since=None, **params) -> dict:
+    if since:
+        params["since"] = since
+    response = client.get("/api/tasks/changes", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def test_initial_sync_returns_everything():
+    """Test 1: Initial Sync Returns Every Task"""
+    print("Test 1: Initial Sync Returns Every Task")
+    _, headers = create_user()
+    create_tasks(headers, "a", "b", "c")
+
+    first = changes(headers)
+    again = changes(headers, first["next_since"])
+
+    assert [t["title"] for t in first["tasks"]] == ["a", "b", "c"]
+    assert first["deleted"] == [] and first["has_more"] is False
+    assert again["tasks"] == [] and again["deleted"] == []
+    assert again["next_since"] == first["next_since"]
+    print("✅ Passed")
+
+
+def test_only_changes_and_tombstones():
+    """Test 2: Only Changed Tasks And Tombstones"""
+    print("Test 2: Only Changed Tasks And Tombstones")
+    _, headers = create_user()
+    a, b, c, d = create_tasks(headers, "a", "b", "c", "d")
+    since = changes(headers)["next_since"]
+
+    client.put(f"/api/tasks/{a}", json={"title": "a2"}, headers=headers)
+    client.patch(f"/api/tasks/{b}/toggle-complete", headers=headers)
+    client.delete(f"/api/tasks/{c}", headers=headers)
+    (e,) = create_tasks(headers, "e")
+    delta = changes(headers, since)
+
+    assert [t["id"] for t in delta["tasks"]] == [a, b, e]
+    assert delta["tasks"][0]["title"] == "a2" and delta["tasks"][1]["completed"] is True
+    assert delta["deleted"] == [c]
+    assert d not in [t["id"] for t in delta["tasks"]]
+    print("✅ Passed")
+
+
+def test_batch_writes_are_logged():
+    """Test 3: Batch Writes Are Logged"""
+    print("Test 3: Batch Writes Are Logged")
+    _, headers = create_user()
+    a, b = create_tasks(headers, "a", "b")
+    since = changes(headers)["next_since"]
+
+    client.post("/api/tasks/batch", json={"operations": [
+        {"op": "create", "task": {"title": "new"}},
+        {"op": "update", "id": a, "changes": {"priority": "high"}},
+        {"op": "delete", "id": b}
+    ]}, headers=headers)
+    delta = changes(headers, since)
+
+    assert sorted(t["title"] for t in delta["tasks"]) == ["a", "new"]
+    assert delta["deleted"] == [b]
+    print("✅ Passed")
+
+
+def test_paged_sync():
+    """Test 4: Paged Sync With has_more"""
+    print("Test 4: Paged Sync With has_more")
+    _, headers = create_user()
+    ids = create_tasks(headers, *[f"t{i}" for i in range(7)])
+
+    seen, since, calls = [], None, 0
+    while True:
+        page = changes(headers, since, limit=3)
+        seen += [t["id"] for t in page["tasks"]]
+        since, calls = page["next_since"], calls + 1
+        if not page["has_more"]:
+            break
+
+    assert seen == ids
+    assert calls == 3
+    print("✅ Passed")
+
+
+def test_repeated_change_to_latest_task():
+    """Test 5: A Task Changed Again After Syncing Is Seen Again"""
+    print("Test 5: A Task Changed Again After Syncing Is Seen Again")
+    _, headers = create_user()
+    (a,) = create_tasks(headers, "a")
+    since = changes(headers)["next_since"]
+
+    # The task holds the newest seq; its replacement row must not reuse it
+    for title in ("a2", "a3"):
+        client.put(f"/api/tasks/{a}", json={"title": title}, headers=headers)
+        delta = changes(headers, since)
+        assert [t["title"] for t in delta["tasks"]] == [title]
+        since = delta["next_since"]
+    print("✅ Passed")
+
+
+def test_sync_reads_only_new_log_rows():
+    """Test 6: Sync Reads The Log Index, Not The Task Table"""
+    print("Test 6: Sync Reads The Log Index, Not The Task Table")
+    _, headers = create_user()
+    create_tasks(headers, *[f"t{i}" for i in range(50)])
+    since = changes(headers)["next_since"]
+    (a,) = create_tasks(headers, "late")
+
+    with captured_statements() as statements:
+        delta = changes(headers, since)
+
+    assert [t["id"] for t in delta["tasks"]] == [a]
+    statement, parameters = next((s, p) for s, p in statements if "FROM task_changes" in s)
+    with engine.connect() as connection:
+        plan = "\n".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+    assert "ix_task_changes_user_id_seq" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+    print("✅ Passed")
+
+
+def test_reused_task_id_keeps_tombstone():
+    """Test 7: Another User's Task Reusing A Deleted ID Keeps The Tombstone"""
+    print("Test 7: Another User's Task Reusing A Deleted ID Keeps The Tombstone")
+    _, headers_a = create_user()
+    _, headers_b = create_user()
+    (a,) = create_tasks(headers_a, "a")
+    since = changes(headers_a)["next_since"]
+
+    client.delete(f"/api/tasks/{a}", headers=headers_a)
+    # SQLite hands the highest task ID out again once that task is deleted
+    (b,) = create_tasks(headers_b, "b")
+    assert b == a
+
+    delta = changes(headers_a, since)
+    assert delta["tasks"] == [] and delta["deleted"] == [a]
+    assert [t["title"] for t in changes(headers_b)["tasks"]] == ["b"]
+    print("✅ Passed")
+
+
+def test_invalid_token_and_backfill():
+    """Edge Case: Invalid Token And Tasks Predating The Log"""
+    print("Edge Case: Invalid Token And Tasks Predating The Log")
+    _, headers = create_user()
+    create_tasks(headers, "old 1", "old 2")
+
+    bad = client.get("/api/tasks/changes", params={"since": "not-a-token"}, headers=headers)
+    assert bad.status_code == 400
+
+    # Recreate the log as on first deploy: existing tasks are seeded into it
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE {TaskChange.__tablename__}"))
+    create_tables()
+
+    assert [t["title"] for t in changes(headers)["tasks"]] == ["old 1", "old 2"]
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running delta sync tests...\n")
+
+    test_initial_sync_returns_everything()
+    test_only_changes_and_tombstones()
+    test_batch_writes_are_logged()
+    test_paged_sync()
+    test_repeated_change_to_latest_task()
+    test_sync_reads_only_new_log_rows()
+    test_reused_task_id_keeps_tombstone()
+    test_invalid_token_and_backfill()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Test script for ETag / If-None-Match on the task read endpoints."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+
+create_tables()
+client = TestClient(app)
+
+
+def conditional_get(url: str, headers: dict, etag: str, **params):
+    return client.get(url, params=params, headers={**headers, "If-None-Match": etag})
+
+
+def test_unchanged_list_returns_304():
+    """Test 1: Unchanged List Returns 304"""
+    print("Test 1: Unchanged List Returns 304")
+    _, headers = create_user()
+    client.post("/api/tasks", json={"title": "poll me"}, headers=headers)
+
+    first = client.get("/api/tasks", headers=headers)
+    etag = first.headers["ETag"]
+    second = conditional_get("/api/tasks", headers, etag)
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+    print("✅ Passed")
+
+
+def test_every_write_changes_etag():
+    """Test 2: Every Write Changes The ETag"""
+    print("Test 2: Every Write Changes The ETag")
+    _, headers = create_user()
+    task_id = client.post("/api/tasks", json={"title": "a"}, headers=headers).json()["data"]["id"]
+
+    writes = [
+        lambda: client.put(f"/api/tasks/{task_id}", json={"title": "renamed"}, headers=headers),
+        lambda: client.patch(f"/api/tasks/{task_id}/toggle-complete", headers=headers),
+        lambda: client.post("/api/tasks/batch", json={"operations": [{"op": "create", "task": {"title": "b"}}]}, headers=headers),
+        lambda: client.delete(f"/api/tasks/{task_id}", headers=headers),
+    ]
+    seen = {client.get("/api/tasks", headers=headers).headers["ETag"]}
+    for write in writes:
+        etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+        write()
+        assert conditional_get("/api/tasks", headers, etag).status_code == 200
+        seen.add(client.get("/api/tasks", headers=headers).headers["ETag"])
+
+    assert len(seen) == len(writes) + 1
+    print("✅ Passed")
+
+
+def test_etag_depends_on_query():
+    """Test 3: ETag Depends On Query Parameters"""
+    print("Test 3: ETag Depends On Query Parameters")
+    _, headers = create_user()
+    client.post("/api/tasks", json={"title": "a"}, headers=headers)
+
+    all_etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+    active = conditional_get("/api/tasks", headers, all_etag, filter="active")
+
+    assert active.status_code == 200
+    assert active.headers["ETag"] != all_etag
+    print("✅ Passed")
+
+
+def test_task_detail_etag():
+    """Test 4: Task Detail ETag"""
+    print("Test 4: Task Detail ETag")
+    _, headers = create_user()
+    task_id = client.post("/api/tasks", json={"title": "a"}, headers=headers).json()["data"]["id"]
+
+    etag = client.get(f"/api/tasks/{task_id}", headers=headers).headers["ETag"]
+    unchanged = conditional_get(f"/api/tasks/{task_id}", headers, etag)
+    client.patch(f"/api/tasks/{task_id}/toggle-complete", headers=headers)
+    changed = conditional_get(f"/api/tasks/{task_id}", headers, etag)
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.json()["data"]["completed"] is True
+    print("✅ Passed")
+
+
+def test_304_loads_no_task_rows():
+    """Test 5: 304 Loads No Task Rows"""
+    print("Test 5: 304 Loads No Task Rows")
+    _, headers = create_user()
+    client.post("/api/tasks", json={"title": "a"}, headers=headers)
+    etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = conditional_get("/api/tasks", headers, etag)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 304
+    assert not any("FROM tasks" in statement for statement in statements), statements
+    print("✅ Passed")
+
+
+def test_get_without_counters_writes_nothing():
+    """Test 6: A GET For A User Without Counters Writes Nothing"""
+    print("Test 6: A GET For A User Without Counters Writes Nothing")
+    _, headers = create_user()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        first = client.get("/api/tasks", headers=headers)
+        second = conditional_get("/api/tasks", headers, first.headers["ETag"])
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert first.status_code == 200 and second.status_code == 304
+    assert not any(statement.lstrip().upper().startswith(("INSERT", "UPDATE")) for statement in statements), statements
+
+    client.post("/api/tasks", json={"title": "a"}, headers=headers)
+    assert conditional_get("/api/tasks", headers, first.headers["ETag"]).status_code == 200
+    print("✅ Passed")
+
+
+def test_if_none_match_lists_and_wildcard():
+    """Edge Case: If-None-Match Lists, Strong Form And Wildcard"""
+    print("Edge Case: If-None-Match Lists, Strong Form And Wildcard")
+    _, headers = create_user()
+    etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+    strong = etag.removeprefix("W/")
+
+    assert conditional_get("/api/tasks", headers, f'"other", {etag}').status_code == 304
+    assert conditional_get("/api/tasks", headers, strong).status_code == 304
+    assert conditional_get("/api/tasks", headers, "*").status_code == 304
+    assert conditional_get("/api/tasks", headers, '"stale"').status_code == 200
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running ETag tests...\n")
+
+    test_unchanged_list_returns_304()
+    test_every_write_changes_etag()
+    test_etag_depends_on_query()
+    test_task_detail_etag()
+    test_304_loads_no_task_rows()
+    test_get_without_counters_writes_nothing()
+    test_if_none_match_lists_and_wildcard()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
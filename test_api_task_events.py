@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Test script for the task change WebSocket (/api/tasks/events) and its event bus."""
+
+# Test database and settings; imported before anything from src
+from api_testing import add_tasks, create_user
+
+import asyncio
+import threading
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from starlette.websockets import WebSocketDisconnect
+
+from src.backend import database
+from src.backend.main import app
+from src.backend.database import active_engine, create_tables, engine
+from src.backend.openai_client import apply_function, execute_function
+from src.backend.task_events import TaskEventBus
+
+create_tables()
+client = TestClient(app)
+
+
+def create_user_token() -> tuple:
+    """Create a user and return (user_id, access token)."""
+    user_id, headers = create_user()
+    return user_id, headers["Authorization"].removeprefix("Bearer ")
+
+
+def auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def subscribe(token: str):
+    return client.websocket_connect(f"/api/tasks/events?token={token}")
+
+
+def test_rejects_bad_token():
+    """Test 1: Rejects A Bad Token"""
+    print("Test 1: Rejects A Bad Token")
+    try:
+        with subscribe("not-a-token") as socket:
+            socket.receive_json()
+        assert False, "connection should have been refused"
+    except WebSocketDisconnect as e:
+        assert e.code == 1008
+    print("✅ Passed")
+
+
+def test_pushes_writes():
+    """Test 2: Pushes Creates, Updates, Toggles And Deletes"""
+    print("Test 2: Pushes Creates, Updates, Toggles And Deletes")
+    _, token = create_user_token()
+
+    with subscribe(token) as socket:
+        assert socket.receive_json() == {"type": "ready"}
+
+        task_id = client.post("/api/tasks", json={"title": "a"}, headers=auth(token)).json()["data"]["id"]
+        assert socket.receive_json() == {"type": "tasks.changed", "changed": [task_id], "deleted": []}
+
+        client.put(f"/api/tasks/{task_id}", json={"title": "b"}, headers=auth(token))
+        assert socket.receive_json()["changed"] == [task_id]
+
+        client.patch(f"/api/tasks/{task_id}/toggle-complete", headers=auth(token))
+        assert socket.receive_json()["changed"] == [task_id]
+
+        client.delete(f"/api/tasks/{task_id}", headers=auth(token))
+        assert socket.receive_json() == {"type": "tasks.changed", "changed": [], "deleted": [task_id]}
+    print("✅ Passed")
+
+
+def test_batch_is_one_event_and_rollbacks_are_silent():
+    """Test 3: A Batch Is One Event; Rolled-Back Writes Send Nothing"""
+    print("Test 3: A Batch Is One Event; Rolled-Back Writes Send Nothing")
+    _, token = create_user_token()
+
+    with subscribe(token) as socket:
+        socket.receive_json()
+        client.post("/api/tasks/batch", json={"atomic": True, "operations": [
+            {"op": "create", "task": {"title": "never"}},
+            {"op": "toggle", "id": 999999}
+        ]}, headers=auth(token))
+        response = client.post("/api/tasks/batch", json={"operations": [
+            {"op": "create", "task": {"title": "x"}},
+            {"op": "create", "task": {"title": "y"}}
+        ]}, headers=auth(token))
+        ids = [result["data"]["id"] for result in response.json()["data"]["results"]]
+
+        assert socket.receive_json() == {"type": "tasks.changed", "changed": ids, "deleted": []}
+    print("✅ Passed")
+
+
+def test_assistant_writes_and_user_isolation():
+    """Test 4: Assistant Writes Are Pushed, Only To Their Owner"""
+    print("Test 4: Assistant Writes Are Pushed, Only To Their Owner")
+    user_id, token = create_user_token()
+    other_id, _ = create_user_token()
+
+    with subscribe(token) as socket:
+        socket.receive_json()
+        with Session(engine) as session:
+            execute_function("add_task", {"title": "someone else's"}, str(other_id), db=session)
+            result = execute_function("add_task", {"title": "from the assistant"}, str(user_id), db=session)
+
+        assert socket.receive_json()["changed"] == [result["task_id"]]
+    print("✅ Passed")
+
+
+def test_rolled_back_savepoint_sends_only_kept_writes():
+    """Test 5: A Rolled-Back Savepoint Sends Only The Writes Kept"""
+    print("Test 5: A Rolled-Back Savepoint Sends Only The Writes Kept")
+    user_id, token = create_user_token()
+    kept_id, undone_id = add_tasks(user_id, ["kept", "undone"])
+
+    with subscribe(token) as socket:
+        socket.receive_json()
+        with Session(engine) as session:
+            apply_function("complete_task", {"task_id": kept_id}, str(user_id), session)
+            try:
+                # As execute_functions() runs a write batch that fails
+                with session.begin_nested():
+                    apply_function("complete_task", {"task_id": undone_id}, str(user_id), session)
+                    raise RuntimeError("call failed")
+            except RuntimeError:
+                pass
+            session.commit()
+
+        assert socket.receive_json() == {"type": "tasks.changed", "changed": [kept_id], "deleted": []}
+    print("✅ Passed")
+
+
+def test_bus_overflow_and_threads():
+    """Test 6: Bus Delivers Across Threads And Collapses Overflow Into Resync"""
+    print("Test 6: Bus Delivers Across Threads And Collapses Overflow Into Resync")
+    bus = TaskEventBus(queue_size=3)
+
+    async def scenario():
+        subscription = bus.subscribe(1)
+        publisher = threading.Thread(target=lambda: [bus.publish(1, {"n": n}) for n in range(2)])
+        publisher.start()
+        publisher.join()
+        received = [await subscription.get(), await subscription.get()]
+
+        for n in range(5):
+            bus.publish(1, {"n": n})
+        await asyncio.sleep(0)
+        overflowed = [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+        stats = bus.stats()
+        bus.unsubscribe(subscription)
+        return received, overflowed, stats
+
+    received, overflowed, stats = asyncio.run(scenario())
+
+    assert received == [{"n": 0}, {"n": 1}]
+    assert overflowed == [{"type": "resync"}, {"n": 4}]
+    assert stats["subscribers"] == 1 and stats["published"] == 7 and stats["dropped"] == 3
+    assert bus.stats()["subscribers"] == 0
+    print("✅ Passed")
+
+
+def test_socket_holds_no_connection():
+    """Test 7: An Open Socket Holds No Connection, In Both Database Modes"""
+    print("Test 7: An Open Socket Holds No Connection, In Both Database Modes")
+    original = database.DB_ASYNC
+    try:
+        for db_async in (False, True):
+            database.DB_ASYNC = db_async
+            _, token = create_user_token()
+            with subscribe(token) as socket:
+                assert socket.receive_json() == {"type": "ready"}
+                assert active_engine().pool.checkedout() == 0
+
+                task_id = client.post("/api/tasks", json={"title": "a"}, headers=auth(token)).json()["data"]["id"]
+                assert socket.receive_json()["changed"] == [task_id]
+            if db_async:
+                # Connections belong to the loop that opened them
+                asyncio.run(database.get_async_engine().dispose())
+    finally:
+        database.DB_ASYNC = original
+    print("✅ Passed")
+
+
+def test_disconnect_unsubscribes():
+    """Edge Case: Disconnecting Unsubscribes"""
+    print("Edge Case: Disconnecting Unsubscribes")
+    _, headers = create_user()
+    token = headers["Authorization"].removeprefix("Bearer ")
+    before = client.get("/api/metrics", headers=headers).json()["data"]["task_events"]["subscribers"]
+
+    with subscribe(token) as socket:
+        socket.receive_json()
+        during = client.get("/api/metrics", headers=headers).json()["data"]["task_events"]["subscribers"]
+
+    # The server notices the close asynchronously
+    for _ in range(50):
+        after = client.get("/api/metrics", headers=headers).json()["data"]["task_events"]["subscribers"]
+        if after == before:
+            break
+        threading.Event().wait(0.02)
+
+    assert during == before + 1
+    assert after == before
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running task event tests...\n")
+
+    test_rejects_bad_token()
+    test_pushes_writes()
+    test_batch_is_one_event_and_rollbacks_are_silent()
+    test_assistant_writes_and_user_isolation()
+    test_rolled_back_savepoint_sends_only_kept_writes()
+    test_bus_overflow_and_threads()
+    test_socket_holds_no_connection()
+    test_disconnect_unsubscribes()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
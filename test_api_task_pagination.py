@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Test script for keyset pagination on GET /api/tasks."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+
+from src.backend.main import app
+from src.backend.database import create_tables
+from src.backend.models import Task
+
+create_tables()
+client = TestClient(app)
+
+
+def create_user_with_tasks(count: int, same_timestamp: bool = False) -> dict:
+    """Create a user owning `count` tasks and return auth headers."""
+    base = datetime(2025, 1, 1)
+    _, headers = create_user(
+        Task(
+            title=f"Task {i}",
+            completed=(i % 2 == 0),
+            created_at=base if same_timestamp else base + timedelta(minutes=i)
+        )
+        for i in range(count)
+    )
+    return headers
+
+
+def fetch_all_pages(headers: dict, limit: int, **params) -> list:
+    """Follow next_cursor until the last page and return every task title."""
+    titles = []
+    cursor = None
+    while True:
+        query = {"limit": limit, **params}
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/tasks", params=query, headers=headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["count"] <= limit
+        titles.extend(t["title"] for t in data["tasks"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return titles
+
+
+def test_first_page_respects_limit():
+    """Test 1: First Page Respects Limit"""
+    print("Test 1: First Page Respects Limit")
+    headers = create_user_with_tasks(5)
+    data = client.get("/api/tasks", params={"limit": 2}, headers=headers).json()["data"]
+
+    assert [t["title"] for t in data["tasks"]] == ["Task 0", "Task 1"]
+    assert data["limit"] == 2
+    # count is this page, total every matching task
+    assert data["count"] == 2 and data["total"] == 5
+    assert data["next_cursor"] is not None
+    print("✅ Passed")
+
+
+def test_pages_cover_all_tasks_in_order():
+    """Test 2: Pages Cover All Tasks In Order"""
+    print("Test 2: Pages Cover All Tasks In Order")
+    headers = create_user_with_tasks(7)
+    titles = fetch_all_pages(headers, limit=3)
+
+    assert titles == [f"Task {i}" for i in range(7)]
+    print("✅ Passed")
+
+
+def test_identical_timestamps_use_id_tiebreak():
+    """Test 3: Identical Timestamps Use ID Tiebreak"""
+    print("Test 3: Identical Timestamps Use ID Tiebreak")
+    headers = create_user_with_tasks(5, same_timestamp=True)
+    titles = fetch_all_pages(headers, limit=2)
+
+    assert titles == [f"Task {i}" for i in range(5)]
+    print("✅ Passed")
+
+
+def test_filter_applies_across_pages():
+    """Test 4: Filter Applies Across Pages"""
+    print("Test 4: Filter Applies Across Pages")
+    headers = create_user_with_tasks(6)
+    titles = fetch_all_pages(headers, limit=2, filter="completed")
+
+    assert titles == ["Task 0", "Task 2", "Task 4"]
+    print("✅ Passed")
+
+
+def test_invalid_cursor_rejected():
+    """Test 5: Invalid Cursor Rejected"""
+    print("Test 5: Invalid Cursor Rejected")
+    headers = create_user_with_tasks(1)
+    response = client.get("/api/tasks", params={"cursor": "not-a-cursor"}, headers=headers)
+
+    assert response.status_code == 400
+    print("✅ Passed")
+
+
+def test_total_counts_matching_tasks():
+    """Test 6: Total Counts Every Matching Task"""
+    print("Test 6: Total Counts Every Matching Task")
+    _, headers = create_user()
+    # Created through the API, so the unfiltered totals come from task_stats
+    for title in ("buy milk", "buy eggs", "call mom"):
+        client.post("/api/tasks", json={"title": title}, headers=headers)
+    first = client.get("/api/tasks", params={"limit": 1}, headers=headers).json()["data"]["tasks"][0]
+    client.patch(f"/api/tasks/{first['id']}/toggle-complete", headers=headers)
+
+    def total(**params) -> int:
+        return client.get("/api/tasks", params={"limit": 1, **params}, headers=headers).json()["data"]["total"]
+
+    assert total() == 3
+    assert total(filter="completed") == 1
+    assert total(filter="active") == 2
+    assert total(search="buy") == 2
+    assert total(search="buy", filter="active") == 1
+    print("✅ Passed")
+
+
+def test_limit_out_of_range_rejected():
+    """Edge Case: Limit Out Of Range Rejected"""
+    print("Edge Case: Limit Out Of Range Rejected")
+    headers = create_user_with_tasks(1)
+
+    assert client.get("/api/tasks", params={"limit": 0}, headers=headers).status_code == 422
+    assert client.get("/api/tasks", params={"limit": 10000}, headers=headers).status_code == 422
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running task pagination tests...\n")
+
+    test_first_page_respects_limit()
+    test_pages_cover_all_tasks_in_order()
+    test_identical_timestamps_use_id_tiebreak()
+    test_filter_applies_across_pages()
+    test_invalid_cursor_rejected()
+    test_total_counts_matching_tasks()
+    test_limit_out_of_range_rejected()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
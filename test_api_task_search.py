@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test script for indexed, ranked title search on GET /api/tasks."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+
+from src.backend import task_search
+from src.backend.main import app
+from src.backend.database import create_tables
+from src.backend.models import Task
+
+create_tables()
+client = TestClient(app)
+
+
+def create_user_with_tasks(titles: list) -> dict:
+    """Create a user owning tasks with the given titles (in creation order) and return auth headers."""
+    base = datetime(2025, 1, 1)
+    _, headers = create_user(
+        Task(title=title, created_at=base + timedelta(minutes=i)) for i, title in enumerate(titles)
+    )
+    return headers
+
+
+def search(headers: dict, term: str, **params) -> list:
+    response = client.get("/api/tasks", params={"search": term, **params}, headers=headers)
+    assert response.status_code == 200
+    return [t["title"] for t in response.json()["data"]["tasks"]]
+
+
+def test_case_insensitive_substring():
+    """Test 1: Case-Insensitive Substring Search"""
+    print("Test 1: Case-Insensitive Substring Search")
+    headers = create_user_with_tasks(["Buy MILK", "Call the plumber", "milkshake recipe", "Walk dog"])
+
+    assert task_search.sqlite_fts_enabled
+    # Prefix matches rank ahead of other substring matches
+    assert search(headers, "milk") == ["milkshake recipe", "Buy MILK"]
+    assert search(headers, "LUMB") == ["Call the plumber"]
+    # Two characters is below the trigram minimum and falls back to LIKE
+    assert search(headers, "og") == ["Walk dog"]
+    print("✅ Passed")
+
+
+def test_results_ranked():
+    """Test 2: Results Ranked Exact, Prefix, Substring"""
+    print("Test 2: Results Ranked Exact, Prefix, Substring")
+    headers = create_user_with_tasks(["Pay rent", "Rent car", "rent", "Current events", "Rental deposit"])
+
+    assert search(headers, "rent") == ["rent", "Rent car", "Rental deposit", "Pay rent", "Current events"]
+    print("✅ Passed")
+
+
+def test_ranked_pagination():
+    """Test 3: Ranked Results Paginate With Cursors"""
+    print("Test 3: Ranked Results Paginate With Cursors")
+    headers = create_user_with_tasks(["Pay rent", "Rent car", "rent", "Current events", "Rental deposit"])
+
+    titles = []
+    cursor = None
+    while True:
+        params = {"search": "rent", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/api/tasks", params=params, headers=headers).json()["data"]
+        titles += [t["title"] for t in data["tasks"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert titles == search(headers, "rent")
+    print("✅ Passed")
+
+
+def test_index_follows_updates_and_deletes():
+    """Test 4: Index Follows Updates And Deletes"""
+    print("Test 4: Index Follows Updates And Deletes")
+    headers = create_user_with_tasks(["Water plants", "Feed cat"])
+    tasks = client.get("/api/tasks", headers=headers).json()["data"]["tasks"]
+
+    client.put(f"/api/tasks/{tasks[0]['id']}", json={"title": "Repot cactus"}, headers=headers)
+    client.delete(f"/api/tasks/{tasks[1]['id']}", headers=headers)
+
+    assert search(headers, "plants") == []
+    assert search(headers, "cactus") == ["Repot cactus"]
+    assert search(headers, "feed") == []
+    print("✅ Passed")
+
+
+def test_highlight():
+    """Test 5: Highlighted Titles Are Escaped"""
+    print("Test 5: Highlighted Titles Are Escaped")
+    headers = create_user_with_tasks(["Fix <b> tag in Milk & honey page"])
+
+    response = client.get("/api/tasks", params={"search": "milk", "highlight": "true"}, headers=headers)
+    plain = client.get("/api/tasks", params={"search": "milk"}, headers=headers)
+
+    assert response.json()["data"]["tasks"][0]["highlight"] == (
+        "Fix &lt;b&gt; tag in <mark>Milk</mark> &amp; honey page"
+    )
+    assert "highlight" not in plain.json()["data"]["tasks"][0]
+    print("✅ Passed")
+
+
+def test_special_characters_are_literal():
+    """Edge Case: Special Characters Are Literal"""
+    print("Edge Case: Special Characters Are Literal")
+    headers = create_user_with_tasks(['Save 50% more', 'Save 500 coins', 'say "hello"', 'a_b', 'axb'])
+
+    assert search(headers, "50%") == ["Save 50% more"]
+    assert search(headers, '"hello"') == ['say "hello"']
+    assert search(headers, "a_b") == ["a_b"]
+    assert search(headers, "_") == ["a_b"]
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running task search tests...\n")
+
+    test_case_insensitive_substring()
+    test_results_ranked()
+    test_ranked_pagination()
+    test_index_follows_updates_and_deletes()
+    test_highlight()
+    test_special_characters_are_literal()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test script for the orjson fast path used by the task endpoints."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+import json
+from datetime import datetime
+from unittest import mock
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.backend import main
+from src.backend.main import app, task_to_dict, task_to_response
+from src.backend.database import create_tables, engine
+from src.backend.models import Task
+from src.backend.task_queries import set_task_tags
+
+create_tables()
+client = TestClient(app)
+
+
+def create_user_with_tasks(count: int) -> tuple:
+    """Create a user owning `count` varied tasks and return (user_id, auth headers)."""
+    user_id, headers = create_user()
+    with Session(engine) as session:
+        for i in range(count):
+            task = Task(
+                title=f"Task {i}",
+                completed=(i % 2 == 0),
+                priority=["high", "medium", "low"][i % 3],
+                due_date="2025-06-01" if i % 2 else None,
+                user_id=user_id,
+                created_at=datetime(2025, 1, 1, 12, 0, i, 123456 * (i % 2))
+            )
+            set_task_tags(task, ["work", "home"][: i % 3])
+            session.add(task)
+        session.commit()
+
+    return user_id, headers
+
+
+def test_projection_matches_model():
+    """Test 1: Projection Matches TaskResponse Encoding"""
+    print("Test 1: Projection Matches TaskResponse Encoding")
+    user_id, _ = create_user_with_tasks(6)
+    with Session(engine) as session:
+        tasks = session.query(Task).filter(Task.user_id == user_id).all()
+        for task in tasks:
+            fast = json.loads(ORJSONResponse(task_to_dict(task)).body)
+            slow = jsonable_encoder(task_to_response(task))
+            assert fast == slow, (fast, slow)
+    print("✅ Passed")
+
+
+def test_list_skips_model_construction():
+    """Test 2: List Endpoint Skips Per-Row Models"""
+    print("Test 2: List Endpoint Skips Per-Row Models")
+    _, headers = create_user_with_tasks(5)
+
+    with mock.patch.object(main, "TaskResponse", side_effect=AssertionError("model built")):
+        response = client.get("/api/tasks", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["data"]["count"] == 5
+    assert "ETag" in response.headers
+    print("✅ Passed")
+
+
+def test_write_endpoints_use_same_shape():
+    """Test 3: Write Endpoints Return The Same Task Shape"""
+    print("Test 3: Write Endpoints Return The Same Task Shape")
+    _, headers = create_user_with_tasks(0)
+    created = client.post(
+        "/api/tasks", json={"title": "shape", "tags": ["a"], "due_date": "2025-02-03"}, headers=headers
+    ).json()["data"]
+    listed = client.get("/api/tasks", headers=headers).json()["data"]["tasks"][0]
+    detail = client.get(f"/api/tasks/{created['id']}", headers=headers).json()["data"]
+    toggled = client.patch(f"/api/tasks/{created['id']}/toggle-complete", headers=headers).json()["data"]
+
+    assert created == listed == detail
+    assert set(toggled) == set(created) and toggled["completed"] is True
+    print("✅ Passed")
+
+
+def test_unicode_titles_round_trip():
+    """Edge Case: Unicode Titles Round-Trip"""
+    print("Edge Case: Unicode Titles Round-Trip")
+    _, headers = create_user_with_tasks(0)
+    title = "Café ☕ — naïve 日本語 🎉"
+    client.post("/api/tasks", json={"title": title}, headers=headers)
+
+    response = client.get("/api/tasks", params={"search": "naïve", "highlight": "true"}, headers=headers)
+    task = response.json()["data"]["tasks"][0]
+
+    assert task["title"] == title
+    assert "<mark>naïve</mark>" in task["highlight"]
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running task serialization tests...\n")
+
+    test_projection_matches_model()
+    test_list_skips_model_construction()
+    test_write_endpoints_use_same_shape()
+    test_unicode_titles_round_trip()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
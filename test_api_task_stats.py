@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Test script for GET /api/tasks/stats."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+import threading
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.backend import task_cache
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.models import Task, TaskStats
+from src.backend.task_queries import backfill_task_stats, count_task_stats, read_task_stats, rebuild_task_stats
+
+create_tables()
+client = TestClient(app)
+
+
+def get_stats(headers: dict) -> dict:
+    response = client.get("/api/tasks/stats", headers=headers)
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def test_stats_for_user_without_tasks():
+    """Test 1: Stats For User Without Tasks"""
+    print("Test 1: Stats For User Without Tasks")
+    stats = get_stats(create_user()[1])
+
+    assert stats["total"] == 0
+    assert stats["completed"] == 0
+    assert stats["active"] == 0
+    assert stats["byPriority"] == {"high": 0, "medium": 0, "low": 0}
+    print("✅ Passed")
+
+
+def test_counts_by_status_and_priority():
+    """Test 2: Counts By Status And Priority"""
+    print("Test 2: Counts By Status And Priority")
+    stats = get_stats(create_user([
+        Task(title="a", priority="high", completed=True),
+        Task(title="b", priority="high"),
+        Task(title="c", priority="medium", completed=True),
+        Task(title="d", priority="low"),
+        Task(title="e", priority="low"),
+    ])[1])
+
+    assert stats["total"] == 5
+    assert stats["completed"] == 2
+    assert stats["active"] == 3
+    assert stats["byPriority"] == {"high": 2, "medium": 1, "low": 2}
+    print("✅ Passed")
+
+
+def test_overdue_and_due_today():
+    """Test 3: Overdue And Due Today Counts"""
+    print("Test 3: Overdue And Due Today Counts")
+    today = datetime.utcnow().date()
+    yesterday = (today - timedelta(days=1)).isoformat()
+    tomorrow = (today + timedelta(days=1)).isoformat()
+    stats = get_stats(create_user([
+        Task(title="late", due_date=yesterday),
+        Task(title="late but done", due_date=yesterday, completed=True),
+        Task(title="today", due_date=today.isoformat()),
+        Task(title="later", due_date=tomorrow),
+        Task(title="no date"),
+    ])[1])
+
+    assert stats["overdue"] == 1
+    assert stats["dueToday"] == 1
+    print("✅ Passed")
+
+
+def test_stats_only_count_own_tasks():
+    """Edge Case: Stats Only Count Own Tasks"""
+    print("Edge Case: Stats Only Count Own Tasks")
+    create_user([Task(title="someone else's")])
+    stats = get_stats(create_user([Task(title="mine")])[1])
+
+    assert stats["total"] == 1
+    print("✅ Passed")
+
+
+def test_counters_follow_api_mutations():
+    """Test 4: Counters Follow API Mutations"""
+    print("Test 4: Counters Follow API Mutations")
+    _, headers = create_user()
+    ids = [
+        client.post("/api/tasks", json={"title": f"t{i}", "priority": p}, headers=headers).json()["data"]["id"]
+        for i, p in enumerate(["high", "medium", "low", "low"])
+    ]
+    client.patch(f"/api/tasks/{ids[0]}/toggle-complete", headers=headers)
+    client.put(f"/api/tasks/{ids[1]}", json={"priority": "high", "completed": True}, headers=headers)
+    client.delete(f"/api/tasks/{ids[2]}", headers=headers)
+
+    stats = get_stats(headers)
+    assert stats["total"] == 3
+    assert stats["completed"] == 2
+    assert stats["active"] == 1
+    assert stats["byPriority"] == {"high": 2, "medium": 0, "low": 1}
+
+    # Counters agree with a full recount from the tasks table
+    with Session(engine) as session:
+        user_id = session.get(Task, ids[0]).user_id
+        recount = count_task_stats(session, user_id)
+    assert {k: stats[k] for k in ("total", "completed", "byPriority")} == \
+        {k: recount[k] for k in ("total", "completed", "byPriority")}
+    print("✅ Passed")
+
+
+def test_rebuild_repairs_drift():
+    """Test 5: Rebuild Repairs Drifted Counters"""
+    print("Test 5: Rebuild Repairs Drifted Counters")
+    _, headers = create_user([Task(title="a", priority="high"), Task(title="b", completed=True)])
+    get_stats(headers)
+
+    with Session(engine) as session:
+        row = session.exec(select(TaskStats).order_by(TaskStats.user_id.desc())).first()
+        row.total, row.completed, row.high = 99, 42, 7
+        session.add(row)
+        session.commit()
+        # Tampering bypasses the write path, so drop cached reads by hand
+        if task_cache.cache is not None:
+            task_cache.cache.invalidate(row.user_id)
+        assert get_stats(headers)["total"] == 99
+
+        rebuild_task_stats(session, row.user_id)
+        session.commit()
+
+    stats = get_stats(headers)
+    assert stats["total"] == 2
+    assert stats["completed"] == 1
+    assert stats["byPriority"] == {"high": 1, "medium": 1, "low": 0}
+    print("✅ Passed")
+
+
+def test_concurrent_first_requests():
+    """Test 6: Concurrent First Reads Create The Counters Once"""
+    print("Test 6: Concurrent First Reads Create The Counters Once")
+    for _ in range(5):
+        user_id, headers = create_user([Task(title="a"), Task(title="b", completed=True)])
+        with Session(engine) as session:
+            session.exec(TaskStats.__table__.delete().where(TaskStats.user_id == user_id))
+            session.commit()
+
+        start = threading.Barrier(8)
+        errors = []
+
+        def request(index: int):
+            try:
+                with Session(engine) as session:
+                    start.wait()
+                    read_task_stats(session, user_id)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        stats = get_stats(headers)
+        assert stats["total"] == 2
+        assert stats["completed"] == 1
+    print("✅ Passed")
+
+
+def test_backfill_creates_missing_counters():
+    """Test 7: Startup Backfills Counters For Users Without Them"""
+    print("Test 7: Startup Backfills Counters For Users Without Them")
+    user_id, _ = create_user([Task(title="a", priority="high"), Task(title="b", completed=True)])
+    empty_id, _ = create_user()
+    with Session(engine) as session:
+        session.exec(TaskStats.__table__.delete().where(TaskStats.user_id.in_([user_id, empty_id])))
+        session.commit()
+
+    create_tables()
+
+    with Session(engine) as session:
+        row = session.get(TaskStats, user_id)
+        assert (row.total, row.completed, row.high, row.medium, row.low, row.version) == (2, 1, 1, 1, 0, 0)
+        assert session.get(TaskStats, empty_id).total == 0
+        assert backfill_task_stats(session) == 0
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running task stats tests...\n")
+
+    test_stats_for_user_without_tasks()
+    test_counts_by_status_and_priority()
+    test_overdue_and_due_today()
+    test_counters_follow_api_mutations()
+    test_rebuild_repairs_drift()
+    test_concurrent_first_requests()
+    test_backfill_creates_missing_counters()
+    test_stats_only_count_own_tasks()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Test script for task_tags storage and the tag filter on GET /api/tasks."""
+
+# Test database and settings; imported before anything from src
+from api_testing import create_user
+
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from src.backend.main import app
+from src.backend.database import create_tables, engine
+from src.backend.models import Task, TaskTag
+from src.backend.migrate_task_tags import migrate_tags
+
+create_tables()
+client = TestClient(app)
+
+
+def create_task(headers: dict, title: str, tags) -> dict:
+    response = client.post("/api/tasks", json={"title": title, "tags": tags}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def test_create_with_list_or_json_tags():
+    """Test 1: Create With List Or JSON String Tags"""
+    print("Test 1: Create With List Or JSON String Tags")
+    _, headers = create_user()
+    from_list = create_task(headers, "list", ["work", " urgent ", "work", ""])
+    from_json = create_task(headers, "json", json.dumps(["home"]))
+
+    assert from_list["tags"] == ["urgent", "work"]
+    assert from_json["tags"] == ["home"]
+    print("✅ Passed")
+
+
+def test_update_replaces_tags():
+    """Test 2: Update Replaces Tags"""
+    print("Test 2: Update Replaces Tags")
+    _, headers = create_user()
+    task = create_task(headers, "errand", ["a", "b"])
+
+    updated = client.put(f"/api/tasks/{task['id']}", json={"tags": ["b", "c"]}, headers=headers)
+    untouched = client.put(f"/api/tasks/{task['id']}", json={"title": "renamed"}, headers=headers)
+    cleared = client.put(f"/api/tasks/{task['id']}", json={"tags": []}, headers=headers)
+
+    assert updated.json()["data"]["tags"] == ["b", "c"]
+    assert untouched.json()["data"]["tags"] == ["b", "c"]
+    assert cleared.json()["data"]["tags"] == []
+    print("✅ Passed")
+
+
+def test_tag_filter():
+    """Test 3: Tag Filter"""
+    print("Test 3: Tag Filter")
+    _, headers = create_user()
+    _, other_headers = create_user()
+    for i in range(5):
+        create_task(headers, f"work {i}", ["work"] if i % 2 == 0 else ["home"])
+    create_task(other_headers, "other user's work", ["work"])
+
+    response = client.get("/api/tasks", params={"tag": "work", "limit": 2}, headers=headers)
+    data = response.json()["data"]
+    second = client.get(
+        "/api/tasks", params={"tag": "work", "limit": 2, "cursor": data["next_cursor"]}, headers=headers
+    ).json()["data"]
+
+    assert [t["title"] for t in data["tasks"]] == ["work 0", "work 2"]
+    assert [t["title"] for t in second["tasks"]] == ["work 4"]
+    assert second["next_cursor"] is None
+    print("✅ Passed")
+
+
+def test_tag_filter_uses_index():
+    """Test 4: Tag Filter Uses The task_tags Index"""
+    print("Test 4: Tag Filter Uses The task_tags Index")
+    with engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT tasks.id FROM tasks "
+            "JOIN task_tags ON task_tags.task_id = tasks.id "
+            "WHERE tasks.user_id = 1 AND task_tags.user_id = 1 AND task_tags.tag = 'work'"
+        )).all()
+
+    assert any("ix_task_tags_user_id_tag" in row[-1] for row in plan)
+    print("✅ Passed")
+
+
+def test_delete_removes_tag_rows():
+    """Test 5: Delete Removes Tag Rows"""
+    print("Test 5: Delete Removes Tag Rows")
+    _, headers = create_user()
+    task = create_task(headers, "temp", ["x", "y"])
+    client.delete(f"/api/tasks/{task['id']}", headers=headers)
+
+    with Session(engine) as session:
+        rows = session.exec(select(TaskTag).where(TaskTag.task_id == task["id"])).all()
+    assert rows == []
+    print("✅ Passed")
+
+
+def test_startup_migrates_legacy_tags():
+    """Test 6: Startup Migrates Legacy Tags"""
+    print("Test 6: Startup Migrates Legacy Tags")
+    user_id, headers = create_user()
+    with Session(engine) as session:
+        session.add(Task(title="legacy", tags=json.dumps(["home"]), user_id=user_id))
+        session.commit()
+
+    # What the app runs on startup
+    create_tables()
+
+    [task] = client.get("/api/tasks", headers=headers).json()["data"]["tasks"]
+    assert task["tags"] == ["home"]
+    with Session(engine) as session:
+        assert session.exec(select(Task.tags).where(Task.user_id == user_id)).one() == "[]"
+    print("✅ Passed")
+
+
+def test_migrate_legacy_tags():
+    """Edge Case: Migrate Legacy JSON Tags"""
+    print("Edge Case: Migrate Legacy JSON Tags")
+    user_id, headers = create_user()
+    with Session(engine) as session:
+        plain = Task(title="plain", tags=json.dumps(["work"]), user_id=user_id)
+        # Older create paths double-encoded the JSON string
+        double = Task(title="double", tags=json.dumps(json.dumps(["home", "work"])), user_id=user_id)
+        broken = Task(title="broken", tags="not json", user_id=user_id)
+        session.add_all([plain, double, broken])
+        session.commit()
+
+    migrate_tags(batch_size=2)
+    # Re-running is a no-op
+    assert migrate_tags() == 0
+
+    tasks = client.get("/api/tasks", headers=headers).json()["data"]["tasks"]
+    assert {t["title"]: t["tags"] for t in tasks} == {
+        "plain": ["work"],
+        "double": ["home", "work"],
+        "broken": []
+    }
+    filtered = client.get("/api/tasks", params={"tag": "work"}, headers=headers).json()["data"]["tasks"]
+    assert [t["title"] for t in filtered] == ["plain", "double"]
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running task tag tests...\n")
+
+    test_create_with_list_or_json_tags()
+    test_update_replaces_tags()
+    test_tag_filter()
+    test_tag_filter_uses_index()
+    test_delete_removes_tag_rows()
+    test_startup_migrates_legacy_tags()
+    test_migrate_legacy_tags()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
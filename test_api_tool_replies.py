@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Test script for templated tool replies that skip the second OpenAI call."""
+
+# Test database and settings; imported before anything from src
+from api_testing import add_tasks, create_user, run_turn
+
+import json
+
+from src.backend import tool_replies
+from src.backend.database import create_tables
+from src.backend.tool_replies import render_task, render_tool_replies
+from fake_openai import calling
+
+create_tables()
+
+
+def test_render_formats():
+    """Test 1: Replies Follow The Task Display Format"""
+    print("Test 1: Replies Follow The Task Display Format")
+    task = {"id": 3, "title": "Buy milk", "description": "2 litres", "completed": False,
+            "created_at": "2025-01-02T09:30:00.123456"}
+    assert render_task(task) == "[3] ☐ Buy milk\n    2 litres\n    Created: 2025-01-02 09:30"
+    assert render_task({**task, "completed": True, "description": None}).startswith("[3] ✅ Buy milk\n    Created:")
+
+    listed = render_tool_replies(
+        [{"function": "list_tasks", "arguments": {"status": "pending"}}],
+        [{"success": True, "tasks": [task], "count": 1}]
+    )
+    assert listed == "Here are your pending tasks (1):\n" + render_task(task)
+    assert render_tool_replies(
+        [{"function": "list_tasks", "arguments": {"status": "completed"}}],
+        [{"success": True, "tasks": [], "count": 0}]
+    ) == "You have no completed tasks."
+
+    assert render_tool_replies(
+        [{"function": "complete_task", "arguments": {"task_id": 3}},
+         {"function": "delete_task", "arguments": {"task_id": 4}}],
+        [{"success": True, "task_id": 3, "title": "Buy milk", "completed": True},
+         {"success": True, "task_id": 4, "title": "Call mum"}]
+    ) == "Marked as complete:\n[3] ✅ Buy milk\n\nDeleted task [4] Call mum."
+    print("✅ Passed")
+
+
+def test_templated_turn_makes_one_call():
+    """Test 2: A Templated Turn Needs One OpenAI Call"""
+    print("Test 2: A Templated Turn Needs One OpenAI Call")
+    user_id, headers = create_user()
+    ids = add_tasks(user_id, ["a", "b"])
+    server = calling([("complete_task", {"task_id": ids[0]}), ("list_tasks", {"status": "pending"})])
+
+    response = run_turn(server, headers)
+
+    data = response.json()
+    assert response.status_code == 200
+    assert len(server.requests) == 1
+    assert data["response"].startswith(f"Marked as complete:\n[{ids[0]}] ✅ a\n\nHere are your pending tasks (1):\n[{ids[1]}] ☐ b")
+    assert [call["function"] for call in data["tool_calls"]] == ["complete_task", "list_tasks"]
+    print("✅ Passed")
+
+
+def test_untemplated_tool_asks_the_model():
+    """Test 3: A Turn With An Untemplated Tool Still Asks The Model"""
+    print("Test 3: A Turn With An Untemplated Tool Still Asks The Model")
+    user_id, headers = create_user()
+    [task_id] = add_tasks(user_id, ["a"])
+    server = calling([("delete_task", {"task_id": task_id}), ("add_task", {"title": "b"})])
+
+    response = run_turn(server, headers)
+
+    assert len(server.requests) == 2
+    assert response.json()["response"] == "Task 'a' deleted successfully Task 'b' created successfully"
+    print("✅ Passed")
+
+
+def test_stream_sends_templated_reply():
+    """Test 4: The Streaming Route Sends The Templated Reply"""
+    print("Test 4: The Streaming Route Sends The Templated Reply")
+    user_id, headers = create_user()
+    add_tasks(user_id, ["a"])
+    server = calling([("list_tasks", {"status": "all"}), ("delete_task", {"task_id": 999999})])
+
+    response = run_turn(server, headers, "/api/chat/stream")
+
+    events = response.text.split("\n\n")
+    tokens = [json.loads(e.split("data: ", 1)[1])["content"] for e in events if e.startswith("event: token")]
+    done = json.loads(response.text.split("event: done\ndata: ", 1)[1].split("\n", 1)[0])
+    assert len(server.requests) == 1
+    assert len(tokens) == 1 and tokens[0] == done["response"]
+    assert done["response"].startswith("Here are your tasks (1):\n")
+    assert done["response"].endswith("\n\nTask 999999 not found")
+    print("✅ Passed")
+
+
+def test_long_lists_are_capped():
+    """Test 5: Long Lists Show The First Tasks And A Count Of The Rest"""
+    print("Test 5: Long Lists Show The First Tasks And A Count Of The Rest")
+    user_id, headers = create_user()
+    add_tasks(user_id, [f"task {i}" for i in range(tool_replies.TOOL_REPLY_MAX_TASKS + 5)])
+    server = calling([("list_tasks", {"status": "all"})])
+
+    response = run_turn(server, headers)
+
+    reply = response.json()["response"]
+    shown = [line for line in reply.splitlines() if line.startswith("[")]
+    assert len(server.requests) == 1
+    assert reply.startswith(f"Here are your tasks ({tool_replies.TOOL_REPLY_MAX_TASKS + 5}):\n")
+    assert len(shown) == tool_replies.TOOL_REPLY_MAX_TASKS and shown[0].endswith("task 0")
+    assert reply.endswith("\n…and 5 more.")
+    # The full list is still returned as the tool result
+    assert response.json()["tool_calls"][0]["result"]["count"] == tool_replies.TOOL_REPLY_MAX_TASKS + 5
+    print("✅ Passed")
+
+
+def test_templates_can_be_turned_off():
+    """Edge Case: A Tool Left Out Of TOOL_REPLY_TEMPLATES Asks The Model"""
+    print("Edge Case: A Tool Left Out Of TOOL_REPLY_TEMPLATES Asks The Model")
+    user_id, headers = create_user()
+    [task_id] = add_tasks(user_id, ["a"])
+    server = calling([("complete_task", {"task_id": task_id})])
+
+    original = tool_replies.TOOL_REPLY_TEMPLATES
+    tool_replies.TOOL_REPLY_TEMPLATES = {"list_tasks", "delete_task"}
+    try:
+        response = run_turn(server, headers)
+    finally:
+        tool_replies.TOOL_REPLY_TEMPLATES = original
+
+    assert len(server.requests) == 2
+    assert response.json()["response"] == "Task 'a' marked as complete"
+    print("✅ Passed")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("Running templated tool reply tests...\n")
+
+    test_render_formats()
+    test_templated_turn_makes_one_call()
+    test_untemplated_tool_asks_the_model()
+    test_stream_sends_templated_reply()
+    test_long_lists_are_capped()
+    test_templates_can_be_turned_off()
+
+    print("\n🎉 All tests passed!")
+
+
+if __name__ == "__main__":
+    run_all_tests()